@@ -0,0 +1,87 @@
+"""
+Benchmark of the comparison of spectra.
+
+Builds a window of synthetic spectra, a tenth of them with a different range
+and number of lines so they have to be interpolated, and times their
+comparison against a baseline and against the previous spectra, printing the
+time and the spectra compared per second.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bench_compare [spectra] [lines]
+"""
+import sys
+import time
+
+import numpy as np
+
+from t8_client.functions.client import SPECTRA
+from t8_client.functions.compare import compare_spectra
+from t8_client.functions.records import Record
+
+# Default number of spectra of the window and of lines of every spectrum
+DEFAULT_SPECTRA = 5000
+DEFAULT_LINES = 3200
+# Number of compared bands
+BANDS = 16
+# Number of previous spectra of the rolling comparison
+PREVIOUS = 10
+# Number of timed runs, the best one is reported
+REPEAT = 3
+
+# Function to build a window of synthetic spectra
+def make_window(count: int, lines: int) -> list[Record]:
+    """
+    Builds a window of noisy spectra, every tenth one with half the lines over
+    a shorter range.
+
+    Args:
+        count (int): Number of spectra.
+        lines (int): Number of lines of most spectra.
+
+    Returns:
+        list[Record]: The spectra.
+    """
+    rng = np.random.default_rng(0)
+    window = []
+    for i in range(count):
+        n_lines, max_freq = (lines // 2, 800.0) if i % 10 == 9 else (lines, 1000.0)  # noqa: PLR2004
+        values = np.abs(rng.normal(0.01, 0.002, n_lines)).astype("f")
+        window.append(
+            Record(
+                SPECTRA,
+                "M",
+                "P",
+                "AM1",
+                1554999954 + 60 * i,
+                values,
+                1.0,
+                min_freq=0.0,
+                max_freq=max_freq,
+            )
+        )
+    return window
+
+def main() -> None:
+    """
+    Runs the benchmark and prints one row per kind of reference.
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SPECTRA
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_LINES  # noqa: PLR2004
+    window = make_window(count, lines)
+
+    print(f"{count} spectra of {lines} lines, {BANDS} bands")
+    print(f"{'reference':<12} {'time (ms)':>10} {'spectra/s':>12}")
+    for name, options in (
+        ("baseline", {"baseline": window[:1]}),
+        (f"previous {PREVIOUS}", {"previous": PREVIOUS}),
+    ):
+        times = []
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            compare_spectra(window, split=BANDS, **options)
+            times.append(time.perf_counter() - start)
+        elapsed = min(times)
+        print(f"{name:<12} {elapsed * 1000:>10.1f} {count / elapsed:>12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark of the export formats.
+
+Writes and reads back a synthetic wave in every registered export format and
+prints the write time, read time and file size of each one. Formats whose
+optional dependency is not installed are skipped.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bench_export [samples]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from t8_client.functions.client import WAVES
+from t8_client.functions.export import EXPORTERS, export_record, load_export
+from t8_client.functions.records import Record
+
+# Default number of samples of the synthetic wave
+DEFAULT_SAMPLES = 100_000
+
+# Function to build a synthetic wave
+def make_record(n_samples: int) -> Record:
+    """
+    Builds a wave record with a noisy sine wave.
+
+    Args:
+        n_samples (int): Number of samples.
+
+    Returns:
+        Record: The record.
+    """
+    rng = np.random.default_rng(0)
+    values = (np.sin(np.arange(n_samples) / 50) + rng.normal(0, 0.1, n_samples))
+    return Record(WAVES, "M", "P", "AM1", 1554999954, values.astype("f"), 1.0, 2560.0)
+
+# Function to compute the size of an export, including sidecar files
+def export_size(path: str) -> int:
+    """
+    Returns the size of an exported file and its sidecar, if any.
+
+    Args:
+        path (str): Path of the exported file.
+
+    Returns:
+        int: Size in bytes.
+    """
+    size = os.path.getsize(path)
+    if os.path.exists(f"{path}.json"):
+        size += os.path.getsize(f"{path}.json")
+    return size
+
+def main() -> None:
+    """
+    Runs the benchmark and prints one row per format.
+    """
+    n_samples = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SAMPLES
+    record = make_record(n_samples)
+
+    print(f"{n_samples} samples")
+    print(f"{'format':<8} {'write (ms)':>11} {'read (ms)':>10} {'size (kB)':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in sorted(EXPORTERS):
+            try:
+                start = time.perf_counter()
+                path = export_record(record, directory, fmt)
+                written = time.perf_counter()
+                values, _ = load_export(path, fmt)
+                np.asarray(values).sum()  # Touch memory mapped data
+                read = time.perf_counter()
+            except ImportError as e:
+                print(f"{fmt:<8} skipped: {e}")
+                continue
+            print(
+                f"{fmt:<8} {(written - start) * 1000:>11.2f} "
+                f"{(read - written) * 1000:>10.2f} {export_size(path) / 1000:>10.1f}"
+            )
+
+if __name__ == "__main__":
+    main()
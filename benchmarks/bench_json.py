@@ -0,0 +1,114 @@
+"""
+Benchmark of the JSON parsing of listings and records.
+
+Builds a large synthetic listing and a large zint encoded wave, then times the
+original path (`json.loads` followed by walking the parsed document) against
+every installed backend of `fastjson`, and prints the time per body and the
+throughput of each.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bench_json [items] [samples]
+"""
+import json
+import sys
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+from t8_client.functions import fastjson
+from t8_client.functions.client import parse_listing
+from t8_client.functions.codecs import get_codec
+from t8_client.functions.records import decode_record, parse_record
+
+# Default number of items of the listing and samples of the wave
+DEFAULT_ITEMS = 100_000
+DEFAULT_SAMPLES = 4_000_000
+# Number of timed runs of every path, the best one is reported
+REPEAT = 5
+
+# Function to time a parsing path
+def measure(label: str, n_bytes: int, parse: Callable[[], object]) -> None:
+    """
+    Runs a parsing path several times and prints its best time and throughput.
+
+    Args:
+        label (str): Name of the row.
+        n_bytes (int): Size of the parsed body.
+        parse (Callable[[], object]): The parsing path.
+    """
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        parse()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<22} {best * 1000:>10.2f} {n_bytes / best / 1e6:>10.0f}")
+
+# Function to build a listing body
+def make_listing(n_items: int) -> bytes:
+    """
+    Builds a listing body shaped like the ones of the T8 REST API.
+    """
+    base = "http://t8.example/rest/waves/LP_Turbine/MAD31CY005/AM1"
+    return json.dumps(
+        {
+            "_items": [
+                {
+                    "_links": {"self": f"{base}/{1554999954 + 60 * i}"},
+                    "timestamp": 1554999954 + 60 * i,
+                }
+                for i in range(n_items)
+            ],
+            "_links": {"self": base},
+        }
+    ).encode()
+
+# Function to build a record body
+def make_record(n_samples: int) -> bytes:
+    """
+    Builds the body of a zint encoded wave with noise-like samples.
+    """
+    rng = np.random.default_rng(0)
+    values = rng.normal(0, 3000, n_samples).clip(-32768, 32767)
+    return json.dumps(
+        {
+            "sample_rate": 2560.0,
+            "factor": 0.001,
+            "data": get_codec("zint").encode(values),
+        }
+    ).encode()
+
+def main() -> None:
+    """
+    Runs the benchmark and prints one row per path and document.
+    """
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITEMS
+    n_samples = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SAMPLES  # noqa: PLR2004
+    listing = make_listing(n_items)
+    record = make_record(n_samples)
+
+    print(f"Listing of {n_items} items ({len(listing) / 1e6:.1f} MB)")
+    print(f"{'path':<22} {'time (ms)':>10} {'MB/s':>10}")
+    measure("json (original)", len(listing), lambda: parse_listing(json.loads(listing)))
+    for backend in fastjson.BACKENDS:
+        # The default backend is read on every call
+        fastjson.BACKEND = backend
+        measure(backend, len(listing), lambda: parse_listing(listing))
+
+    print(f"\nWave of {n_samples} samples ({len(record) / 1e6:.1f} MB), decoded")
+    print(f"{'path':<22} {'time (ms)':>10} {'MB/s':>10}")
+    measure(
+        "json (original)",
+        len(record),
+        lambda: decode_record("waves", "M", "P", "AM1", 0, json.loads(record)),
+    )
+    for backend in fastjson.BACKENDS:
+        fastjson.BACKEND = backend
+        measure(
+            backend,
+            len(record),
+            lambda: parse_record("waves", "M", "P", "AM1", 0, record),
+        )
+
+if __name__ == "__main__":
+    main()
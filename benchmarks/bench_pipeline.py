@@ -0,0 +1,112 @@
+"""
+Benchmark of the process stage of bulk downloads.
+
+Downloads every wave of a listing of the local stub server to CSV files, first
+decoding and exporting on the download threads (the default) and then on a
+`ProcessStage` of 1, 2, 4, 8 and 16 processes, and prints the time, throughput
+and speedup of every run. Process counts above the number of cores are skipped
+unless listed explicitly.
+
+The stub server answers from threads of this same process, so its share of the
+GIL grows with the throughput; on large machines the speedup is a lower bound.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bench_pipeline [samples] [count]
+        [processes,...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.stub_server import StubServer
+from t8_client.functions.bulk import fetch_records
+from t8_client.functions.client import WAVES, T8Client
+from t8_client.functions.export import export_record
+from t8_client.functions.pipeline import ProcessStage
+
+# Default number of samples of every wave and of waves downloaded
+DEFAULT_SAMPLES = 262_144
+DEFAULT_COUNT = 64
+# Default numbers of processes, measured up to the number of cores
+PROCESSES = (1, 2, 4, 8, 16)
+# Export format of the written files
+OUTPUT_FORMAT = "csv"
+# Number of concurrent downloads
+WORKERS = 8
+# Number of timed batches of every run, the best one is reported
+REPEAT = 3
+
+# Function to time a bulk download
+def measure(client: T8Client, stage: ProcessStage | None, directory: str) -> float:
+    """
+    Downloads and exports every wave of the stub server several times.
+
+    Args:
+        client (T8Client): Client of the stub server.
+        stage (ProcessStage | None): Process stage exporting the waves, or None
+            to decode and export on the download threads.
+        directory (str): Directory where the files are written.
+
+    Returns:
+        float: Best wall time of a batch in seconds. The first batch also
+            starts the worker processes, so it is not counted.
+    """
+    selection = [("LP_Turbine", "MAD31CY005", "AM1")]
+    times = []
+    for _ in range(REPEAT + 1):
+        began = time.perf_counter()
+        if stage is not None:
+            result = fetch_records(
+                client,
+                WAVES,
+                selection,
+                workers=WORKERS + stage.processes,
+                stage=stage,
+            )
+        else:
+            result = fetch_records(
+                client,
+                WAVES,
+                selection,
+                workers=WORKERS,
+                on_record=lambda r: export_record(r, directory, OUTPUT_FORMAT),
+            )
+        elapsed = time.perf_counter() - began
+        if result.failures:
+            raise RuntimeError(result.summary())
+        times.append(elapsed)
+    return min(times[1:])
+
+def main() -> None:
+    """
+    Runs the benchmark and prints one row per number of processes.
+    """
+    n_samples = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SAMPLES
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_COUNT  # noqa: PLR2004
+    if len(sys.argv) > 3:  # noqa: PLR2004
+        counts = [int(text) for text in sys.argv[3].split(",")]
+    else:
+        cores = os.cpu_count() or 1
+        counts = [n for n in PROCESSES if n <= cores] or [1]
+
+    print(f"{count} waves of {n_samples} samples to {OUTPUT_FORMAT}")
+    print(f"{'processes':<12} {'time (s)':>10} {'waves/s':>10} {'speedup':>10}")
+    with (
+        StubServer(samples=n_samples, count=count) as server,
+        T8Client(server.url, "user", "password", pool_size=64) as client,
+        tempfile.TemporaryDirectory() as directory,
+    ):
+        baseline = measure(client, None, directory)
+        print(f"{'threads':<12} {baseline:>10.2f} {count / baseline:>10.1f} {1:>10.2f}")
+        for processes in counts:
+            export = (directory, OUTPUT_FORMAT)
+            with ProcessStage(processes, export=export) as stage:
+                elapsed = measure(client, stage, directory)
+            print(
+                f"{processes:<12} {elapsed:>10.2f} {count / elapsed:>10.1f} "
+                f"{baseline / elapsed:>10.2f}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark of per-request latency with and without connection pooling.
+
+Sends the same sequence of record requests to a local stub server twice: once
+with a bare `requests.get` per call (a new connection every time, as the
+subcommands originally did) and once through a pooled `T8Client`.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bench_pooling
+"""
+import statistics
+import time
+from collections.abc import Callable
+
+import requests
+
+from benchmarks.stub_server import StubServer
+from t8_client.functions.client import WAVES, T8Client
+
+# Number of requests sent by each variant
+REQUESTS = 500
+
+# Function to measure the latency of a request function
+def measure(send: Callable[[], object], n: int) -> list[float]:
+    """
+    Measures the latency of consecutive requests.
+
+    Args:
+        send (Callable[[], object]): Function sending a single request.
+        n (int): Number of requests.
+
+    Returns:
+        list[float]: Latency of every request in milliseconds.
+    """
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        send()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+# Function to print a summary of latencies
+def report(name: str, latencies: list[float]) -> None:
+    """
+    Prints the mean, median and 95th percentile of a set of latencies.
+
+    Args:
+        name (str): Name of the variant.
+        latencies (list[float]): Latencies in milliseconds.
+    """
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(
+        f"{name:<12} mean {statistics.mean(latencies):7.3f} ms   "
+        f"p50 {statistics.median(latencies):7.3f} ms   p95 {p95:7.3f} ms"
+    )
+
+def main() -> None:
+    """
+    Runs both variants against the stub server and prints their latencies.
+    """
+    with StubServer() as server, T8Client(server.url, "user", "password") as client:
+        url = client.url(WAVES, "machine", "point", "AM1", 1554999954)
+
+        def unpooled() -> object:
+            return requests.get(
+                url, params={"array_fmt": "zint"}, auth=("user", "password"),
+                timeout=10,
+            ).json()
+
+        def pooled() -> object:
+            return client.get_json(url, array_fmt="zint")
+
+        report("unpooled", measure(unpooled, REQUESTS))
+        report("pooled", measure(pooled, REQUESTS))
+
+if __name__ == "__main__":
+    main()
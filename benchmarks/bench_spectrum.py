@@ -0,0 +1,69 @@
+"""
+Benchmark of the spectrum computation.
+
+Computes the amplitude spectra of many synthetic waves of the same length,
+first with one FFT call per wave and then as a single batch, and prints the
+throughput of both.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bench_spectrum [waves] [samples]
+"""
+import sys
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+from t8_client.functions.spectrum import amplitude_spectra
+
+# Default number of waves and samples per wave
+DEFAULT_WAVES = 2000
+DEFAULT_SAMPLES = 2048
+# Sample rate of the synthetic waves in Hz
+SAMPLE_RATE = 2560.0
+# Segment length of the averaged runs
+SEGMENT = 512
+
+# Function to time a spectrum computation
+def measure(label: str, n_waves: int, compute: Callable[[], object]) -> None:
+    """
+    Runs a computation once and prints its time and throughput.
+
+    Args:
+        label (str): Name of the row.
+        n_waves (int): Number of waves transformed by the computation.
+        compute (Callable[[], object]): The computation.
+    """
+    start = time.perf_counter()
+    compute()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed * 1000:>10.1f} {n_waves / elapsed:>12.0f}")
+
+def main() -> None:
+    """
+    Runs the benchmark and prints one row per mode.
+    """
+    n_waves = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_WAVES
+    n_samples = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SAMPLES  # noqa: PLR2004
+    rng = np.random.default_rng(0)
+    waves = rng.normal(0, 1, (n_waves, n_samples)).astype(np.float32)
+
+    print(f"{n_waves} waves of {n_samples} samples")
+    print(f"{'mode':<22} {'time (ms)':>10} {'waves/s':>12}")
+    for segment in (None, SEGMENT):
+        suffix = f", {segment} segment" if segment else ""
+        measure(
+            f"per wave{suffix}",
+            n_waves,
+            lambda s=segment: [
+                amplitude_spectra(wave, SAMPLE_RATE, segment=s) for wave in waves
+            ],
+        )
+        measure(
+            f"batch{suffix}",
+            n_waves,
+            lambda s=segment: amplitude_spectra(waves, SAMPLE_RATE, segment=s),
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Benchmark of the startup cost of every subcommand.
+
+Runs the CLI once per subcommand in a fresh interpreter with `-X importtime`,
+against a local stub server and throwaway cache and index locations, and
+prints the wall time, the total import time and which heavy dependencies were
+loaded. The results can be saved and later compared to catch regressions: a
+subcommand that starts loading a heavy dependency it did not load before, or
+whose import time grows beyond a tolerance (timings are noisy, so the
+dependency check is the reliable one).
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bench_startup [--save FILE]
+        [--compare FILE] [--tolerance FRACTION]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.stub_server import StubServer
+
+# Command line of every measured subcommand, after `t8_client.main`
+POINT = ["-M", "M", "-p", "P", "-m", "AM1"]
+DATE = ["-t", "2019-04-11T16:25:54"]
+SUBCOMMANDS = {
+    "help": ["--help"],
+    "list-waves": ["list-waves", *POINT],
+    "get-wave": ["get-wave", *POINT, *DATE, "--no-cache"],
+    "plot-wave": ["plot-wave", *POINT, *DATE, "--no-cache"],
+    "fetch-waves": ["fetch-waves", *POINT, "--no-cache"],
+    "cache-stats": ["cache", "stats"],
+}
+# Dependencies whose import is reported
+HEAVY_MODULES = ("numpy", "requests", "matplotlib")
+# Default allowed growth of the import time before reporting a regression
+DEFAULT_TOLERANCE = 0.5
+
+# Function to add up the import time of a run
+def parse_importtime(stderr: str) -> tuple[float, set[str]]:
+    """
+    Adds up the cumulative time of the top-level imports of an `-X importtime`
+    report.
+
+    Args:
+        stderr (str): Standard error of the run.
+
+    Returns:
+        tuple[float, set[str]]: Total import time in milliseconds and the heavy
+            dependencies that were imported.
+    """
+    total = 0.0
+    loaded = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented and already part of their parent's time
+        if not name.startswith("  "):
+            total += int(cumulative) / 1000
+        if name.strip() in HEAVY_MODULES:
+            loaded.add(name.strip())
+    return total, loaded
+
+# Function to run a subcommand in a fresh interpreter
+def run(args: list[str], env: dict, directory: str) -> dict:
+    """
+    Runs the CLI once and measures its startup.
+
+    Args:
+        args (list[str]): Arguments of the CLI.
+        env (dict): Environment of the process.
+        directory (str): Working directory, where files are saved.
+
+    Returns:
+        dict: Wall time, import time and loaded heavy dependencies.
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "t8_client.main", *args],
+        env=env,
+        cwd=directory,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    wall = (time.perf_counter() - start) * 1000
+    if result.returncode:
+        # A failing run would measure the wrong code path
+        raise RuntimeError(f"t8-client {' '.join(args)} failed:\n{result.stderr}")
+    imports, loaded = parse_importtime(result.stderr)
+    return {"wall_ms": wall, "import_ms": imports, "loaded": sorted(loaded)}
+
+def main() -> None:
+    """
+    Runs the benchmark, prints one row per subcommand and compares the results
+    with a saved run if requested.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--save", help="Save the results to this JSON file")
+    parser.add_argument("--compare", help="Compare with results saved earlier")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed relative growth of the import time",
+    )
+    options = parser.parse_args()
+
+    results = {}
+    with StubServer() as server, tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(sys.path),
+            "T8_HOST": server.url,
+            "T8_USER": "user",
+            "T8_PASSWORD": "password",
+            "T8_CACHE_DIR": os.path.join(directory, "cache"),
+            "T8_INDEX": os.path.join(directory, "index.sqlite"),
+            "MPLBACKEND": "Agg",
+        }
+        print(f"{'subcommand':<13} {'wall (ms)':>10} {'imports (ms)':>13}  loaded")
+        for name, args in SUBCOMMANDS.items():
+            results[name] = run(args, env, directory)
+            row = results[name]
+            print(
+                f"{name:<13} {row['wall_ms']:>10.1f} {row['import_ms']:>13.1f}  "
+                f"{', '.join(row['loaded']) or '-'}"
+            )
+
+    if options.save:
+        with open(options.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if options.compare:
+        with open(options.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = []
+        for name in set(results) & set(baseline):
+            now, before = results[name], baseline[name]
+            added = set(now["loaded"]) - set(before["loaded"])
+            if added:
+                regressions.append(f"{name}: now imports {', '.join(sorted(added))}")
+            if now["import_ms"] > before["import_ms"] * (1 + options.tolerance):
+                regressions.append(
+                    f"{name}: {now['import_ms']:.1f} ms of imports "
+                    f"(was {before['import_ms']:.1f} ms)"
+                )
+        for regression in regressions:
+            print(f"Regression in {regression}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark of the compact storage of records.
+
+Builds a synthetic zint wave (int16 samples times a factor, as the T8 sends
+them) and stores it as float32 CSV, gzipped CSV, `.npy` and compact `.t8c`
+files with every installed codec. Prints the size of every file, its ratio to
+the raw int16 samples and the time to write it and read it back. Compact files
+are read twice: keeping the raw int16 samples and scaling them to float32.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bench_storage [samples]
+"""
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+from benchmarks.bench_export import export_size
+from t8_client.functions.client import WAVES
+from t8_client.functions.compact import CODECS, read_compact, write_compact
+from t8_client.functions.export import export_record, load_export
+from t8_client.functions.records import Record
+
+# Default number of samples of the synthetic wave
+DEFAULT_SAMPLES = 1_048_576
+# Scale factor of the synthetic wave
+FACTOR = 0.00123
+# Number of timed runs of every operation, the best one is reported
+REPEAT = 5
+
+# Function to build a synthetic zint wave
+def make_record(n_samples: int) -> Record:
+    """
+    Builds a wave record with a noisy sine wave quantized to int16.
+
+    Args:
+        n_samples (int): Number of samples.
+
+    Returns:
+        Record: The record.
+    """
+    rng = np.random.default_rng(0)
+    raw = np.sin(np.arange(n_samples) / 10) * 8000 + rng.normal(0, 200, n_samples)
+    raw = np.rint(raw).astype("<i2")
+    values = np.multiply(raw, np.float32(FACTOR), dtype="f")
+    return Record(WAVES, "M", "P", "AM1", 1554999954, values, FACTOR, 2560.0)
+
+# Function to time an operation
+def best(operation: Callable[[], object]) -> float:
+    """
+    Returns the best wall time of an operation in milliseconds.
+    """
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        operation()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+def main() -> None:
+    """
+    Runs the benchmark and prints one row per format and codec.
+    """
+    n_samples = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SAMPLES
+    record = make_record(n_samples)
+    raw_size = n_samples * 2
+
+    print(f"{n_samples} samples, {raw_size / 1000:.1f} kB as int16")
+    print(
+        f"{'format':<10} {'size (kB)':>10} {'ratio':>7} {'write (ms)':>11} "
+        f"{'read (ms)':>10} {'scaled (ms)':>12}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in ("csv", "csv.gz", "npy"):
+            path = export_record(record, directory, fmt)
+            write = best(lambda fmt=fmt: export_record(record, directory, fmt))
+            read = best(lambda path=path: np.asarray(load_export(path)[0]).sum())
+            size = export_size(path)
+            print(
+                f"{fmt:<10} {size / 1000:>10.1f} {size / raw_size:>7.2f} "
+                f"{write:>11.2f} {read:>10.2f} {read:>12.2f}"
+            )
+
+        for codec in CODECS:
+            path = f"{directory}/{record.name}.{codec}.t8c"
+            write = best(
+                lambda codec=codec, path=path: write_compact(record, path, codec)
+            )
+            read = best(lambda path=path: read_compact(path).raw)
+            scaled = best(lambda path=path: read_compact(path).values)
+            if not np.array_equal(read_compact(path).values, record.values):
+                raise RuntimeError(f"The {codec} file does not hold the record.")
+            size = export_size(path)
+            print(
+                f"{'t8c/' + codec:<10} {size / 1000:>10.1f} {size / raw_size:>7.2f} "
+                f"{write:>11.2f} {read:>10.2f} {scaled:>12.2f}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Micro-benchmark for the zint decoder.
+
+Compares the vectorized `zint_to_float` implementation against the original
+per-sample `struct.unpack` decoder on synthetic payloads from 1k to 1M samples.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bench_zint
+"""
+import timeit
+from base64 import b64decode, b64encode
+from collections.abc import Callable
+from struct import unpack
+from zlib import compress, decompress
+
+import numpy as np
+
+from t8_client.functions.codecs import zint_to_float
+
+# Number of samples of each synthetic payload
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+# Function reproducing the original per-sample decoder
+def legacy_zint_to_float(raw_: str) -> np.ndarray:
+    """
+    Decodes zint data one sample at a time, as the client originally did.
+
+    Args:
+        raw_ (str): The compressed data as a base64 encoded string.
+
+    Returns:
+        np.ndarray: The decompressed data as a float array.
+    """
+    d = decompress(b64decode(raw_.encode()))
+    return np.array(
+        [unpack("h", d[i * 2 : (i + 1) * 2])[0] for i in range(int(len(d) / 2))],
+        dtype="f",
+    )
+
+# Function to build a synthetic zint payload
+def make_payload(n_samples: int) -> str:
+    """
+    Builds a zint payload containing a noisy sine wave.
+
+    Args:
+        n_samples (int): Number of int16 samples in the payload.
+
+    Returns:
+        str: The payload as a base64 encoded string.
+    """
+    rng = np.random.default_rng(0)
+    t = np.arange(n_samples)
+    signal = 8000 * np.sin(t / 50) + rng.normal(0, 500, n_samples)
+    return b64encode(compress(signal.astype("<i2").tobytes())).decode()
+
+# Function to time a decoder on a payload
+def best_time(func: Callable, payload: str, repeat: int) -> float:
+    """
+    Returns the best wall time of several runs of a decoder.
+
+    Args:
+        func (Callable): Decoder to time.
+        payload (str): Payload passed to the decoder.
+        repeat (int): Number of runs.
+
+    Returns:
+        float: Best run time in seconds.
+    """
+    return min(timeit.repeat(lambda: func(payload), number=1, repeat=repeat))
+
+def main() -> None:
+    """
+    Runs the benchmark and prints a comparison table.
+    """
+    print(f"{'samples':>10} {'legacy (ms)':>12} {'vectorized (ms)':>16} {'speedup':>8}")
+    for n in SIZES:
+        payload = make_payload(n)
+        # Both decoders must agree before their timings are compared
+        assert np.array_equal(legacy_zint_to_float(payload), zint_to_float(payload))
+        legacy = best_time(legacy_zint_to_float, payload, repeat=3)
+        fast = best_time(zint_to_float, payload, repeat=20)
+        print(
+            f"{n:>10} {legacy * 1000:>12.2f} {fast * 1000:>16.3f} "
+            f"{legacy / fast:>7.0f}x"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Fixtures of the pytest-benchmark suite.
+
+The suite only runs when the `pytest-benchmark` plugin is installed; otherwise
+its modules are not collected.
+"""
+import importlib.util
+from collections.abc import Iterator
+
+import pytest
+
+from benchmarks.stub_server import StubServer
+from t8_client.functions.client import T8Client
+
+# Skip the suite when the plugin providing the `benchmark` fixture is missing
+if importlib.util.find_spec("pytest_benchmark") is None:
+    collect_ignore_glob = ["test_*.py"]
+
+# Samples of the records served to the suite
+SUITE_SAMPLES = 65536
+# Records listed by every listing of the suite
+SUITE_COUNT = 1000
+
+@pytest.fixture(scope="session")
+def server() -> Iterator[StubServer]:
+    """Local T8 stand-in serving 1000 records of 65536 samples."""
+    with StubServer(samples=SUITE_SAMPLES, count=SUITE_COUNT) as server:
+        yield server
+
+@pytest.fixture(scope="session")
+def client(server: StubServer) -> Iterator[T8Client]:
+    """Pooled client connected to the stand-in server."""
+    with T8Client(server.url, "user", "password") as client:
+        yield client
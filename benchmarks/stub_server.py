@@ -0,0 +1,168 @@
+"""
+This module provides a local stand-in for the T8 REST API used by benchmarks.
+
+The server speaks HTTP/1.1 with keep-alive, answers every `/rest/waves/...` and
+`/rest/spectra/...` listing with `count` timestamps (honouring the `from`
+parameter of incremental listings) and every record URL with a zint encoded
+payload of `samples` samples. Every answer can be delayed by `latency` seconds
+to mimic a remote unit. It runs in a background thread and binds to a free
+port on the loopback interface, or can be run on its own to try the CLI.
+
+Usage:
+    with StubServer(samples=65536, count=1000, latency=0.005) as server:
+        client = T8Client(server.url, "user", "password")
+
+    PYTHONPATH=src python -m benchmarks.stub_server [--port PORT]
+        [--samples N] [--count N] [--latency SECONDS]
+"""
+import argparse
+import json
+import threading
+import time
+from contextlib import suppress
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from t8_client.functions.client import SINCE_PARAM
+from t8_client.functions.codecs import get_codec
+
+# Number of samples of the payload served for every record
+PAYLOAD_SAMPLES = 1024
+# First timestamp and spacing of the timestamps served by every listing
+FIRST_TIMESTAMP = 1554999954
+TIMESTAMP_STEP = 60
+# Default number of timestamps served by every listing
+TIMESTAMP_COUNT = 10
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Request handler answering listings and records with canned JSON documents.
+    """
+
+    # Keep-alive requires HTTP/1.1 and an explicit Content-Length
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle delays between them
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        """
+        Serves a listing or a record depending on the depth of the path.
+        """
+        url = urlsplit(self.path)
+        path = url.path.strip("/").split("/")
+        # rest/<kind>/<machine>/<point>/<pmode>[/<timestamp>]
+        if len(path) == 5:  # noqa: PLR2004
+            since = parse_qs(url.query).get(SINCE_PARAM)
+            timestamps = self.server.timestamps
+            if since:
+                timestamps = [t for t in timestamps if t >= int(since[0])]
+            body = json.dumps(
+                {
+                    "_items": [
+                        {"_links": {"self": f"{url.path.rstrip('/')}/{t}"}}
+                        for t in timestamps
+                    ]
+                }
+            ).encode()
+        else:
+            body = self.server.record
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        """
+        Silences the per-request access log.
+        """
+
+class StubServer:
+    """
+    Runs a `StubHandler` server in a background thread.
+
+    Args:
+        samples (int): Number of samples of the payload served for every record.
+        count (int): Number of timestamps served by every listing.
+        latency (float): Delay of every answer in seconds.
+        port (int): Port to listen on; a free one is picked by default.
+    """
+
+    def __init__(
+        self,
+        samples: int = PAYLOAD_SAMPLES,
+        count: int = TIMESTAMP_COUNT,
+        latency: float = 0.0,
+        port: int = 0,
+    ) -> None:
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.timestamps = [
+            FIRST_TIMESTAMP + TIMESTAMP_STEP * i for i in range(count)
+        ]
+        values = np.sin(np.arange(samples) / 10) * 1000
+        # The payload never changes, so it is encoded once
+        self.httpd.record = json.dumps(
+            {
+                "sample_rate": 2560.0,
+                "factor": 0.001,
+                "min_freq": 0.0,
+                "max_freq": 1000.0,
+                "data": get_codec("zint").encode(values),
+            }
+        ).encode()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """
+        str: Base URL of the running server.
+        """
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def timestamps(self) -> list[int]:
+        """
+        list[int]: Timestamps served by every listing.
+        """
+        return self.httpd.timestamps
+
+    def __enter__(self) -> "StubServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def main() -> None:
+    """
+    Runs the server in the foreground until interrupted.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8008, help="Port to listen on")
+    parser.add_argument(
+        "--samples", type=int, default=PAYLOAD_SAMPLES, help="Samples per record"
+    )
+    parser.add_argument(
+        "--count", type=int, default=TIMESTAMP_COUNT, help="Records per listing"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Delay of every answer (s)"
+    )
+    options = parser.parse_args()
+
+    with StubServer(options.samples, options.count, options.latency, options.port):
+        print(f"Serving on http://127.0.0.1:{options.port} (Ctrl+C to stop)")
+        with suppress(KeyboardInterrupt):
+            threading.Event().wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+pytest-benchmark suite of the main code paths, run against the local T8
+stand-in server so no T8 unit is needed.
+
+Every run can be stored and compared with earlier ones, so regressions in
+throughput or latency show up between commits:
+
+    PYTHONPATH=src python -m pytest benchmarks --benchmark-autosave
+    PYTHONPATH=src python -m pytest benchmarks --benchmark-compare \\
+        --benchmark-compare-fail=mean:10%
+
+Results are stored in `.benchmarks/`, named after the commit they measure.
+
+Included benchmarks:
+- `test_listing`: Lists the 1000 timestamps of a measurement point.
+- `test_single_fetch`: Downloads and decodes a single record.
+- `test_bulk_fetch`: Downloads and decodes 100 records concurrently, with and
+    without network latency.
+- `test_decode`: Parses and decodes a record payload.
+- `test_export`: Writes a record in every core export format.
+- `test_plot_to_file`: Renders a record to a PNG file.
+"""
+import pytest
+
+from benchmarks.stub_server import StubServer
+from t8_client.functions.bulk import fetch_records
+from t8_client.functions.client import WAVES, T8Client
+from t8_client.functions.export import export_record
+from t8_client.functions.plotting import plot_records
+from t8_client.functions.records import Record, parse_record
+
+POINT = ("M", "P", "AM1")
+
+@pytest.fixture(scope="module")
+def record(server: StubServer, client: T8Client) -> Record:
+    """A decoded record of the stand-in server."""
+    response = client.get(client.url(WAVES, *POINT, server.timestamps[0]))
+    return parse_record(WAVES, *POINT, server.timestamps[0], response.content, "zint")
+
+def test_listing(benchmark: object, server: StubServer, client: T8Client) -> None:
+    """Benchmark listing the timestamps of a measurement point."""
+    timestamps = benchmark(client.list_timestamps, WAVES, *POINT)
+    assert len(timestamps) == len(server.timestamps)
+
+def test_single_fetch(benchmark: object, server: StubServer, client: T8Client) -> None:
+    """Benchmark downloading and decoding a single record."""
+    timestamp = server.timestamps[0]
+
+    def fetch() -> Record:
+        response = client.get(client.url(WAVES, *POINT, timestamp))
+        return parse_record(WAVES, *POINT, timestamp, response.content, "zint")
+
+    assert len(benchmark(fetch).values) > 0
+
+@pytest.mark.parametrize("latency", [0.0, 0.005])
+def test_bulk_fetch(benchmark: object, latency: float) -> None:
+    """Benchmark downloading 100 records concurrently."""
+    with (
+        StubServer(samples=8192, count=100, latency=latency) as server,
+        T8Client(server.url, "user", "password") as client,
+    ):
+        result = benchmark.pedantic(
+            fetch_records, args=(client, WAVES, [POINT]), rounds=5
+        )
+    assert result.records == 100  # noqa: PLR2004
+
+def test_decode(benchmark: object, server: StubServer, client: T8Client) -> None:
+    """Benchmark parsing and decoding a record payload."""
+    timestamp = server.timestamps[0]
+    body = client.get(client.url(WAVES, *POINT, timestamp)).content
+    decoded = benchmark(parse_record, WAVES, *POINT, timestamp, body, "zint")
+    assert len(decoded.values) > 0
+
+@pytest.mark.parametrize("fmt", ["csv", "csv.gz", "npy", "npz"])
+def test_export(
+    benchmark: object, record: Record, fmt: str, tmp_path: object
+) -> None:
+    """Benchmark writing a record in an export format."""
+    path = benchmark(export_record, record, str(tmp_path), fmt)
+    assert path.startswith(str(tmp_path))
+
+def test_plot_to_file(benchmark: object, record: Record, tmp_path: object) -> None:
+    """Benchmark rendering a record to a PNG file."""
+    path = str(tmp_path / "plot.png")
+    benchmark(plot_records, [record], "Benchmark", path)
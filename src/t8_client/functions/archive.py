@@ -0,0 +1,268 @@
+"""
+This module provides an appendable archive holding many decoded records.
+
+Saving one file per record turns a month of waves into tens of thousands of
+small files. A `RecordArchive` instead appends every record to a single data
+file and keeps a fixed-size entry per record in an index file next to it:
+
+- `<path>`: The float32 samples of every record, one after another.
+- `<path>.idx`: One entry per record with its identity, timestamp, position in
+    the data file and axis metadata.
+
+Both files are only ever appended to, so a long-running collector can keep
+adding records while readers memory map them. Reading record N is a direct
+lookup of index entry N plus a zero-copy slice of the data file, and a time
+window is resolved with a binary search over the timestamps. Records appended
+out of time order are searched through an argsort of the timestamps, computed
+once per mapping of the index.
+
+The names of a record (host, kind, machine, point and mode) are stored in
+fixed-width fields, so appending a record with a longer name is an error.
+
+Main classes:
+- `RecordArchive`: Appends records to an archive and reads them back.
+"""
+import os
+import threading
+
+import numpy as np
+
+from t8_client.functions.records import Record
+
+# Layout of an index entry
+INDEX_DTYPE = np.dtype(
+    [
+        ("host", "S64"),
+        ("kind", "S8"),
+        ("machine", "S64"),
+        ("point", "S64"),
+        ("pmode", "S32"),
+        ("timestamp", "<i8"),
+        ("offset", "<i8"),
+        ("length", "<i8"),
+        ("factor", "<f8"),
+        ("sample_rate", "<f8"),
+        ("min_freq", "<f8"),
+        ("max_freq", "<f8"),
+    ]
+)
+# dtype of the samples in the data file
+DATA_DTYPE = np.dtype("<f4")
+# Fixed-width name fields of an index entry
+NAME_FIELDS = ("host", "kind", "machine", "point", "pmode")
+
+class RecordArchive:
+    """
+    Append-only archive of decoded records.
+
+    Args:
+        path (str): Path of the data file. The index is stored in `<path>.idx`.
+        mode (str): `r` to read an existing archive, `a` to create it if needed
+            and append records to it.
+    """
+
+    def __init__(self, path: str, mode: str = "r") -> None:
+        if mode not in {"r", "a"}:
+            raise ValueError(f"Invalid mode: {mode}. It must be 'r' or 'a'.")
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self.mode = mode
+        self.lock = threading.Lock()
+        self._data_file = None
+        self._index_file = None
+
+        if mode == "a":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._data_file = open(path, "ab")  # noqa: SIM115
+            self._index_file = open(self.index_path, "ab")  # noqa: SIM115
+        elif not os.path.exists(path) or not os.path.exists(self.index_path):
+            raise FileNotFoundError(f"Archive not found: {path}")
+
+        self._samples = 0
+        self.refresh()
+        self._samples = self._data_size()
+
+    def __enter__(self) -> "RecordArchive":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the files opened for appending.
+        """
+        for file in (self._data_file, self._index_file):
+            if file is not None:
+                file.close()
+        self._data_file = self._index_file = None
+
+    def _data_size(self) -> int:
+        """
+        Returns the number of samples stored in the data file.
+
+        Returns:
+            int: Number of samples.
+        """
+        return os.path.getsize(self.path) // DATA_DTYPE.itemsize
+
+    def refresh(self) -> None:
+        """
+        Maps the records appended since the archive was opened or refreshed.
+        """
+        size = os.path.getsize(self.index_path) // INDEX_DTYPE.itemsize
+        self.index = (
+            np.memmap(self.index_path, dtype=INDEX_DTYPE, mode="r", shape=(size,))
+            if size
+            else np.empty(0, dtype=INDEX_DTYPE)
+        )
+        samples = self._data_size()
+        self.data = (
+            np.memmap(self.path, dtype=DATA_DTYPE, mode="r", shape=(samples,))
+            if samples
+            else np.empty(0, dtype=DATA_DTYPE)
+        )
+        # A binary search over the index is only valid while the timestamps are
+        # sorted; otherwise it runs over their argsort and sorted timestamps,
+        # computed on first use
+        timestamps = self.index["timestamp"]
+        self._sorted = bool(np.all(timestamps[1:] >= timestamps[:-1]))
+        self._order = None
+
+    def _check(self) -> None:
+        """
+        Refreshes the mapping if records were appended since the last one.
+        """
+        size = os.path.getsize(self.index_path)
+        if size // INDEX_DTYPE.itemsize != len(self.index):
+            self.refresh()
+
+    def __len__(self) -> int:
+        self._check()
+        return len(self.index)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """
+        np.ndarray: Timestamp of every record, in archive order.
+        """
+        self._check()
+        return self.index["timestamp"]
+
+    def append(self, record: Record) -> None:
+        """
+        Appends a record to the archive.
+
+        The samples are written before the index entry, so an interrupted
+        append never leaves an index entry pointing past the data.
+
+        Args:
+            record (Record): Record to append.
+
+        Raises:
+            ValueError: If the archive is not open for appending, or a name of
+                the record does not fit in its index field.
+        """
+        if self._data_file is None:
+            raise ValueError("The archive is not open for appending.")
+        names = {name: (getattr(record, name) or "").encode() for name in NAME_FIELDS}
+        for name, value in names.items():
+            if len(value) > INDEX_DTYPE[name].itemsize:
+                raise ValueError(
+                    f"The {name} '{value.decode()}' is longer than the "
+                    f"{INDEX_DTYPE[name].itemsize} bytes of the archive index."
+                )
+        values = np.ascontiguousarray(record.values, dtype=DATA_DTYPE)
+
+        with self.lock:
+            entry = np.zeros(1, dtype=INDEX_DTYPE)
+            for name, value in names.items():
+                entry[name] = value
+            entry["timestamp"] = record.timestamp
+            entry["offset"] = self._samples
+            entry["length"] = len(values)
+            entry["factor"] = record.factor
+            # Missing metadata is stored as NaN
+            for name in ("sample_rate", "min_freq", "max_freq"):
+                value = getattr(record, name)
+                entry[name] = np.nan if value is None else value
+
+            self._data_file.write(values.tobytes())
+            self._data_file.flush()
+            self._index_file.write(entry.tobytes())
+            self._index_file.flush()
+            self._samples += len(values)
+
+    def _record(self, entry: np.void) -> Record:
+        """
+        Builds a record from an index entry, without copying its samples.
+
+        Args:
+            entry (np.void): Index entry.
+
+        Returns:
+            Record: The record, with its samples memory mapped.
+        """
+        offset, length = int(entry["offset"]), int(entry["length"])
+        if offset + length > len(self.data):
+            # The data file grew after it was mapped
+            self.refresh()
+
+        def optional(name: str) -> float | None:
+            value = float(entry[name])
+            return None if np.isnan(value) else value
+
+        return Record(
+            kind=entry["kind"].decode(),
+            machine=entry["machine"].decode(),
+            point=entry["point"].decode(),
+            pmode=entry["pmode"].decode(),
+            timestamp=int(entry["timestamp"]),
+            values=self.data[offset : offset + length],
+            factor=float(entry["factor"]),
+            sample_rate=optional("sample_rate"),
+            min_freq=optional("min_freq"),
+            max_freq=optional("max_freq"),
+            host=entry["host"].decode() or None,
+        )
+
+    def __getitem__(self, n: int) -> Record:
+        """
+        Reads record N of the archive.
+
+        Args:
+            n (int): Position of the record (negative values count from the end).
+
+        Returns:
+            Record: The record, with its samples memory mapped.
+        """
+        self._check()
+        return self._record(self.index[n])
+
+    def window(self, start: int | None = None, end: int | None = None) -> list[Record]:
+        """
+        Reads every record inside a time window.
+
+        Args:
+            start (int | None): Only records at or after this timestamp.
+            end (int | None): Only records at or before this timestamp.
+
+        Returns:
+            list[Record]: Matching records, in archive order.
+        """
+        timestamps, order = self.timestamps, None
+        if not self._sorted:
+            if self._order is None:
+                order = np.argsort(timestamps, kind="stable")
+                self._order = (order, timestamps[order])
+            order, timestamps = self._order
+        first = 0 if start is None else np.searchsorted(timestamps, start, "left")
+        last = (
+            len(timestamps)
+            if end is None
+            else np.searchsorted(timestamps, end, "right")
+        )
+        # Positions of the matching records in the archive, in archive order
+        positions = range(first, last) if order is None else np.sort(order[first:last])
+        return [self._record(self.index[n]) for n in positions]
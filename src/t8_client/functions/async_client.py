@@ -0,0 +1,353 @@
+"""
+This module provides an asyncio client for the T8 REST API.
+
+`AsyncT8Client` is meant to be embedded in asyncio services that poll many T8
+units at once. Its coroutines return decoded `Record` objects and timestamps
+instead of printing them:
+
+- Requests go through an `httpx.AsyncClient`. Several clients (one per T8 unit)
+    can share the same `httpx.AsyncClient`, and therefore its connection pool.
+- Every client limits its concurrent requests, so a slow unit cannot take the
+    whole pool and a busy collector cannot overload a unit.
+- Parsing listings and parsing and decoding record bodies runs in an
+    executor, so the event loop never stalls on JSON, zlib or NumPy.
+- Transient errors are retried with exponential backoff, like `T8Client`.
+
+It requires the optional `httpx` package.
+
+Main classes:
+- `AsyncT8Client`: Coroutines to list and download the records of a T8 unit.
+
+Usage:
+    async with AsyncT8Client("http://t8.example", "user", "password") as client:
+        timestamps = await client.list_waves("LP_Turbine", "MAD31CY005", "AM1")
+        wave = await client.get_wave("LP_Turbine", "MAD31CY005", "AM1", timestamps[-1])
+"""
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor
+
+try:
+    import httpx
+except ImportError as e:
+    raise ImportError(
+        "AsyncT8Client requires the 'httpx' package. "
+        "Install it with: pip install httpx"
+    ) from e
+
+from t8_client.functions.client import (
+    DEFAULT_BACKOFF,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_RETRIES,
+    DEFAULT_TIMEOUT,
+    RETRY_STATUSES,
+    SINCE_PARAM,
+    SPECTRA,
+    WAVES,
+    parse_listing,
+    record_url,
+)
+from t8_client.functions.records import Record, parse_record
+
+# Default number of concurrent requests sent to a single T8 unit
+DEFAULT_HOST_CONCURRENCY = 4
+
+class AsyncT8Client:
+    """
+    Asyncio client for a single T8 unit.
+
+    Args:
+        host (str): Base URL of the T8 unit (e.g. `http://t8.example`).
+        user (str): User name for HTTP basic authentication.
+        password (str): Password for HTTP basic authentication.
+        max_concurrency (int): Maximum number of concurrent requests to the unit.
+        retries (int): Number of retries on transient errors.
+        backoff (float): Backoff factor (seconds) between retries.
+        timeout (float): Timeout (seconds) of every request.
+        http (httpx.AsyncClient | None): HTTP client shared with other units.
+            When omitted, the client opens its own pool of `pool_size`
+            connections and closes it in `aclose`.
+        pool_size (int): Maximum number of connections of the client's own pool.
+        executor (Executor | None): Executor running the parsing and decoding.
+            The default executor of the event loop is used when omitted.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        host: str,
+        user: str | None,
+        password: str | None,
+        max_concurrency: int = DEFAULT_HOST_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        timeout: float = DEFAULT_TIMEOUT,
+        http: httpx.AsyncClient | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        executor: Executor | None = None,
+    ) -> None:
+        self.host = host.rstrip("/")
+        self.auth = (user or "", password or "")
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.executor = executor
+        self.limit = asyncio.Semaphore(max_concurrency)
+
+        self._owns_http = http is None
+        self.http = http or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+            headers={"Accept-Encoding": "gzip, deflate"},
+        )
+
+    async def __aenter__(self) -> "AsyncT8Client":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Closes the connection pool, unless it is shared with other clients.
+        """
+        if self._owns_http:
+            await self.http.aclose()
+
+    async def get(self, url: str, **params: object) -> httpx.Response:
+        """
+        Sends a GET request, retrying transient errors.
+
+        At most `max_concurrency` requests of this client are in flight at any
+        time; the others wait for a slot.
+
+        Args:
+            url (str): URL to request.
+            **params (object): Query parameters.
+
+        Returns:
+            httpx.Response: The response.
+
+        Raises:
+            httpx.HTTPError: If the request fails or the server answers with an
+                error status after every retry.
+        """
+        attempt = 0
+        while True:
+            try:
+                async with self.limit:
+                    response = await self.http.get(
+                        url, params=params, auth=self.auth, timeout=self.timeout
+                    )
+            except httpx.TransportError:
+                if attempt >= self.retries:
+                    raise
+            else:
+                if (
+                    response.status_code not in RETRY_STATUSES
+                    or attempt >= self.retries
+                ):
+                    return response.raise_for_status()
+            # Wait outside the semaphore, so other requests can use the slot
+            await asyncio.sleep(self.backoff * 2**attempt)
+            attempt += 1
+
+    async def _offload(self, function: Callable[..., object], *args: object) -> object:
+        """
+        Runs a CPU bound function in the executor, off the event loop.
+
+        Args:
+            function (Callable[..., object]): Function to run.
+            *args (object): Its arguments.
+
+        Returns:
+            object: The result of the function.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, function, *args
+        )
+
+    async def list_timestamps(  # noqa: PLR0913, PLR0917
+        self,
+        kind: str,
+        machine: str,
+        point: str,
+        pmode: str,
+        array_fmt: str = "zint",
+        since: int | None = None,
+    ) -> list[int]:
+        """
+        Lists the timestamps of the records stored for a measurement point,
+        parsing the listing in the executor.
+
+        Args:
+            kind (str): Record kind (`waves` or `spectra`).
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            array_fmt (str): Array format requested from the server.
+            since (int | None): Only list the records newer than this timestamp.
+
+        Returns:
+            list[int]: Non-zero timestamps, in the order returned by the server.
+        """
+        params = {"array_fmt": array_fmt}
+        if since is not None:
+            params[SINCE_PARAM] = since + 1
+        response = await self.get(
+            record_url(self.host, kind, machine, point, pmode), **params
+        )
+        return await self._offload(parse_listing, response.content, since)
+
+    async def get_record(  # noqa: PLR0913, PLR0917
+        self,
+        kind: str,
+        machine: str,
+        point: str,
+        pmode: str,
+        timestamp: int,
+        array_fmt: str = "zint",
+    ) -> Record:
+        """
+        Downloads a wave or spectrum and decodes it in the executor.
+
+        Args:
+            kind (str): Record kind (`waves` or `spectra`).
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            timestamp (int): Timestamp of the record.
+            array_fmt (str): Array format requested from the server.
+
+        Returns:
+            Record: The decoded record.
+        """
+        response = await self.get(
+            record_url(self.host, kind, machine, point, pmode, timestamp),
+            array_fmt=array_fmt,
+        )
+        return await self._offload(
+            parse_record,
+            kind,
+            machine,
+            point,
+            pmode,
+            timestamp,
+            response.content,
+            array_fmt,
+        )
+
+    async def list_waves(
+        self, machine: str, point: str, pmode: str, **options: object
+    ) -> list[int]:
+        """
+        Lists the timestamps of the waves of a measurement point.
+
+        Args:
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            **options (object): `array_fmt` and `since`, as accepted by
+                `list_timestamps`.
+
+        Returns:
+            list[int]: Timestamps of the waves.
+        """
+        return await self.list_timestamps(WAVES, machine, point, pmode, **options)
+
+    async def list_spectra(
+        self, machine: str, point: str, pmode: str, **options: object
+    ) -> list[int]:
+        """
+        Lists the timestamps of the spectra of a measurement point.
+
+        Args:
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            **options (object): `array_fmt` and `since`, as accepted by
+                `list_timestamps`.
+
+        Returns:
+            list[int]: Timestamps of the spectra.
+        """
+        return await self.list_timestamps(SPECTRA, machine, point, pmode, **options)
+
+    async def get_wave(
+        self,
+        machine: str,
+        point: str,
+        pmode: str,
+        timestamp: int,
+        array_fmt: str = "zint",
+    ) -> Record:
+        """
+        Downloads and decodes a wave.
+
+        Args:
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            timestamp (int): Timestamp of the wave.
+            array_fmt (str): Array format requested from the server.
+
+        Returns:
+            Record: The decoded wave.
+        """
+        return await self.get_record(WAVES, machine, point, pmode, timestamp, array_fmt)
+
+    async def get_spectrum(
+        self,
+        machine: str,
+        point: str,
+        pmode: str,
+        timestamp: int,
+        array_fmt: str = "zint",
+    ) -> Record:
+        """
+        Downloads and decodes a spectrum.
+
+        Args:
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            timestamp (int): Timestamp of the spectrum.
+            array_fmt (str): Array format requested from the server.
+
+        Returns:
+            Record: The decoded spectrum.
+        """
+        return await self.get_record(
+            SPECTRA, machine, point, pmode, timestamp, array_fmt
+        )
+
+    async def get_records(  # noqa: PLR0913, PLR0917
+        self,
+        kind: str,
+        machine: str,
+        point: str,
+        pmode: str,
+        timestamps: list[int],
+        array_fmt: str = "zint",
+    ) -> list[Record]:
+        """
+        Downloads and decodes several records of a measurement point
+        concurrently, within the concurrency limit of the unit.
+
+        Args:
+            kind (str): Record kind (`waves` or `spectra`).
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            timestamps (list[int]): Timestamps of the records.
+            array_fmt (str): Array format requested from the server.
+
+        Returns:
+            list[Record]: The decoded records, in the order of `timestamps`.
+        """
+        return await asyncio.gather(
+            *(
+                self.get_record(kind, machine, point, pmode, timestamp, array_fmt)
+                for timestamp in timestamps
+            )
+        )
@@ -0,0 +1,410 @@
+"""
+This module provides bulk downloads of waves and spectra.
+
+Instead of invoking the CLI once per timestamp, `fetch_records` lists the
+records of one or more measurement points (reusing the listing logic of the
+client), keeps those inside an optional time range, and downloads and decodes
+them concurrently on a bounded thread pool. zlib and NumPy release the GIL, so
+decoding also runs in parallel with the downloads.
+
+When a `ListingIndex` is given, the listings are synchronised incrementally and
+the time range is resolved from the index.
+
+Records found in an optional `RecordCache` are not downloaded again, and
+downloaded records are stored in it.
+
+With a `ProcessStage` (see `pipeline.py`), the threads only download, and the
+bodies are decoded (and exported) on a pool of processes instead. A thread
+hands its body over and starts its next download; the calling thread stores
+every decoded record in the cache and hands it over as the workers finish.
+
+A failing record never aborts the batch: its error is collected in the
+returned `BulkResult`, which also reports the overall throughput.
+
+Main classes and functions:
+- `BulkResult`: Counters, throughput and failures of a bulk download.
+- `parse_selection`: Parses a `MACHINE:POINT:PMODE` selection.
+- `fetch_records`: Downloads every record of a set of selections concurrently.
+- `fetch_timestamps`: Downloads a known set of records concurrently.
+"""
+import queue
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from t8_client.functions.cache import RecordCache
+from t8_client.functions.client import T8Client
+from t8_client.functions.index import ListingIndex
+from t8_client.functions.records import Record, parse_record
+
+if TYPE_CHECKING:
+    from t8_client.functions.pipeline import ProcessStage
+
+# Default number of concurrent downloads
+DEFAULT_WORKERS = 8
+
+# A measurement point selection: (machine, point, pmode)
+Selection = tuple[str, str, str]
+
+@dataclass
+class BulkResult:
+    """
+    Outcome of a bulk download.
+
+    Attributes:
+        kind (str): Record kind (`waves` or `spectra`).
+        records (int): Number of records downloaded and decoded.
+        n_bytes (int): Number of bytes received for those records.
+        elapsed (float): Wall time of the whole batch in seconds.
+        failures (list[tuple[str, str]]): Description and error message of
+            every listing or record that failed.
+    """
+
+    kind: str
+    records: int = 0
+    n_bytes: int = 0
+    elapsed: float = 0.0
+    failures: list[tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def items_per_second(self) -> float:
+        """
+        float: Records processed per second.
+        """
+        return self.records / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        """
+        float: Megabytes received per second.
+        """
+        return self.n_bytes / 1e6 / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        """
+        Builds a human readable summary of the batch.
+
+        Returns:
+            str: One line with counters and throughput, followed by one line
+                per failure.
+        """
+        lines = [
+            f"Fetched {self.records} {self.kind} ({self.n_bytes / 1e6:.2f} MB) "
+            f"in {self.elapsed:.2f} s: {self.items_per_second:.1f} items/s, "
+            f"{self.megabytes_per_second:.2f} MB/s, {len(self.failures)} failed"
+        ]
+        lines.extend(f"Failed {what}: {error}" for what, error in self.failures)
+        return "\n".join(lines)
+
+@dataclass
+class _Decoding:
+    """
+    Record downloaded by a thread and being decoded on the process stage.
+
+    Attributes:
+        future (Future): Resolves to the record, or None if it was exported.
+        n_bytes (int): Number of bytes received for the record.
+        cache (RecordCache | None): Cache to store the record in.
+        key (str): Cache key of the record.
+        on_record (Callable[[Record], None] | None): Called with the record,
+            unless the stage exported it.
+    """
+
+    future: Future
+    n_bytes: int
+    cache: RecordCache | None
+    key: str
+    on_record: Callable[[Record], None] | None
+
+    def finish(self) -> int:
+        """
+        Stores and hands over the decoded record.
+
+        Returns:
+            int: Number of bytes received for the record.
+        """
+        record = self.future.result()
+        if self.cache is not None:
+            self.cache.put(self.key, record)
+        if self.on_record is not None:
+            self.on_record(record)
+        return self.n_bytes
+
+# Function to parse a measurement point selection
+def parse_selection(text: str) -> Selection:
+    """
+    Parses a selection written as `MACHINE:POINT:PMODE`.
+
+    Args:
+        text (str): The selection.
+
+    Returns:
+        Selection: The (machine, point, pmode) triple.
+    """
+    parts = text.split(":")
+    if len(parts) != 3 or not all(parts):  # noqa: PLR2004
+        raise ValueError(
+            f"Invalid selection: {text}. It must be 'MACHINE:POINT:PMODE'."
+        )
+    return tuple(parts)
+
+# Function to list the records of a selection inside a time range
+def _list_one(  # noqa: PLR0913, PLR0917
+    client: T8Client,
+    kind: str,
+    selection: Selection,
+    start: int | None,
+    end: int | None,
+    array_fmt: str,
+    index: ListingIndex | None,
+) -> list[int]:
+    """
+    Lists the timestamps of a selection inside a time range.
+
+    Returns:
+        list[int]: Matching timestamps.
+    """
+    if index is not None:
+        return index.timestamps(
+            client, kind, *selection, start=start, end=end, array_fmt=array_fmt
+        )
+    return [
+        timestamp
+        for timestamp in client.list_timestamps(kind, *selection, array_fmt)
+        if (start is None or timestamp >= start) and (end is None or timestamp <= end)
+    ]
+
+# Function to download and decode a single record of a batch
+def _fetch_one(  # noqa: PLR0913, PLR0917
+    client: T8Client,
+    kind: str,
+    selection: Selection,
+    timestamp: int,
+    array_fmt: str,
+    cache: RecordCache | None,
+    on_record: Callable[[Record], None] | None,
+    stage: "ProcessStage | None" = None,
+) -> int | _Decoding:
+    """
+    Downloads (or loads from the cache), decodes and hands over a single record.
+
+    With a process stage, the body is only handed to it: the record is stored
+    and handed over by `_collect` once it is decoded. Records exported by the
+    stage are not handed over.
+
+    Returns:
+        int | _Decoding: Number of bytes received, or the pending decoding of
+            the record.
+    """
+    machine, point, pmode = selection
+    key = RecordCache.key(
+        client.host, kind, machine, point, pmode, timestamp, array_fmt
+    )
+    n_bytes = 0
+    record = cache.get(key) if cache is not None else None
+
+    if record is None:
+        response = client.get(
+            client.url(kind, machine, point, pmode, timestamp), array_fmt=array_fmt
+        )
+        n_bytes = len(response.content)
+        if stage is not None:
+            # Decode and export the record on a worker process, without
+            # waiting for it
+            decoding = stage.submit(
+                kind,
+                machine,
+                point,
+                pmode,
+                timestamp,
+                response.content,
+                array_fmt,
+                keep=cache is not None,
+            )
+            exported = stage.export is not None
+            return _Decoding(
+                decoding, n_bytes, cache, key, None if exported else on_record
+            )
+        record = parse_record(
+            kind, machine, point, pmode, timestamp, response.content, array_fmt
+        )
+        if cache is not None:
+            cache.put(key, record)
+
+    if on_record is not None:
+        on_record(record)
+    return n_bytes
+
+# Function to download every record of a set of selections
+def fetch_records(  # noqa: PLR0913, PLR0917
+    client: T8Client,
+    kind: str,
+    selections: list[Selection],
+    start: int | None = None,
+    end: int | None = None,
+    array_fmt: str = "zint",
+    workers: int = DEFAULT_WORKERS,
+    cache: RecordCache | None = None,
+    index: ListingIndex | None = None,
+    on_record: Callable[[Record], None] | None = None,
+    stage: "ProcessStage | None" = None,
+) -> BulkResult:
+    """
+    Downloads and decodes every record of a set of selections concurrently.
+
+    Args:
+        client (T8Client): Client used for every request. Its pool should hold
+            at least `workers` connections.
+        kind (str): Record kind (`waves` or `spectra`).
+        selections (list[Selection]): Measurement points to download.
+        start (int | None): Only records at or after this timestamp.
+        end (int | None): Only records at or before this timestamp.
+        array_fmt (str): Array format requested from the server.
+        workers (int): Maximum number of concurrent downloads.
+        cache (RecordCache | None): Cache to read records from and store
+            downloaded records in.
+        index (ListingIndex | None): Index used to list the records
+            incrementally.
+        on_record (Callable[[Record], None] | None): Called from the worker
+            threads (or the calling thread, with a process stage) with every
+            decoded record (e.g. to export it). Records are not kept after the
+            callback returns.
+        stage (ProcessStage | None): Process stage decoding the downloaded
+            records, instead of the download threads. Records it exports are
+            not handed to `on_record`.
+
+    Returns:
+        BulkResult: Counters, throughput and failures of the batch.
+    """
+    result = BulkResult(kind)
+    began = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # List every selection concurrently; a failing listing only skips
+        # its own selection
+        listings = {
+            executor.submit(
+                _list_one, client, kind, selection, start, end, array_fmt, index
+            ): selection
+            for selection in selections
+        }
+        tasks = {}
+        for future in as_completed(listings):
+            selection = listings[future]
+            try:
+                timestamps = future.result()
+            except Exception as e:
+                result.failures.append((f"listing {':'.join(selection)}", str(e)))
+                continue
+            for timestamp in timestamps:
+                task = executor.submit(
+                    _fetch_one,
+                    client,
+                    kind,
+                    selection,
+                    timestamp,
+                    array_fmt,
+                    cache,
+                    on_record,
+                    stage,
+                )
+                tasks[task] = (selection, timestamp)
+
+        _collect(tasks, result)
+
+    result.elapsed = time.perf_counter() - began
+    return result
+
+# Function to wait for the downloads of a batch
+def _collect(tasks: dict, result: BulkResult) -> None:
+    """
+    Waits for the downloads of a batch and counts them in its result.
+
+    Records handed to a process stage are finished (stored in the cache and
+    handed over) on the calling thread as soon as they are decoded, so the
+    download threads never wait for the workers.
+
+    A failing record never aborts the batch: its error is added to the
+    failures of the result.
+
+    Args:
+        tasks (dict): Selection and timestamp of every download future.
+        result (BulkResult): Result updated with the outcome of every download.
+    """
+    finished = queue.SimpleQueue()
+
+    def watch(future: Future, item: tuple) -> None:
+        future.add_done_callback(lambda done: finished.put((done, item)))
+
+    for future, (selection, timestamp) in tasks.items():
+        watch(future, (selection, timestamp, None))
+    pending = len(tasks)
+    while pending:
+        future, (selection, timestamp, decoding) = finished.get()
+        pending -= 1
+        try:
+            outcome = future.result() if decoding is None else decoding.finish()
+            if isinstance(outcome, _Decoding):
+                # Downloaded: wait for the process stage to decode it
+                watch(outcome.future, (selection, timestamp, outcome))
+                pending += 1
+                continue
+            result.n_bytes += outcome
+            result.records += 1
+        except Exception as e:
+            result.failures.append((f"{':'.join(selection)}@{timestamp}", str(e)))
+
+# Function to download a known set of records
+def fetch_timestamps(  # noqa: PLR0913, PLR0917
+    client: T8Client,
+    kind: str,
+    items: list[tuple[Selection, int]],
+    array_fmt: str = "zint",
+    workers: int = DEFAULT_WORKERS,
+    cache: RecordCache | None = None,
+    on_record: Callable[[Record], None] | None = None,
+    stage: "ProcessStage | None" = None,
+) -> BulkResult:
+    """
+    Downloads and decodes records whose timestamps are already known.
+
+    Args:
+        client (T8Client): Client used for every request.
+        kind (str): Record kind (`waves` or `spectra`).
+        items (list[tuple[Selection, int]]): Selection and timestamp of every
+            record to download.
+        array_fmt (str): Array format requested from the server.
+        workers (int): Maximum number of concurrent downloads.
+        cache (RecordCache | None): Cache to read records from and store
+            downloaded records in.
+        on_record (Callable[[Record], None] | None): Called from the worker
+            threads (or the calling thread, with a process stage) with every
+            decoded record.
+        stage (ProcessStage | None): Process stage decoding the downloaded
+            records, instead of the download threads.
+
+    Returns:
+        BulkResult: Counters, throughput and failures of the batch.
+    """
+    result = BulkResult(kind)
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        tasks = {
+            executor.submit(
+                _fetch_one,
+                client,
+                kind,
+                selection,
+                timestamp,
+                array_fmt,
+                cache,
+                on_record,
+                stage,
+            ): (selection, timestamp)
+            for selection, timestamp in items
+        }
+        _collect(tasks, result)
+    result.elapsed = time.perf_counter() - began
+    return result
@@ -0,0 +1,255 @@
+"""
+This module provides a local on-disk cache of decoded waves and spectra.
+
+A record stored on a T8 unit never changes once written, so a decoded record
+can be reused for as long as it is kept locally. Every entry is stored as two
+files named after a hash of (host, kind, machine, point, pmode, timestamp,
+array_fmt):
+
+- `<key>.npy`: The float32 samples, loaded back as a read-only memory map.
+- `<key>.json`: The metadata needed to rebuild the `Record`.
+
+The cache has a size cap. When a new entry pushes it over the cap, the least
+recently used entries (by modification time, refreshed on every hit) are
+evicted. The directory is scanned once per `RecordCache`; after that, the
+order of use and the total size are kept in memory and updated on every put,
+hit and eviction, so storing a record does not list the whole cache. Entries
+added by other processes are seen by the next `RecordCache` that scans it.
+
+Main classes:
+- `RecordCache`: Stores, loads, evicts and reports cached records.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from contextlib import suppress
+from pathlib import Path
+
+import numpy as np
+
+from t8_client.functions.records import Record
+from t8_client.functions.timings import timed
+
+# Default location of the cache
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "t8-client")
+# Default size cap of the cache in bytes
+DEFAULT_CACHE_SIZE = 1 << 30
+
+# Metadata fields stored next to the samples
+METADATA_FIELDS = (
+    "host",
+    "kind",
+    "machine",
+    "point",
+    "pmode",
+    "timestamp",
+    "factor",
+    "sample_rate",
+    "min_freq",
+    "max_freq",
+)
+
+class RecordCache:
+    """
+    Least-recently-used cache of decoded records stored in a directory.
+
+    Args:
+        directory (str): Directory holding the cache entries.
+        max_bytes (int): Size cap of the cache in bytes.
+    """
+
+    def __init__(
+        self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_SIZE
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        # Size of every known entry, least recently used first, and their
+        # total; loaded from the directory on first use
+        self._usage: OrderedDict[str, int] | None = None
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        # Worker processes get the location and cap only, and scan on their own
+        return {"directory": self.directory, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["directory"], state["max_bytes"])
+
+    @staticmethod
+    def key(  # noqa: PLR0913, PLR0917
+        host: str,
+        kind: str,
+        machine: str,
+        point: str,
+        pmode: str,
+        timestamp: int,
+        array_fmt: str,
+    ) -> str:
+        """
+        Builds the cache key of a record.
+
+        Args:
+            host (str): Base URL of the T8 unit.
+            kind (str): Record kind (`waves` or `spectra`).
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            timestamp (int): Timestamp of the record.
+            array_fmt (str): Array format the record was downloaded in.
+
+        Returns:
+            str: Hexadecimal key.
+        """
+        identity = "\0".join(
+            str(part)
+            for part in (host, kind, machine, point, pmode, timestamp, array_fmt)
+        )
+        return hashlib.sha1(identity.encode()).hexdigest()
+
+    def get(self, key: str) -> Record | None:
+        """
+        Loads a cached record.
+
+        Args:
+            key (str): Cache key of the record.
+
+        Returns:
+            Record | None: The record, with its samples memory mapped, or None if
+                it is not cached.
+        """
+        data_path = self.directory / f"{key}.npy"
+        try:
+            with timed("cache"):
+                metadata = json.loads((self.directory / f"{key}.json").read_text())
+                values = np.load(data_path, mmap_mode="r")
+                # Refresh the entry so it is evicted last
+                os.utime(data_path)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            if self._usage is not None and key in self._usage:
+                self._usage.move_to_end(key)
+        return Record(values=values, **metadata)
+
+    def put(self, key: str, record: Record) -> None:
+        """
+        Stores a record and evicts old entries if the cache is over its cap.
+
+        Args:
+            key (str): Cache key of the record.
+            record (Record): Record to store.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        metadata = {name: getattr(record, name) for name in METADATA_FIELDS}
+
+        # Write to temporary files and rename them, so concurrent readers never
+        # see a partial entry. The samples are renamed last, as their presence
+        # marks the entry as complete.
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        meta_tmp = self.directory / f"{key}.json{suffix}"
+        data_tmp = self.directory / f"{key}.npy{suffix}"
+        with timed("cache", np.asarray(record.values).nbytes):
+            meta_tmp.write_text(json.dumps(metadata))
+            with open(data_tmp, "wb") as file:
+                np.save(file, np.asarray(record.values, dtype="f"))
+            size = data_tmp.stat().st_size
+            os.replace(meta_tmp, self.directory / f"{key}.json")
+            os.replace(data_tmp, self.directory / f"{key}.npy")
+
+        with self._lock:
+            usage = self._load_usage()
+            self._total += size - usage.pop(key, 0)
+            usage[key] = size
+            over = self._total > self.max_bytes
+        if over:
+            self.evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        """
+        Lists the cache entries.
+
+        Returns:
+            list[tuple[float, int, Path]]: Last use, size and samples path of
+                every entry, least recently used first.
+        """
+        entries = []
+        for path in self.directory.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted concurrently
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def _load_usage(self) -> OrderedDict[str, int]:
+        """
+        Returns the size of every entry, least recently used first, scanning
+        the directory the first time. Must be called with the lock held.
+        """
+        if self._usage is None:
+            entries = self._entries()
+            self._usage = OrderedDict((path.stem, size) for _, size, path in entries)
+            self._total = sum(self._usage.values())
+        return self._usage
+
+    def _remove(self, path: Path) -> None:
+        """
+        Removes the files of an entry, ignoring those already removed.
+
+        Args:
+            path (Path): Path of the samples of the entry.
+        """
+        for entry_path in (path, path.with_suffix(".json")):
+            with suppress(FileNotFoundError):
+                entry_path.unlink()
+
+    def evict(self) -> int:
+        """
+        Evicts least recently used entries until the cache fits its cap.
+
+        Returns:
+            int: Number of evicted entries.
+        """
+        evicted = 0
+        with self._lock:
+            usage = self._load_usage()
+            while self._total > self.max_bytes and usage:
+                key, size = usage.popitem(last=False)
+                self._remove(self.directory / f"{key}.npy")
+                self._total -= size
+                evicted += 1
+        return evicted
+
+    def stats(self) -> dict:
+        """
+        Reports the usage of the cache.
+
+        Returns:
+            dict: Directory, number of entries, used bytes and size cap.
+        """
+        entries = self._entries() if self.directory.exists() else []
+        return {
+            "directory": str(self.directory),
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self) -> int:
+        """
+        Removes every entry of the cache.
+
+        Returns:
+            int: Number of removed entries.
+        """
+        if not self.directory.exists():
+            return 0
+        with self._lock:
+            entries = self._entries()
+            for _, _, path in entries:
+                self._remove(path)
+            self._usage = None
+        return len(entries)
@@ -0,0 +1,430 @@
+"""
+This module provides the HTTP client used to talk to the T8 REST API.
+
+The `T8Client` class owns a pooled `requests.Session`, so consecutive requests
+to the same T8 unit reuse their TCP/TLS connections and credentials instead of
+opening a new connection for every call. Transient errors (connection resets,
+429 and 5xx responses) are retried with exponential backoff. Requests can be
+rate limited, and the latency and outcome of every request are counted in a
+`RequestStats`.
+
+Main classes and functions:
+- `T8Client`: Pooled session with helpers to build URLs, list records and
+    download (or stream) the JSON document of a wave or spectrum.
+- `RequestStats`: Request, error and latency counters of a client.
+- `record_url`: Builds the REST URL of a listing or of a single record.
+- `parse_listing`: Extracts the record timestamps of a listing document.
+
+Bodies are parsed with the fastest installed JSON backend (see `fastjson.py`).
+
+Usage:
+    with T8Client("http://t8.example", "user", "password") as client:
+        timestamps = client.list_timestamps("waves", "LP_Turbine", "MAD31CY005", "AM1")
+"""
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from t8_client.functions.fastjson import listing_links, loads
+from t8_client.functions.timings import report, timed
+
+# Default number of pooled connections kept per host
+DEFAULT_POOL_SIZE = 10
+# Default number of retries on transient errors
+DEFAULT_RETRIES = 3
+# Default backoff factor (seconds) between retries
+DEFAULT_BACKOFF = 0.5
+# Default timeout (seconds) of every request
+DEFAULT_TIMEOUT = 10
+# HTTP status codes that are considered transient and retried
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Query parameter asking a listing for the records after a timestamp
+SINCE_PARAM = "from"
+
+# Record kinds, as they appear in the REST paths
+WAVES = "waves"
+SPECTRA = "spectra"
+
+class RequestStats:
+    """
+    Thread-safe counters of the requests sent by a client.
+
+    Args:
+        window (int | None): Number of latest latencies kept for the
+            percentiles. Every latency is kept when omitted.
+
+    Attributes:
+        requests (int): Number of requests sent.
+        errors (int): Number of requests that failed or got an error status.
+        latencies (deque[float]): Latency of every request (or of the latest
+            `window` requests) in seconds.
+        longest (float): Longest latency of every request in seconds.
+    """
+
+    def __init__(self, window: int | None = None) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=window)
+        self.longest = 0.0
+        self.total = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, latency: float, error: bool = False) -> None:
+        """
+        Counts a request.
+
+        Args:
+            latency (float): Latency of the request in seconds.
+            error (bool): Whether the request failed.
+        """
+        with self.lock:
+            self.requests += 1
+            self.errors += error
+            self.latencies.append(latency)
+            self.longest = max(self.longest, latency)
+            self.total += latency
+
+    def percentile(self, q: float) -> float:
+        """
+        Returns a percentile of the latencies (of the latest `window` ones).
+
+        Args:
+            q (float): Percentile, between 0 and 100.
+
+        Returns:
+            float: The latency in seconds, or 0 if no request was sent.
+        """
+        with self.lock:
+            latencies = sorted(self.latencies)
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * q / 100))]
+
+    @property
+    def mean(self) -> float:
+        """
+        float: Mean latency of every request in seconds.
+        """
+        with self.lock:
+            return self.total / self.requests if self.requests else 0.0
+
+# Function to build the URL of a listing or a record
+def record_url(  # noqa: PLR0913, PLR0917
+    host: str,
+    kind: str,
+    machine: str,
+    point: str,
+    pmode: str,
+    timestamp: int | None = None,
+) -> str:
+    """
+    Builds the REST URL of a listing or of a single record.
+
+    Args:
+        host (str): Base URL of the T8 unit, without a trailing slash.
+        kind (str): Record kind (`waves` or `spectra`).
+        machine (str): Machine identifier.
+        point (str): Measurement point identifier.
+        pmode (str): Mode of operation.
+        timestamp (int | None): Timestamp of the record, or None for the
+            listing.
+
+    Returns:
+        str: The URL.
+    """
+    url = f"{host}/rest/{kind}/{machine}/{point}/{pmode}/"
+    if timestamp is not None:
+        url += f"{timestamp}/"
+    return url
+
+# Function to extract the timestamps of a listing
+def parse_listing(data: dict | bytes, since: int | None = None) -> list[int]:
+    """
+    Extracts the record timestamps of a listing document.
+
+    Args:
+        data (dict | bytes): JSON document of the listing, parsed or as the
+            raw body. Raw bodies are parsed without building a dict per item
+            when a fast JSON backend is installed.
+        since (int | None): Only keep the records newer than this timestamp.
+
+    Returns:
+        list[int]: Non-zero timestamps, in the order of the document.
+    """
+    if isinstance(data, bytes | bytearray):
+        links = listing_links(data)
+    else:
+        links = (item.get("_links", {}).get("self") for item in data.get("_items", []))
+    timestamps = []
+    for url_self in links:
+        if url_self:
+            # The timestamp is the last segment of the record URL
+            timestamp = int(url_self.rstrip("/").rpartition("/")[2])
+            if timestamp != 0 and (since is None or timestamp > since):
+                timestamps.append(timestamp)
+    return timestamps
+
+class T8Client:
+    """
+    Client for the T8 REST API backed by a pooled, keep-alive HTTP session.
+
+    Args:
+        host (str): Base URL of the T8 unit (e.g. `http://t8.example`).
+        user (str): User name for HTTP basic authentication.
+        password (str): Password for HTTP basic authentication.
+        pool_size (int): Maximum number of connections kept alive.
+        retries (int): Number of retries on transient errors.
+        backoff (float): Backoff factor (seconds) between retries.
+        timeout (float): Timeout (seconds) of every request.
+        rate (float | None): Maximum number of requests per second, or None
+            for no limit.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        host: str,
+        user: str | None,
+        password: str | None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        timeout: float = DEFAULT_TIMEOUT,
+        rate: float | None = None,
+    ) -> None:
+        self.host = host.rstrip("/") if host else host
+        self.timeout = timeout
+        self.stats = RequestStats()
+
+        # Requests are spaced at least 1 / rate seconds apart
+        self.interval = 1 / rate if rate else 0.0
+        self._next_request = 0.0
+        self._rate_lock = threading.Lock()
+
+        # Retry idempotent GET requests on connection errors and transient statuses
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+        )
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.auth = (user, password)
+        self.session.headers.update(
+            {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+        )
+
+    def __enter__(self) -> "T8Client":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes every pooled connection.
+        """
+        self.session.close()
+
+    def url(
+        self,
+        kind: str,
+        machine: str,
+        point: str,
+        pmode: str,
+        timestamp: int | None = None,
+    ) -> str:
+        """
+        Builds the REST URL of a listing or of a single record.
+
+        Args:
+            kind (str): Record kind (`waves` or `spectra`).
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            timestamp (int | None): Timestamp of the record, or None for the
+                listing.
+
+        Returns:
+            str: The URL.
+        """
+        return record_url(self.host, kind, machine, point, pmode, timestamp)
+
+    def _throttle(self) -> None:
+        """
+        Waits until the rate limit allows another request.
+        """
+        if not self.interval:
+            return
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request - now
+            self._next_request = max(now, self._next_request) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def get(self, url: str, **params: object) -> requests.Response:
+        """
+        Sends a GET request through the pooled session, within the rate limit.
+
+        Args:
+            url (str): URL to request.
+            **params (object): Query parameters.
+
+        Returns:
+            requests.Response: The response.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails or the
+                server answers with an error status.
+        """
+        self._throttle()
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            self.stats.add(time.perf_counter() - start, error=True)
+            raise
+        elapsed = time.perf_counter() - start
+        self.stats.add(elapsed)
+        report("network", elapsed, len(response.content))
+        return response
+
+    def stream(
+        self, url: str, chunk_size: int, **params: object
+    ) -> Iterator[bytes]:
+        """
+        Sends a GET request and yields its body in pieces as they arrive,
+        without holding the whole body in memory.
+
+        Args:
+            url (str): URL to request.
+            chunk_size (int): Maximum size of every piece in bytes.
+            **params (object): Query parameters.
+
+        Yields:
+            bytes: Consecutive pieces of the body.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails or the
+                server answers with an error status.
+        """
+        self._throttle()
+        clock = time.perf_counter
+        start = clock()
+        try:
+            response = self.session.get(
+                url, params=params, timeout=self.timeout, stream=True
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            self.stats.add(clock() - start, error=True)
+            raise
+
+        # Only the time spent waiting for the body counts, not the time the
+        # caller spends on every piece
+        elapsed = clock() - start
+        n_bytes = 0
+        with response:
+            pieces = response.iter_content(chunk_size)
+            while True:
+                began = clock()
+                try:
+                    piece = next(pieces, None)
+                except requests.exceptions.RequestException:
+                    self.stats.add(elapsed + clock() - began, error=True)
+                    raise
+                elapsed += clock() - began
+                if piece is None:
+                    break
+                n_bytes += len(piece)
+                yield piece
+        self.stats.add(elapsed)
+        report("network", elapsed, n_bytes)
+
+    def get_json(self, url: str, **params: object) -> dict:
+        """
+        Sends a GET request and returns the decoded JSON body.
+
+        Args:
+            url (str): URL to request.
+            **params (object): Query parameters.
+
+        Returns:
+            dict: The JSON document.
+        """
+        response = self.get(url, **params)
+        with timed("json", len(response.content)):
+            return loads(response.content)
+
+    def list_timestamps(  # noqa: PLR0913, PLR0917
+        self,
+        kind: str,
+        machine: str,
+        point: str,
+        pmode: str,
+        array_fmt: str = "zint",
+        since: int | None = None,
+    ) -> list[int]:
+        """
+        Lists the timestamps of the records stored for a measurement point.
+
+        Args:
+            kind (str): Record kind (`waves` or `spectra`).
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            array_fmt (str): Array format requested from the server.
+            since (int | None): Only list the records newer than this timestamp.
+                The server is asked to filter the listing, and the result is
+                filtered again in case it ignores the parameter.
+
+        Returns:
+            list[int]: Non-zero timestamps, in the order returned by the server.
+        """
+        params = {"array_fmt": array_fmt}
+        if since is not None:
+            params[SINCE_PARAM] = since + 1
+        body = self.get(self.url(kind, machine, point, pmode), **params).content
+        with timed("json", len(body)):
+            return parse_listing(body, since)
+
+    def get_record(  # noqa: PLR0913, PLR0917
+        self,
+        kind: str,
+        machine: str,
+        point: str,
+        pmode: str,
+        timestamp: int,
+        array_fmt: str = "zint",
+    ) -> dict:
+        """
+        Downloads the JSON document of a single wave or spectrum.
+
+        Args:
+            kind (str): Record kind (`waves` or `spectra`).
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            timestamp (int): Timestamp of the record.
+            array_fmt (str): Array format requested from the server.
+
+        Returns:
+            dict: The JSON document of the record.
+        """
+        return self.get_json(
+            self.url(kind, machine, point, pmode, timestamp), array_fmt=array_fmt
+        )
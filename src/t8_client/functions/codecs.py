@@ -0,0 +1,339 @@
+"""
+This module provides the registry of array formats understood by the T8 client.
+
+The T8 REST API returns the samples of waves and spectra as a base64 encoded
+string whose layout depends on the `array_fmt` query parameter. Each supported
+layout is described by a `Codec`, and codecs are registered by name so new
+formats can be plugged in without touching the subcommands.
+
+Decoding is incremental: the base64 string is consumed in fixed-size chunks,
+compressed payloads are inflated through `zlib.decompressobj`, and every chunk
+is converted and scaled straight into a preallocated float32 array. Peak memory
+therefore stays close to the size of the final array instead of holding the
+decoded bytes, the decompressed bytes and the array at the same time.
+
+Main functions:
+- `register_codec`: Adds a codec to the registry.
+- `get_codec`: Returns the codec registered for an array format.
+- `zint_to_float`: Decodes a payload in the default `zint` format.
+
+Registered formats:
+- `zint`: zlib compressed little-endian int16 samples (the API default).
+- `zfloat`: zlib compressed little-endian float32 samples.
+- `int`: Uncompressed little-endian int16 samples.
+- `float`: Uncompressed little-endian float32 samples.
+"""
+import time
+import zlib
+from base64 import b64decode, b64encode
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+import numpy as np
+
+from t8_client.functions import timings
+
+# Number of base64 characters decoded at a time (must be a multiple of 4)
+B64_CHUNK_SIZE = 1 << 20
+# Maximum number of bytes inflated from a single compressed chunk
+INFLATE_CHUNK_SIZE = 4 << 20
+
+# Function to split a payload in pieces decoded one at a time
+def _split(raw_: str | memoryview) -> Iterator[str | memoryview]:
+    """
+    Yields consecutive pieces of `B64_CHUNK_SIZE` characters of a payload.
+    """
+    for start in range(0, len(raw_), B64_CHUNK_SIZE):
+        yield raw_[start : start + B64_CHUNK_SIZE]
+
+@dataclass(frozen=True)
+class Codec:
+    """
+    Describes how the samples of an array format are encoded.
+
+    Attributes:
+        name (str): Value of the `array_fmt` query parameter.
+        dtype (str): NumPy dtype of the samples on the wire.
+        compressed (bool): Whether the samples are zlib compressed.
+    """
+
+    name: str
+    dtype: str
+    compressed: bool
+
+    def iter_bytes(
+        self, raw_: str | memoryview, spent: dict | None = None
+    ) -> Iterator[bytes]:
+        """
+        Yields the decoded (and decompressed) payload in bounded chunks.
+
+        Args:
+            raw_ (str | memoryview): The payload as a base64 encoded string, or
+                a view of its ASCII characters.
+            spent (dict | None): If given, the seconds spent in the `base64`
+                and `zlib` phases are added to it.
+
+        Yields:
+            bytes: Consecutive pieces of the sample buffer.
+        """
+        return self.iter_stream(_split(raw_), spent)
+
+    def iter_stream(
+        self,
+        pieces: Iterable[str | bytes | memoryview],
+        spent: dict | None = None,
+        inflate_size: int = INFLATE_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """
+        Yields the decoded (and decompressed) payload of a base64 string given
+        in consecutive pieces of any length, such as the pieces of a response
+        read from the network.
+
+        Args:
+            pieces (Iterable[str | bytes | memoryview]): Consecutive pieces of
+                the base64 string.
+            spent (dict | None): If given, the seconds spent in the `base64`
+                and `zlib` phases are added to it.
+            inflate_size (int): Maximum number of bytes inflated at once.
+
+        Yields:
+            bytes: Consecutive pieces of the sample buffer.
+        """
+        spent = {"base64": 0.0, "zlib": 0.0} if spent is None else spent
+        clock = time.perf_counter
+        decompressor = zlib.decompressobj() if self.compressed else None
+        carry = b""
+
+        for piece in pieces:
+            if not isinstance(piece, bytes):
+                piece = (  # noqa: PLW2901
+                    piece.encode() if isinstance(piece, str) else bytes(piece)
+                )
+            if carry:
+                piece = carry + piece  # noqa: PLW2901
+            # Base64 decodes in groups of 4 characters; keep the rest for later
+            usable = len(piece) - len(piece) % 4
+            carry = piece[usable:]
+            began = clock()
+            chunk = b64decode(piece[:usable] if carry else piece)
+            spent["base64"] += clock() - began
+            if decompressor is None:
+                yield chunk
+                continue
+            # Inflate with a bounded output size so highly compressible data
+            # never expands into a single huge buffer
+            began = clock()
+            piece = decompressor.decompress(chunk, inflate_size)  # noqa: PLW2901
+            spent["zlib"] += clock() - began
+            yield piece
+            while decompressor.unconsumed_tail:
+                began = clock()
+                piece = decompressor.decompress(  # noqa: PLW2901
+                    decompressor.unconsumed_tail, inflate_size
+                )
+                spent["zlib"] += clock() - began
+                yield piece
+
+        if carry:
+            # An incomplete group is an invalid payload
+            b64decode(carry)
+        if decompressor is not None:
+            yield decompressor.flush()
+
+    def iter_samples(
+        self,
+        pieces: Iterable[str | bytes | memoryview],
+        spent: dict | None = None,
+        inflate_size: int = INFLATE_CHUNK_SIZE,
+        strict: bool = True,
+    ) -> Iterator[np.ndarray]:
+        """
+        Yields the raw samples of a base64 string given in consecutive pieces,
+        without converting or scaling them.
+
+        Args:
+            pieces (Iterable[str | bytes | memoryview]): Consecutive pieces of
+                the base64 string.
+            spent (dict | None): If given, the seconds spent in the `base64`
+                and `zlib` phases are added to it.
+            inflate_size (int): Maximum number of bytes inflated at once.
+            strict (bool): Whether a trailing partial sample is an error. If
+                False, it is ignored.
+
+        Yields:
+            np.ndarray: Consecutive samples, in the dtype of the codec.
+
+        Raises:
+            ValueError: If `strict` and the payload ends with a partial sample.
+        """
+        itemsize = np.dtype(self.dtype).itemsize
+        carry = b""
+        for piece in self.iter_stream(pieces, spent, inflate_size):
+            chunk = carry + piece if carry else piece
+            # Keep the bytes of a sample split across two chunks for the next one
+            usable = len(chunk) - len(chunk) % itemsize
+            carry = chunk[usable:]
+            yield np.frombuffer(chunk, dtype=self.dtype, count=usable // itemsize)
+        if carry and strict:
+            raise ValueError(
+                f"Payload ends with {len(carry)} bytes of a partial "
+                f"{itemsize}-byte sample."
+            )
+
+    def size_hint(self, raw_: str | memoryview) -> int:
+        """
+        Estimates the number of samples encoded in a payload.
+
+        The estimate is exact for uncompressed formats. For compressed formats
+        it is a starting capacity that grows while decoding if needed.
+
+        Args:
+            raw_ (str | memoryview): The payload as a base64 encoded string, or
+                a view of its ASCII characters.
+
+        Returns:
+            int: Estimated number of samples.
+        """
+        tail = raw_[-2:]
+        padding = tail.count("=") if isinstance(tail, str) else bytes(tail).count(b"=")
+        n_bytes = len(raw_) * 3 // 4 - padding
+        if self.compressed:
+            # Vibration data rarely compresses better than 2:1
+            n_bytes *= 2
+        return n_bytes // np.dtype(self.dtype).itemsize
+
+    def decode(
+        self, raw_: str | memoryview, factor: float = 1.0, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        Decodes a payload to a float32 array, applying the scale factor.
+
+        Args:
+            raw_ (str | memoryview): The payload as a base64 encoded string, or
+                a view of its ASCII characters (as handed over by `fastjson`).
+            factor (float): Scale factor applied to every sample.
+            out (np.ndarray | None): Optional float32 array to write the result
+                into. It must have exactly one element per decoded sample.
+
+        Returns:
+            np.ndarray: The decoded samples as a float32 array.
+        """
+        itemsize = np.dtype(self.dtype).itemsize
+        scale = np.float32(factor)
+        buffer = (
+            np.empty(self.size_hint(raw_), dtype="f") if out is None else out
+        )
+        position = 0
+        spent = {"base64": 0.0, "zlib": 0.0, "convert": 0.0}
+        clock = time.perf_counter
+
+        # A trailing odd byte is ignored, as the original decoder did
+        for samples in self.iter_samples(_split(raw_), spent, strict=False):
+            began = clock()
+            end = position + len(samples)
+
+            if end > len(buffer):
+                if out is not None:
+                    raise ValueError(
+                        f"Output array has {len(out)} elements, but the payload "
+                        "holds more samples."
+                    )
+                # Grow in place; only the final array is ever kept alive
+                buffer.resize(max(end, 2 * len(buffer)), refcheck=False)
+
+            # Convert to float and apply the factor in a single pass
+            np.multiply(samples, scale, out=buffer[position:end], dtype="f")
+            position = end
+            spent["convert"] += clock() - began
+
+        if timings.HOOKS:
+            timings.report("base64", spent["base64"], len(raw_))
+            if self.compressed:
+                timings.report("zlib", spent["zlib"], position * itemsize)
+            timings.report("convert", spent["convert"], position * 4)
+
+        if out is not None:
+            if position != len(out):
+                raise ValueError(
+                    f"Output array has shape {out.shape}, expected ({position},)."
+                )
+            return out
+
+        # Release the unused capacity of the estimate
+        buffer.resize(position, refcheck=False)
+        return buffer
+
+    def encode(self, values: np.ndarray) -> str:
+        """
+        Encodes an array of samples in this format.
+
+        Args:
+            values (np.ndarray): Samples to encode.
+
+        Returns:
+            str: The payload as a base64 encoded string.
+        """
+        payload = np.asarray(values).astype(self.dtype).tobytes()
+        if self.compressed:
+            payload = zlib.compress(payload)
+        return b64encode(payload).decode()
+
+# Registry of codecs keyed by array format
+CODECS: dict[str, Codec] = {}
+
+# Function to add a codec to the registry
+def register_codec(codec: Codec) -> Codec:
+    """
+    Registers a codec under its array format name.
+
+    Args:
+        codec (Codec): Codec to register. It replaces any codec registered
+            with the same name.
+
+    Returns:
+        Codec: The registered codec.
+    """
+    CODECS[codec.name] = codec
+    return codec
+
+# Function to look up the codec of an array format
+def get_codec(array_fmt: str) -> Codec:
+    """
+    Returns the codec registered for an array format.
+
+    Args:
+        array_fmt (str): Name of the array format.
+
+    Returns:
+        Codec: The registered codec.
+    """
+    try:
+        return CODECS[array_fmt]
+    except KeyError:
+        raise ValueError(
+            f"Unknown array format: {array_fmt}. "
+            f"Available formats: {', '.join(sorted(CODECS))}."
+        ) from None
+
+register_codec(Codec("zint", "<i2", compressed=True))
+register_codec(Codec("zfloat", "<f4", compressed=True))
+register_codec(Codec("int", "<i2", compressed=False))
+register_codec(Codec("float", "<f4", compressed=False))
+
+# Function to decode compressed data in zint format
+def zint_to_float(
+    raw_: str, factor: float = 1.0, out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Decodes compressed data in zint format to a float array.
+
+    Args:
+        raw_ (str): The compressed data as a base64 encoded string.
+        factor (float): Scale factor applied to every sample.
+        out (np.ndarray | None): Optional float32 array to write the result
+            into. It must have exactly one element per decoded sample.
+
+    Returns:
+        np.array: The decompressed data as a float array.
+    """
+    return CODECS["zint"].decode(raw_, factor, out)
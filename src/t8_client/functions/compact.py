@@ -0,0 +1,281 @@
+"""
+This module stores decoded records compactly, as their raw samples plus the
+scale factor.
+
+A zint record travels as 16-bit integers, but a decoded `Record` holds float32
+samples, twice the size, and CSV turns every sample into about 20 characters
+of text. A compact file (`.t8c`) keeps the int16 samples the record was decoded
+from instead: every float32 sample is an int16 times the factor, so dividing
+by the factor and rounding recovers them exactly. The samples are delta
+encoded (consecutive samples of a wave differ by little), their bytes are
+shuffled (high bytes together, low bytes together), and the result is
+compressed with the fastest installed codec:
+
+- `zstd`: `compression.zstd` (Python 3.14+) or the optional `zstandard`
+    package.
+- `lz4`: The optional `lz4` package.
+- `zlib`: The standard library, always available.
+
+Records whose samples are not whole multiples of their factor (decoded from
+`zfloat` or `float`, or computed on the client) are stored as float32, byte
+shuffled and compressed the same way, so the format is always lossless.
+
+A file holds the magic `T8C1`, the length of a JSON header (4 bytes, little
+endian), the header (the metadata of the record, the dtype, filters and codec
+of the samples and their number) and the compressed samples.
+
+`read_compact` returns a `CompactRecord` holding the raw samples; they are only
+scaled to float32 the first time its `values` are used. Compact files are also
+registered as the `t8c` export format.
+
+Main classes and functions:
+- `CODECS`: Installed compression codecs, fastest first.
+- `write_compact`: Writes a record to a compact file.
+- `read_compact`: Reads a compact file without scaling its samples.
+- `CompactRecord`: Raw samples and metadata of a compact file.
+"""
+import json
+import struct
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+
+from t8_client.functions.records import Record
+from t8_client.functions.timings import timed
+
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+# Start of every compact file
+MAGIC = b"T8C1"
+# Length of the JSON header that follows the magic
+HEADER_LENGTH = struct.Struct("<I")
+# Compression levels, favouring speed for zstd and lz4 and size for zlib
+ZSTD_LEVEL = 3
+ZLIB_LEVEL = 6
+# Fields of a record stored in the header
+RECORD_FIELDS = (
+    "host",
+    "kind",
+    "machine",
+    "point",
+    "pmode",
+    "timestamp",
+    "factor",
+    "sample_rate",
+    "min_freq",
+    "max_freq",
+)
+
+# Compress and decompress functions of every installed codec, fastest first
+COMPRESSORS: dict[str, tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {}
+# Errors raised by the decompress functions on damaged data
+DECOMPRESS_ERRORS: list[type[Exception]] = [zlib.error]
+if zstd is not None:
+    COMPRESSORS["zstd"] = (
+        lambda data: zstd.compress(data, ZSTD_LEVEL),
+        zstd.decompress,
+    )
+    DECOMPRESS_ERRORS.append(zstd.ZstdError)
+elif zstandard is not None:
+    COMPRESSORS["zstd"] = (
+        lambda data: zstandard.ZstdCompressor(ZSTD_LEVEL).compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+    )
+    DECOMPRESS_ERRORS.append(zstandard.ZstdError)
+if lz4_frame is not None:
+    COMPRESSORS["lz4"] = (lz4_frame.compress, lz4_frame.decompress)
+    DECOMPRESS_ERRORS.append(RuntimeError)
+COMPRESSORS["zlib"] = (lambda data: zlib.compress(data, ZLIB_LEVEL), zlib.decompress)
+
+# Installed codecs, fastest first
+CODECS = tuple(COMPRESSORS)
+# Codec used when none is given
+DEFAULT_CODEC = CODECS[0]
+
+# Function to get the functions of a codec
+def _compressor(codec: str) -> tuple[Callable[[bytes], bytes], Callable]:
+    """
+    Returns the compress and decompress functions of an installed codec.
+    """
+    if codec not in COMPRESSORS:
+        raise ValueError(
+            f"Unknown or missing compression codec: {codec}. "
+            f"Available codecs: {', '.join(CODECS)}."
+        )
+    return COMPRESSORS[codec]
+
+# Function to recover the raw samples of a record
+def quantize(values: np.ndarray, factor: float) -> np.ndarray:
+    """
+    Recovers the int16 samples a record was decoded from.
+
+    Args:
+        values (np.ndarray): Scaled float32 samples.
+        factor (float): Scale factor of the record.
+
+    Returns:
+        np.ndarray: The int16 samples if scaling them by the factor gives back
+            exactly the same values, else the values as float32.
+    """
+    values = np.asarray(values, dtype="f")
+    scale = np.float32(factor)
+    if scale and np.isfinite(scale):
+        raw = np.rint(values / scale)
+        info = np.iinfo("<i2")
+        if len(raw) == 0 or (raw.min() >= info.min and raw.max() <= info.max):
+            raw = raw.astype("<i2")
+            if np.array_equal(np.multiply(raw, scale, dtype="f"), values):
+                return raw
+    return values.astype("<f4", copy=False)
+
+# Function to encode the raw samples of a record
+def _encode(raw: np.ndarray) -> tuple[bytes, list[str]]:
+    """
+    Delta encodes (int16 only) and byte shuffles the raw samples.
+    """
+    filters = []
+    if raw.dtype == np.dtype("<i2") and len(raw):
+        # Differences wrap around like the int16 sums that undo them
+        raw = np.diff(raw, prepend=np.int16(0)).astype("<i2", copy=False)
+        filters.append("delta")
+    shuffled = raw.view("u1").reshape(-1, raw.dtype.itemsize).T.tobytes()
+    filters.append("shuffle")
+    return shuffled, filters
+
+# Function to decode the raw samples of a record
+def _decode(data: bytes, dtype: str, filters: list[str]) -> np.ndarray:
+    """
+    Undoes the filters applied by `_encode`.
+    """
+    raw = np.frombuffer(data, dtype="u1")
+    if "shuffle" in filters:
+        itemsize = np.dtype(dtype).itemsize
+        raw = raw.reshape(itemsize, -1).T.copy()
+    raw = raw.view(dtype).reshape(-1)
+    if "delta" in filters:
+        raw = np.cumsum(raw, dtype=dtype)
+    return raw
+
+@dataclass
+class CompactRecord:
+    """
+    Raw samples and metadata read from a compact file.
+
+    Attributes:
+        raw (np.ndarray): Samples as stored, int16 (to be scaled by the factor)
+            or float32 (already scaled).
+        metadata (dict): Fields of the record (`kind`, `machine`, `factor`...).
+    """
+
+    raw: np.ndarray
+    metadata: dict
+
+    @property
+    def factor(self) -> float:
+        """
+        float: Scale factor of the record.
+        """
+        return self.metadata["factor"]
+
+    @cached_property
+    def values(self) -> np.ndarray:
+        """
+        np.ndarray: Scaled float32 samples, computed on first use.
+        """
+        if self.raw.dtype == np.dtype("<f4"):
+            return self.raw
+        with timed("convert", len(self.raw) * 4):
+            return np.multiply(self.raw, np.float32(self.factor), dtype="f")
+
+    def to_record(self) -> Record:
+        """
+        Builds the decoded record, scaling its samples.
+
+        Returns:
+            Record: The record.
+        """
+        return Record(values=self.values, **self.metadata)
+
+# Function to write a record to a compact file
+def write_compact(record: Record, path: str, codec: str | None = None) -> None:
+    """
+    Writes a record as its raw samples and factor, compressed.
+
+    Args:
+        record (Record): Record to write.
+        path (str): Path of the file.
+        codec (str | None): One of `CODECS`; the fastest by default.
+    """
+    codec = DEFAULT_CODEC if codec is None else codec
+    compress, _ = _compressor(codec)
+    raw = quantize(record.values, record.factor)
+    data, filters = _encode(raw)
+    header = {name: getattr(record, name) for name in RECORD_FIELDS}
+    header["timestamp"] = int(record.timestamp)
+    header["factor"] = float(record.factor)
+    header = json.dumps(
+        {
+            "record": header,
+            "dtype": raw.dtype.str,
+            "filters": filters,
+            "codec": codec,
+            "samples": len(raw),
+        }
+    ).encode()
+    with open(path, "wb") as file:
+        file.write(MAGIC + HEADER_LENGTH.pack(len(header)) + header)
+        file.write(compress(data))
+
+# Function to read a compact file
+def read_compact(path: str) -> CompactRecord:
+    """
+    Reads a compact file, leaving its samples unscaled.
+
+    Args:
+        path (str): Path of the file.
+
+    Returns:
+        CompactRecord: The raw samples and the metadata of the record.
+
+    Raises:
+        ValueError: If the file is not a compact file or is damaged.
+    """
+    with open(path, "rb") as file:
+        content = file.read()
+    if content[: len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a compact record file.")
+    start = len(MAGIC) + HEADER_LENGTH.size
+    if len(content) < start:
+        raise ValueError(f"{path} is truncated inside its header.")
+    (length,) = HEADER_LENGTH.unpack_from(content, len(MAGIC))
+    if len(content) < start + length:
+        raise ValueError(f"{path} is truncated inside its header.")
+    header = json.loads(content[start : start + length])
+    _, decompress = _compressor(header["codec"])
+
+    try:
+        data = decompress(content[start + length :])
+    except tuple(DECOMPRESS_ERRORS) as error:
+        raise ValueError(f"{path} has a damaged body: {error}") from error
+    raw = _decode(data, header["dtype"], header["filters"])
+    if len(raw) != header["samples"]:
+        raise ValueError(
+            f"{path} holds {len(raw)} samples instead of {header['samples']}."
+        )
+    return CompactRecord(raw, header["record"])
@@ -0,0 +1,301 @@
+"""
+This module compares a window of spectra against a baseline, band by band, and
+flags the bands that exceed their alarm thresholds.
+
+Spectra of a measurement point may not share the same frequency lines: the
+range (`min_freq`, `max_freq`) or the number of lines can change when the
+configuration of the unit does. Every spectrum is first interpolated onto a
+common grid, the lines of the reference spectrum (the baseline, or the latest
+spectrum) that every spectrum covers. Spectra sharing the same lines are
+interpolated together, as a single 2-D array, and those already on the grid
+are copied as they are.
+
+The RMS of every band is then computed for the whole window at once, as a
+product of the stacked line powers and a line-to-band matrix, and compared
+with the reference of every spectrum:
+
+- A fixed baseline: the band power of one spectrum, or the mean band power of
+    several.
+- The previous N spectra: the mean band power of the N spectra preceding every
+    spectrum of the window, computed with cumulative sums. The first spectrum
+    has no reference.
+
+Deltas are given in dB (10·log10 of the power ratio). A band raises an alarm
+when its delta reaches `alarm_db` or its RMS reaches `alarm_level`.
+
+Main classes and functions:
+- `common_grid`: Returns the frequency lines shared by a set of spectra.
+- `resample_spectra`: Interpolates spectra onto a frequency grid.
+- `split_bands`: Splits a frequency grid into bands of equal width.
+- `compare_spectra`: Computes the band deltas and alarms of a window.
+- `Comparison`: Band levels, deltas and alarms of a window of spectra.
+- `comparison_report`: Formats a comparison as a compact text report.
+"""
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from itertools import pairwise
+
+import numpy as np
+
+from t8_client.functions.records import Record
+from t8_client.functions.spectrum import band_power
+
+# Default number of equal bands the grid is split into when none is given
+DEFAULT_SPLIT = 8
+# Default rise of a band, in dB, that raises an alarm
+DEFAULT_ALARM_DB = 6.0
+# Default number of alarmed spectra listed in the report
+DEFAULT_LIMIT = 10
+# Distance to a line, in lines, below which a grid frequency falls on it
+ROUNDING = 1e-6
+
+@dataclass
+class Comparison:
+    """
+    Band levels, deltas and alarms of a window of spectra.
+
+    Attributes:
+        timestamps (np.ndarray): Timestamp of every spectrum, in ascending
+            order.
+        frequencies (np.ndarray): Common frequency grid in Hz.
+        bands (list[tuple[float, float]]): Compared frequency bands.
+        levels (np.ndarray): RMS of every band of every spectrum, one row per
+            spectrum.
+        reference (np.ndarray): RMS of every band of the reference of every
+            spectrum (NaN when it has none).
+        deltas (np.ndarray): Change of every band against its reference, in dB.
+        alarms (np.ndarray): Whether every band of every spectrum is in alarm.
+    """
+
+    timestamps: np.ndarray
+    frequencies: np.ndarray
+    bands: list[tuple[float, float]]
+    levels: np.ndarray
+    reference: np.ndarray
+    deltas: np.ndarray
+    alarms: np.ndarray
+
+# Function to find the frequency lines shared by a set of spectra
+def common_grid(records: list[Record], reference: Record) -> np.ndarray:
+    """
+    Returns the lines of a reference spectrum covered by every spectrum.
+
+    Args:
+        records (list[Record]): Spectra to compare.
+        reference (Record): Spectrum whose lines make up the grid.
+
+    Returns:
+        np.ndarray: Frequencies of the grid in Hz.
+
+    Raises:
+        ValueError: If the spectra do not share any frequency.
+    """
+    low = max(record.axis_start for record in [reference, *records])
+    high = min(record.axis_stop for record in [reference, *records])
+    frequencies = reference.axis()
+    # Tolerate the rounding of the axis of every record
+    tolerance = 1e-9 * max(abs(high), 1.0)
+    grid = frequencies[
+        (frequencies >= low - tolerance) & (frequencies <= high + tolerance)
+    ]
+    if len(grid) == 0:
+        raise ValueError("The spectra do not share any frequency.")
+    return grid
+
+# Function to interpolate spectra onto a frequency grid
+def resample_spectra(records: list[Record], grid: np.ndarray) -> np.ndarray:
+    """
+    Interpolates spectra linearly onto a frequency grid.
+
+    Spectra with the same lines are interpolated together, with the positions
+    and weights of the grid computed once per group.
+
+    Args:
+        records (list[Record]): Spectra to resample.
+        grid (np.ndarray): Frequencies of the grid in Hz, inside the range of
+            every spectrum.
+
+    Returns:
+        np.ndarray: One row of float32 amplitudes per spectrum, in the order of
+            `records`.
+    """
+    resampled = np.empty((len(records), len(grid)), dtype="f")
+    groups: dict[tuple, list[int]] = {}
+    for i, record in enumerate(records):
+        key = (record.axis_start, record.axis_stop, len(record.values))
+        groups.setdefault(key, []).append(i)
+
+    for (start, stop, lines), indices in groups.items():
+        stacked = np.stack([records[i].values for i in indices])
+        if lines < 2:  # noqa: PLR2004
+            resampled[indices] = stacked[:, :1]
+            continue
+        positions = np.clip((grid - start) / ((stop - start) / (lines - 1)), 0, None)
+        # Lines that fall on the grid up to rounding are copied as they are
+        nearest = np.rint(positions)
+        on_line = np.abs(positions - nearest) < ROUNDING
+        positions = np.where(on_line, nearest, positions)
+        if np.array_equal(positions, nearest):
+            columns = positions.astype(np.intp)
+            if np.array_equal(np.diff(columns), np.ones(len(columns) - 1)):
+                resampled[indices] = stacked[:, columns[0] : columns[-1] + 1]
+            else:
+                resampled[indices] = stacked[:, columns]
+            continue
+        left = np.minimum(positions.astype(np.intp), lines - 2)
+        weight = np.minimum(positions - left, 1.0).astype("f")
+        resampled[indices] = (
+            stacked[:, left] * (1 - weight) + stacked[:, left + 1] * weight
+        )
+    return resampled
+
+# Function to split a grid into equal bands
+def split_bands(frequencies: np.ndarray, count: int) -> list[tuple[float, float]]:
+    """
+    Splits the range of a frequency grid into bands of equal width.
+
+    Args:
+        frequencies (np.ndarray): Frequencies of the grid in Hz.
+        count (int): Number of bands.
+
+    Returns:
+        list[tuple[float, float]]: The bands.
+    """
+    if count < 1:
+        raise ValueError("The grid must be split into at least one band.")
+    edges = np.linspace(frequencies[0], frequencies[-1], count + 1)
+    return [(float(low), float(high)) for low, high in pairwise(edges)]
+
+# Function to compare a window of spectra against a baseline
+def compare_spectra(  # noqa: PLR0913, PLR0917
+    window: list[Record],
+    baseline: list[Record] | None = None,
+    previous: int | None = None,
+    bands: list[tuple[float, float]] | None = None,
+    split: int = DEFAULT_SPLIT,
+    alarm_db: float = DEFAULT_ALARM_DB,
+    alarm_level: float | None = None,
+) -> Comparison:
+    """
+    Computes the band levels, deltas and alarms of a window of spectra.
+
+    Args:
+        window (list[Record]): Spectra to compare, in any order.
+        baseline (list[Record] | None): Spectra whose mean band power is the
+            reference of every spectrum. The earliest spectrum of the window
+            when neither `baseline` nor `previous` is given.
+        previous (int | None): Compare every spectrum with the mean band power
+            of the `previous` spectra before it, instead of a baseline.
+        bands (list[tuple[float, float]] | None): Frequency bands in Hz. The
+            grid is split into `split` equal bands by default.
+        split (int): Number of equal bands used when `bands` is not given.
+        alarm_db (float): Rise of a band, in dB, that raises an alarm.
+        alarm_level (float | None): RMS of a band that raises an alarm,
+            whatever its reference.
+
+    Returns:
+        Comparison: The levels, deltas and alarms of every spectrum and band.
+
+    Raises:
+        ValueError: If there is nothing to compare, or both a baseline and
+            `previous` are given.
+    """
+    if not window:
+        raise ValueError("There are no spectra to compare.")
+    if baseline and previous:
+        raise ValueError("Compare against a baseline or the previous spectra.")
+    if previous is not None and previous < 1:
+        raise ValueError("The number of previous spectra must be at least 1.")
+    window = sorted(window, key=lambda record: record.timestamp)
+    if not baseline and not previous:
+        baseline = window[:1]
+    baseline = baseline or []
+
+    reference = baseline[0] if baseline else window[-1]
+    grid = common_grid([*window, *baseline], reference)
+    bands = bands or split_bands(grid, split)
+
+    power = band_power(grid, resample_spectra(window, grid), bands)
+    if baseline:
+        base = band_power(grid, resample_spectra(baseline, grid), bands)
+        reference_power = np.broadcast_to(base.mean(axis=0), power.shape)
+    else:
+        # Mean of the `previous` rows before every row, from cumulative sums
+        sums = np.vstack([np.zeros(len(bands)), np.cumsum(power, axis=0)])
+        rows = np.arange(len(window))
+        first = np.maximum(rows - previous, 0)
+        counts = (rows - first)[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # The first spectrum has no previous ones: 0 / 0 leaves it NaN
+            reference_power = (sums[rows] - sums[first]) / counts
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deltas = 10 * np.log10(power / reference_power)
+    alarms = deltas >= alarm_db
+    if alarm_level is not None:
+        alarms |= power >= alarm_level**2
+
+    return Comparison(
+        timestamps=np.array([record.timestamp for record in window], dtype=np.int64),
+        frequencies=grid,
+        bands=bands,
+        levels=np.sqrt(power),
+        reference=np.sqrt(reference_power),
+        deltas=deltas,
+        alarms=alarms,
+    )
+
+# Function to format a timestamp for the report
+def _date(timestamp: int) -> str:
+    """
+    Formats a timestamp as an ISO 8601 date in UTC.
+    """
+    return datetime.fromtimestamp(int(timestamp), UTC).strftime("%Y-%m-%dT%H:%M:%S")
+
+# Function to format a comparison as a report
+def comparison_report(comparison: Comparison, limit: int = DEFAULT_LIMIT) -> str:
+    """
+    Formats a comparison as a compact text report.
+
+    The report has one row per band, with the reference and latest RMS, the
+    latest and largest delta and the number of alarms in the window, followed
+    by the latest spectra in alarm and their bands.
+
+    Args:
+        comparison (Comparison): The comparison.
+        limit (int): Maximum number of alarmed spectra listed.
+
+    Returns:
+        str: The report.
+    """
+    grid = comparison.frequencies
+    lines = [
+        f"{len(comparison.timestamps)} spectra from "
+        f"{_date(comparison.timestamps[0])} to {_date(comparison.timestamps[-1])}, "
+        f"{len(grid)} lines from {grid[0]:g} to {grid[-1]:g} Hz",
+        f"{'band (Hz)':<20} {'reference':>10} {'latest':>10} {'delta dB':>9} "
+        f"{'max dB':>8} {'at':>20} {'alarms':>7}",
+    ]
+    deltas = np.where(np.isnan(comparison.deltas), -np.inf, comparison.deltas)
+    worst = np.argmax(deltas, axis=0)
+    for j, (low, high) in enumerate(comparison.bands):
+        top = deltas[worst[j], j]
+        lines.append(
+            f"{f'{low:g}-{high:g}':<20} {comparison.reference[-1, j]:>10.4g} "
+            f"{comparison.levels[-1, j]:>10.4g} {comparison.deltas[-1, j]:>9.2f} "
+            f"{top:>8.2f} {_date(comparison.timestamps[worst[j]]):>20} "
+            f"{int(comparison.alarms[:, j].sum()):>7}"
+        )
+
+    alarmed = np.flatnonzero(comparison.alarms.any(axis=1))
+    lines.append(f"{len(alarmed)} of {len(comparison.timestamps)} spectra in alarm")
+    for i in alarmed[::-1][:limit]:
+        names = ", ".join(
+            f"{low:g}-{high:g} Hz ({comparison.deltas[i, j]:+.1f} dB)"
+            for j, (low, high) in enumerate(comparison.bands)
+            if comparison.alarms[i, j]
+        )
+        lines.append(f"  {_date(comparison.timestamps[i])}: {names}")
+    if len(alarmed) > limit:
+        lines.append(f"  ... and {len(alarmed) - limit} more")
+    return "\n".join(lines)
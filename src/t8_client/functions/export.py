@@ -0,0 +1,321 @@
+"""
+This module provides the file formats records can be exported to.
+
+CSV writes the axis column next to the amplitudes as text, optionally
+compressed with gzip (`csv.gz`). The binary formats store only the float32
+amplitude array plus the axis metadata (start, step and units), which is enough
+to rebuild the axis when reading:
+
+- `npy`: The amplitudes as a `.npy` file plus a `.json` sidecar with the
+    metadata.
+- `npz`: The amplitudes and the metadata in a single `.npz` archive.
+- `parquet`: A single `amplitude` column, with the metadata in the schema.
+    Requires the optional `pyarrow` package.
+- `hdf5`: An `amplitude` dataset, with the metadata as attributes. Requires the
+    optional `h5py` package.
+- `t8c`: The raw int16 samples and the factor, compressed (see `compact.py`).
+
+Records can also be streamed to a single JSON lines file (or the standard
+output), one document per record, with `JsonLinesWriter`.
+
+Main classes and functions:
+- `record_metadata`: Returns the axis and identification metadata of a record.
+- `get_exporter`: Returns the writer of a registered format.
+- `export_record`: Writes a record in one of the registered formats.
+- `load_export`: Reads back the amplitudes and metadata of an exported file.
+- `JsonLinesWriter`: Streams records as JSON lines.
+"""
+import importlib
+import json
+import os
+import sys
+import threading
+from collections.abc import Callable
+
+import numpy as np
+
+from t8_client.functions.compact import read_compact, write_compact
+from t8_client.functions.records import Record
+from t8_client.functions.save_to_csv import save_to_csv
+from t8_client.functions.timings import timed
+
+# Default export format
+DEFAULT_EXPORT_FORMAT = "csv"
+
+# Registries of writers and readers keyed by format, and file extensions
+EXPORTERS: dict[str, Callable[[Record, str], None]] = {}
+LOADERS: dict[str, Callable[[str], tuple[np.ndarray, dict]]] = {}
+EXTENSIONS: dict[str, str] = {}
+
+# Function to register an export format
+def register_exporter(
+    name: str,
+    extension: str,
+    writer: Callable[[Record, str], None],
+    loader: Callable[[str], tuple[np.ndarray, dict]] | None = None,
+) -> None:
+    """
+    Registers an export format.
+
+    Args:
+        name (str): Name of the format.
+        extension (str): File extension, including the dot.
+        writer (Callable[[Record, str], None]): Writes a record to a path.
+        loader (Callable[[str], tuple[np.ndarray, dict]] | None): Reads the
+            amplitudes and metadata back from a path.
+    """
+    EXPORTERS[name] = writer
+    EXTENSIONS[name] = extension
+    if loader is not None:
+        LOADERS[name] = loader
+
+# Function to build the metadata of a record
+def record_metadata(record: Record) -> dict:
+    """
+    Returns the axis and identification metadata of a record.
+
+    Args:
+        record (Record): The record.
+
+    Returns:
+        dict: JSON serialisable metadata, including the axis `start`, `step`
+            and `units`.
+    """
+    return {
+        "host": record.host,
+        "kind": record.kind,
+        "machine": record.machine,
+        "point": record.point,
+        "pmode": record.pmode,
+        "timestamp": int(record.timestamp),
+        "factor": float(record.factor),
+        "sample_rate": record.sample_rate,
+        "min_freq": record.min_freq,
+        "max_freq": record.max_freq,
+        "start": record.axis_start,
+        "step": record.axis_step,
+        "units": record.axis_units,
+        "label": record.axis_label,
+    }
+
+# Function to import an optional dependency
+def _require(module: str, fmt: str) -> object:
+    """
+    Imports the optional dependency of an export format.
+
+    Args:
+        module (str): Name of the module to import.
+        fmt (str): Name of the format that needs it.
+
+    Returns:
+        object: The imported module.
+    """
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        package = module.partition(".")[0]
+        raise ImportError(
+            f"The {fmt} format requires the '{package}' package. "
+            f"Install it with: pip install {package}"
+        ) from e
+
+def _write_csv(record: Record, path: str) -> None:
+    """Writes the axis and amplitudes as CSV text."""
+    save_to_csv(
+        path,
+        record.values,
+        record.axis_start,
+        record.axis_step,
+        record.axis_label,
+        "Amplitude",
+        compress=path.endswith(".gz"),
+    )
+
+def _load_csv(path: str) -> tuple[np.ndarray, dict]:
+    """Reads the amplitudes of a CSV file, compressed or not."""
+    data = np.loadtxt(path, delimiter=",", skiprows=1, dtype="f", ndmin=2)
+    return data[:, 1], {}
+
+def _write_npy(record: Record, path: str) -> None:
+    """Writes the amplitudes as .npy and the metadata as a JSON sidecar."""
+    np.save(path, np.asarray(record.values, dtype="f"))
+    with open(f"{path}.json", "w", encoding="utf-8") as file:
+        json.dump(record_metadata(record), file)
+
+def _load_npy(path: str) -> tuple[np.ndarray, dict]:
+    """Memory maps the amplitudes of a .npy file and reads its sidecar."""
+    with open(f"{path}.json", encoding="utf-8") as file:
+        metadata = json.load(file)
+    return np.load(path, mmap_mode="r"), metadata
+
+def _write_npz(record: Record, path: str) -> None:
+    """Writes the amplitudes and the metadata to a .npz archive."""
+    np.savez(
+        path,
+        amplitude=np.asarray(record.values, dtype="f"),
+        metadata=json.dumps(record_metadata(record)),
+    )
+
+def _load_npz(path: str) -> tuple[np.ndarray, dict]:
+    """Reads the amplitudes and the metadata of a .npz archive."""
+    with np.load(path) as archive:
+        return archive["amplitude"], json.loads(str(archive["metadata"]))
+
+def _write_parquet(record: Record, path: str) -> None:
+    """Writes the amplitudes as a Parquet column with schema metadata."""
+    pa = _require("pyarrow", "parquet")
+    pq = _require("pyarrow.parquet", "parquet")
+    table = pa.table({"amplitude": np.asarray(record.values, dtype="f")})
+    table = table.replace_schema_metadata(
+        {"t8_client": json.dumps(record_metadata(record))}
+    )
+    pq.write_table(table, path)
+
+def _load_parquet(path: str) -> tuple[np.ndarray, dict]:
+    """Reads the amplitudes and the metadata of a Parquet file."""
+    pq = _require("pyarrow.parquet", "parquet")
+    table = pq.read_table(path)
+    metadata = json.loads(table.schema.metadata[b"t8_client"])
+    return table.column("amplitude").to_numpy(), metadata
+
+def _write_hdf5(record: Record, path: str) -> None:
+    """Writes the amplitudes as an HDF5 dataset with attributes."""
+    h5py = _require("h5py", "hdf5")
+    with h5py.File(path, "w") as file:
+        dataset = file.create_dataset(
+            "amplitude", data=np.asarray(record.values, dtype="f")
+        )
+        for key, value in record_metadata(record).items():
+            # HDF5 attributes cannot hold None
+            if value is not None:
+                dataset.attrs[key] = value
+
+def _load_hdf5(path: str) -> tuple[np.ndarray, dict]:
+    """Reads the amplitudes and the attributes of an HDF5 file."""
+    h5py = _require("h5py", "hdf5")
+    with h5py.File(path, "r") as file:
+        dataset = file["amplitude"]
+        metadata = {
+            key: value.item() if hasattr(value, "item") else value
+            for key, value in dataset.attrs.items()
+        }
+        return dataset[()], metadata
+
+def _load_t8c(path: str) -> tuple[np.ndarray, dict]:
+    """Reads a compact file, scaling its samples."""
+    record = read_compact(path).to_record()
+    return record.values, record_metadata(record)
+
+register_exporter("csv", ".csv", _write_csv, _load_csv)
+register_exporter("csv.gz", ".csv.gz", _write_csv, _load_csv)
+register_exporter("npy", ".npy", _write_npy, _load_npy)
+register_exporter("npz", ".npz", _write_npz, _load_npz)
+register_exporter("parquet", ".parquet", _write_parquet, _load_parquet)
+register_exporter("hdf5", ".h5", _write_hdf5, _load_hdf5)
+register_exporter("t8c", ".t8c", write_compact, _load_t8c)
+
+# Function to get the writer of an export format
+def get_exporter(fmt: str) -> Callable[[Record, str], None]:
+    """
+    Returns the writer of an export format.
+
+    Args:
+        fmt (str): Name of the export format.
+
+    Returns:
+        Callable[[Record, str], None]: Writes a record to a path.
+    """
+    if fmt not in EXPORTERS:
+        raise ValueError(
+            f"Unknown export format: {fmt}. "
+            f"Available formats: {', '.join(sorted(EXPORTERS))}."
+        )
+    return EXPORTERS[fmt]
+
+# Function to export a record
+def export_record(
+    record: Record, directory: str = ".", fmt: str = DEFAULT_EXPORT_FORMAT
+) -> str:
+    """
+    Writes a record to a file named after the record.
+
+    Args:
+        record (Record): Record to export.
+        directory (str): Directory where the file is written.
+        fmt (str): Name of the export format.
+
+    Returns:
+        str: Path of the written file.
+    """
+    writer = get_exporter(fmt)
+    path = os.path.join(directory, f"{record.name}{EXTENSIONS[fmt]}")
+    with timed("export") as phase:
+        writer(record, path)
+        phase.n_bytes = os.path.getsize(path)
+    return path
+
+# Function to read an exported file back
+def load_export(path: str, fmt: str | None = None) -> tuple[np.ndarray, dict]:
+    """
+    Reads back the amplitudes and metadata of an exported file.
+
+    Args:
+        path (str): Path of the file.
+        fmt (str | None): Name of the export format. Guessed from the file
+            extension when omitted.
+
+    Returns:
+        tuple[np.ndarray, dict]: The amplitudes and the metadata (empty for
+            CSV files).
+    """
+    if fmt is None:
+        # Prefer the longest matching extension (`.csv.gz` over `.gz`)
+        matches = [name for name, ext in EXTENSIONS.items() if path.endswith(ext)]
+        fmt = max(matches, key=lambda name: len(EXTENSIONS[name]), default=None)
+    if fmt not in LOADERS:
+        raise ValueError(f"Cannot read the format of {path}.")
+    return LOADERS[fmt](path)
+
+class JsonLinesWriter:
+    """
+    Writes records to a JSON lines stream, one document per record.
+
+    Every document holds the metadata of `record_metadata` plus a `values`
+    list. Records can be written from several threads at once.
+
+    Args:
+        path (str): Path of the output file, or `-` for the standard output.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.file = (
+            sys.stdout if path == "-" else open(path, "a", encoding="utf-8")  # noqa: SIM115
+        )
+        self.lock = threading.Lock()
+
+    def __enter__(self) -> "JsonLinesWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the output file, unless it is the standard output.
+        """
+        if self.file is not sys.stdout:
+            self.file.close()
+
+    def write(self, record: Record) -> None:
+        """
+        Writes a record as a single line.
+
+        Args:
+            record (Record): Record to write.
+        """
+        document = record_metadata(record)
+        document["values"] = np.asarray(record.values).tolist()
+        line = json.dumps(document) + "\n"
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
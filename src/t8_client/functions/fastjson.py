@@ -0,0 +1,172 @@
+"""
+This module parses the JSON bodies returned by the T8 REST API.
+
+The stdlib `json` module turns the whole body into Python objects: a listing
+becomes one dict per record just to read its `self` link, and the large base64
+`data` string of a record is copied into a `str` before it is decoded. When an
+optional fast parser is installed, bodies are parsed straight from the raw
+bytes instead:
+
+- `msgspec` decodes the listing, wave and spectrum documents with typed
+    schemas. Unknown fields are skipped, listings yield only their links, and
+    the `data` field is handed to the codecs as a zero-copy view of the body.
+- `orjson` parses generic documents several times faster than `json`.
+
+The best installed backend is picked on import, falling back to `json`, so
+the fast path is enabled by installing the `fastjson` extra. Every function
+also takes an explicit backend, which the benchmarks use to compare them.
+
+Main functions:
+- `loads`: Parses any JSON body.
+- `listing_links`: Extracts the record links of a listing body.
+- `record_document`: Parses the body of a wave or spectrum.
+"""
+import json
+import re
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Installed backends, fastest first
+BACKENDS = tuple(
+    name
+    for name, module in (("msgspec", msgspec), ("orjson", orjson), ("json", json))
+    if module is not None
+)
+# Backend used when none is given
+BACKEND = BACKENDS[0]
+# Escaped character, searched without copying bodies held in shared memory
+ESCAPE = re.compile(rb"\\")
+
+if msgspec is not None:
+    # Listing items hold no reference cycles, so they are not tracked by the
+    # garbage collector, which would otherwise rescan them on every allocation
+
+    class _Links(msgspec.Struct, gc=False):
+        """Links of a listing item; only `self` is decoded."""
+
+        url: str | None = msgspec.field(default=None, name="self")
+
+    class _Item(msgspec.Struct, gc=False):
+        """Item of a listing."""
+
+        links: _Links = msgspec.field(default_factory=_Links, name="_links")
+
+    class _Listing(msgspec.Struct):
+        """Listing of the records of a measurement point."""
+
+        items: list[_Item] = msgspec.field(default_factory=list, name="_items")
+
+    class _Record(msgspec.Struct):
+        """Wave or spectrum, with its samples left as raw JSON."""
+
+        data: msgspec.Raw
+        sample_rate: float | None = None
+        factor: float | None = None
+        min_freq: float | None = None
+        max_freq: float | None = None
+
+    # Decoders are built once and are safe to share between threads
+    _DECODERS = {
+        "listing": msgspec.json.Decoder(_Listing),
+        "record": msgspec.json.Decoder(_Record),
+    }
+
+# Function to check the name of a backend
+def _backend(backend: str | None) -> str:
+    """
+    Returns the backend to use, checking that it is installed.
+    """
+    if backend is None:
+        return BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown or missing JSON backend: {backend}. "
+            f"Available backends: {', '.join(BACKENDS)}."
+        )
+    return backend
+
+# Function to parse a JSON body
+def loads(body: bytes | memoryview, backend: str | None = None) -> object:
+    """
+    Parses a JSON body into Python objects.
+
+    Args:
+        body (bytes | memoryview): The JSON document. The `json` backend copies
+            memoryviews into bytes, the other backends parse them in place.
+        backend (str | None): One of `BACKENDS`; the fastest by default.
+
+    Returns:
+        object: The parsed document.
+    """
+    backend = _backend(backend)
+    if backend == "msgspec":
+        return msgspec.json.decode(body)
+    if backend == "orjson":
+        return orjson.loads(body)
+    if isinstance(body, memoryview):
+        body = body.tobytes()
+    return json.loads(body)
+
+# Function to extract the record links of a listing
+def listing_links(body: bytes, backend: str | None = None) -> list[str]:
+    """
+    Extracts the `self` link of every item of a listing body.
+
+    Args:
+        body (bytes): The JSON document of the listing.
+        backend (str | None): One of `BACKENDS`; the fastest by default.
+
+    Returns:
+        list[str]: The links, in the order of the document. Items without a
+            link are skipped.
+    """
+    backend = _backend(backend)
+    if backend == "msgspec":
+        listing = _DECODERS["listing"].decode(body)
+        return [item.links.url for item in listing.items if item.links.url]
+
+    data = loads(body, backend)
+    links = (item.get("_links", {}).get("self") for item in data.get("_items", []))
+    return [link for link in links if link]
+
+# Function to parse the body of a wave or spectrum
+def record_document(body: bytes | memoryview, backend: str | None = None) -> dict:
+    """
+    Parses the body of a wave or spectrum into the fields used to decode it.
+
+    With `msgspec`, the `data` field is a memoryview of the base64 characters
+    inside `body`, which the codecs decode without copying it into a `str`.
+
+    Args:
+        body (bytes | memoryview): The JSON document of the record.
+        backend (str | None): One of `BACKENDS`; the fastest by default.
+
+    Returns:
+        dict: The document. Fields missing from the body are missing from the
+            dict as well.
+    """
+    backend = _backend(backend)
+    if backend != "msgspec":
+        return loads(body, backend)
+
+    document = _DECODERS["record"].decode(body)
+    fields = {
+        name: getattr(document, name)
+        for name in ("sample_rate", "factor", "min_freq", "max_freq")
+        if getattr(document, name) is not None
+    }
+    data = memoryview(document.data)
+    # Base64 never needs escaping, but some encoders write `/` as `\/`
+    if data[:1] == b'"' and ESCAPE.search(body) is None:
+        fields["data"] = data[1:-1]
+    else:
+        fields["data"] = msgspec.json.decode(data, type=str)
+    return fields
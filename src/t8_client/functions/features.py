@@ -0,0 +1,325 @@
+"""
+This module extracts scalar condition indicators from waves and spectra.
+
+Condition monitoring mostly needs a handful of numbers per record rather than
+the full arrays. The indicators are computed vectorized over stacked arrays,
+one batch per group of records of the same kind and shape:
+
+- Waves: overall RMS, peak, peak-to-peak, crest factor (peak / RMS) and
+    kurtosis (4th standardised moment, 3 for Gaussian noise).
+- Spectra: overall RMS (from the lines) and peak (highest line). The
+    waveform indicators are left empty.
+- Both: the RMS of every configured frequency band. Bands of waves are taken
+    from their amplitude spectrum, computed with `spectrum.amplitude_spectra`
+    and corrected for the noise bandwidth of the window.
+
+`FeatureWriter` buffers records as they arrive and writes one row per record
+to a CSV or JSON lines table, so a long time range is processed in bounded
+memory.
+
+Main classes and functions:
+- `parse_band`: Parses a `LOW:HIGH` frequency band.
+- `extract_features`: Computes the indicators of a list of records.
+- `FeatureWriter`: Streams the indicators of records to a table.
+"""
+import csv
+import io
+import json
+import sys
+import threading
+
+import numpy as np
+
+from t8_client.functions.records import Record
+from t8_client.functions.spectrum import (
+    DEFAULT_WINDOW,
+    amplitude_spectra,
+    band_power,
+    get_window,
+    line_power,
+)
+
+# Identification columns of every row
+KEY_COLUMNS = ("host", "kind", "machine", "point", "pmode", "timestamp")
+# Indicator columns of every row, before the bands
+FEATURES = ("rms", "peak", "peak_to_peak", "crest", "kurtosis")
+# Default number of records buffered before computing their indicators
+DEFAULT_BATCH = 256
+
+# Function to parse a frequency band
+def parse_band(text: str) -> tuple[float, float]:
+    """
+    Parses a frequency band given as `LOW:HIGH` (in Hz).
+
+    Args:
+        text (str): The band.
+
+    Returns:
+        tuple[float, float]: Lowest and highest frequency, both included.
+
+    Raises:
+        ValueError: If the text is not two increasing frequencies.
+    """
+    try:
+        low, high = (float(part) for part in text.split(":"))
+    except ValueError:
+        raise ValueError(f"Invalid band '{text}'. Expected LOW:HIGH in Hz.") from None
+    if not 0 <= low < high:
+        raise ValueError(f"Invalid band '{text}'. LOW must be below HIGH.")
+    return low, high
+
+# Function to name the column of a band
+def band_column(band: tuple[float, float]) -> str:
+    """
+    Returns the column name of a frequency band.
+
+    Args:
+        band (tuple[float, float]): Lowest and highest frequency.
+
+    Returns:
+        str: Name such as `band_10_1000`.
+    """
+    return f"band_{band[0]:g}_{band[1]:g}"
+
+# Function to compute the waveform indicators of a batch
+def _wave_features(waves: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Computes the waveform indicators of every row of a 2-D array.
+
+    Args:
+        waves (np.ndarray): One wave per row.
+
+    Returns:
+        dict[str, np.ndarray]: One array of values per indicator.
+    """
+    waves = waves.astype(np.float64)
+    peak = np.max(np.abs(waves), axis=1)
+    rms = np.sqrt(np.mean(waves**2, axis=1))
+    centred = waves - waves.mean(axis=1, keepdims=True)
+    variance = np.mean(centred**2, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crest = peak / rms
+        kurtosis = np.mean(centred**4, axis=1) / variance**2
+    return {
+        "rms": rms,
+        "peak": peak,
+        "peak_to_peak": np.ptp(waves, axis=1),
+        "crest": crest,
+        "kurtosis": kurtosis,
+    }
+
+# Function to compute the band RMS of a batch of spectra
+def _band_rms(
+    frequencies: np.ndarray,
+    amplitudes: np.ndarray,
+    bands: list[tuple[float, float]],
+    bandwidth: float = 1.0,
+) -> dict[str, np.ndarray]:
+    """
+    Computes the RMS of every band of every row of a 2-D array of peak
+    amplitude spectra.
+
+    Args:
+        frequencies (np.ndarray): Frequency of every line in Hz.
+        amplitudes (np.ndarray): One spectrum per row.
+        bands (list[tuple[float, float]]): Frequency bands.
+        bandwidth (float): Noise bandwidth of the window, in lines.
+
+    Returns:
+        dict[str, np.ndarray]: One array of values per band.
+    """
+    if not bands:
+        return {}
+    rms = np.sqrt(band_power(frequencies, amplitudes, bands, bandwidth))
+    return {band_column(band): rms[:, i] for i, band in enumerate(bands)}
+
+# Function to compute the indicators of a batch of records of the same shape
+def _batch_features(
+    records: list[Record], bands: list[tuple[float, float]], window: str
+) -> dict[str, np.ndarray]:
+    """
+    Computes the indicators of records of the same kind, length and axis.
+
+    Returns:
+        dict[str, np.ndarray]: One array of values per indicator and band.
+    """
+    stacked = np.stack([record.values for record in records])
+    first = records[0]
+    if first.is_wave:
+        features = _wave_features(stacked)
+        if bands:
+            frequencies, amplitudes = amplitude_spectra(
+                stacked, first.sample_rate, window
+            )
+            coefficients = get_window(window)(stacked.shape[1])
+            bandwidth = (
+                len(coefficients) * np.sum(coefficients**2) / np.sum(coefficients) ** 2
+            )
+            features.update(_band_rms(frequencies, amplitudes, bands, bandwidth))
+        return features
+
+    missing = np.full(len(records), np.nan)
+    return {
+        "rms": np.sqrt(line_power(stacked).sum(axis=1)),
+        "peak": np.max(stacked, axis=1).astype(np.float64),
+        "peak_to_peak": missing,
+        "crest": missing,
+        "kurtosis": missing,
+        **_band_rms(first.axis(), stacked, bands),
+    }
+
+# Function to compute the indicators of many records
+def extract_features(
+    records: list[Record],
+    bands: list[tuple[float, float]] | None = None,
+    window: str = DEFAULT_WINDOW,
+) -> list[dict]:
+    """
+    Computes the condition indicators of every record.
+
+    Records of the same kind, length and axis are processed together as a
+    single 2-D array.
+
+    Args:
+        records (list[Record]): Waves and/or spectra.
+        bands (list[tuple[float, float]] | None): Frequency bands whose RMS is
+            computed, in Hz.
+        window (str): Window used to compute the spectra of the waves.
+
+    Returns:
+        list[dict]: One row per record, in the order of `records`, with the
+            identification columns, the indicators and the bands. Indicators
+            that do not apply are NaN.
+    """
+    bands = bands or []
+    batches: dict[tuple, list[int]] = {}
+    for i, record in enumerate(records):
+        key = (
+            record.kind,
+            len(record.values),
+            record.sample_rate,
+            record.min_freq,
+            record.max_freq,
+        )
+        batches.setdefault(key, []).append(i)
+
+    rows: list[dict | None] = [None] * len(records)
+    for indices in batches.values():
+        features = _batch_features([records[i] for i in indices], bands, window)
+        for j, i in enumerate(indices):
+            record = records[i]
+            row = {column: getattr(record, column) for column in KEY_COLUMNS}
+            row.update((name, float(features[name][j])) for name in FEATURES)
+            row.update(
+                (band_column(band), float(features[band_column(band)][j]))
+                for band in bands
+            )
+            rows[i] = row
+    return rows
+
+class FeatureWriter:
+    """
+    Streams the condition indicators of records to a CSV or JSON lines table.
+
+    Records are buffered and their indicators computed in batches, so records
+    can be added one by one, from several threads, in bounded memory. The
+    rows of every batch are sorted by timestamp and written together, batches
+    in the order their indicators are ready.
+
+    Args:
+        path (str): Path of the table, or `-` for the standard output. Files
+            ending in `.jsonl` are written as JSON lines, any other as CSV.
+        bands (list[tuple[float, float]] | None): Frequency bands whose RMS is
+            computed, in Hz.
+        window (str): Window used to compute the spectra of the waves.
+        batch (int): Number of records buffered before computing their
+            indicators.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        bands: list[tuple[float, float]] | None = None,
+        window: str = DEFAULT_WINDOW,
+        batch: int = DEFAULT_BATCH,
+    ) -> None:
+        get_window(window)
+        self.bands = bands or []
+        self.window = window
+        self.batch = batch
+        self.rows = 0
+        self.columns = [*KEY_COLUMNS, *FEATURES, *map(band_column, self.bands)]
+        self.jsonl = path.endswith(".jsonl")
+        self.file = (
+            sys.stdout
+            if path == "-"
+            else open(path, "w", encoding="utf-8", newline="")  # noqa: SIM115
+        )
+        self.buffer: list[Record] = []
+        self.lock = threading.Lock()
+        if not self.jsonl:
+            csv.writer(self.file, lineterminator="\n").writerow(self.columns)
+
+    def __enter__(self) -> "FeatureWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def add(self, record: Record) -> None:
+        """
+        Adds a record, writing the rows of the buffer once it is full.
+
+        The lock is only held to swap the full buffer out and to write its
+        rows, so other threads keep adding records while they are computed.
+
+        Args:
+            record (Record): Wave or spectrum.
+        """
+        with self.lock:
+            self.buffer.append(record)
+            if len(self.buffer) < self.batch:
+                return
+            records, self.buffer = self.buffer, []
+        self._flush(records)
+
+    def _flush(self, records: list[Record]) -> None:
+        """
+        Computes the rows of a batch of records and writes them.
+
+        Args:
+            records (list[Record]): Records taken out of the buffer.
+        """
+        records = sorted(records, key=lambda record: record.timestamp)
+        text = io.StringIO()
+        writer = csv.writer(text, lineterminator="\n")
+        for features in extract_features(records, self.bands, self.window):
+            # Missing indicators are written as empty cells or null, since
+            # NaN is not valid JSON
+            row = {
+                column: None if isinstance(value, float) and np.isnan(value) else value
+                for column, value in features.items()
+            }
+            if self.jsonl:
+                text.write(json.dumps(row) + "\n")
+            else:
+                writer.writerow(
+                    f"{value:.6g}" if isinstance(value, float) else value
+                    for value in row.values()
+                )
+        with self.lock:
+            self.file.write(text.getvalue())
+            self.file.flush()
+            self.rows += len(records)
+
+    def close(self) -> None:
+        """
+        Writes the remaining rows and closes the table, unless it is the
+        standard output.
+        """
+        with self.lock:
+            records, self.buffer = self.buffer, []
+        if records:
+            self._flush(records)
+        if self.file is not sys.stdout:
+            self.file.close()
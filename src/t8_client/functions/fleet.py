@@ -0,0 +1,271 @@
+"""
+This module provides concurrent polling of a fleet of T8 units.
+
+A fleet is described in a TOML file with one `[[hosts]]` table per unit, plus
+an optional `[defaults]` table whose values apply to every unit:
+
+    [defaults]
+    user = "admin"
+    password_env = "T8_PASSWORD"   # Read the password from this variable
+    rate = 5.0                     # Requests per second sent to each unit
+    concurrency = 4                # Concurrent requests sent to each unit
+    retries = 1                    # Retries of transient errors
+    timeout = 5.0                  # Timeout of every request in seconds
+
+    [[hosts]]
+    name = "turbine-1"
+    url = "http://10.0.0.11"
+    select = ["LP_Turbine:MAD31CY005:AM1", "LP_Turbine:MAD31CY006:AM1"]
+
+    [[hosts]]
+    name = "turbine-2"
+    url = "http://10.0.0.12"
+    password = "secret"
+    select = ["LP_Turbine:MAD31CY005:AM1"]
+
+`poll_fleet` downloads the records of every unit concurrently, each through
+its own rate limited `T8Client` and bulk download, and hands every record,
+tagged with the name of its unit, to a single callback. Per-unit latency and
+error counters are returned so slow units stand out.
+
+Main classes and functions:
+- `HostConfig`: Connection settings and selections of a unit.
+- `HostResult`: Outcome and request statistics of polling a unit.
+- `load_fleet`: Reads a fleet configuration file.
+- `poll_fleet`: Downloads the records of every unit concurrently.
+- `fleet_report`: Formats the per-unit outcome as a table.
+"""
+import os
+import tomllib
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from t8_client.functions.bulk import (
+    DEFAULT_WORKERS,
+    BulkResult,
+    Selection,
+    fetch_records,
+    parse_selection,
+)
+from t8_client.functions.cache import RecordCache
+from t8_client.functions.client import (
+    DEFAULT_BACKOFF,
+    DEFAULT_RETRIES,
+    DEFAULT_TIMEOUT,
+    RequestStats,
+    T8Client,
+)
+from t8_client.functions.index import ListingIndex
+from t8_client.functions.records import Record
+
+
+@dataclass
+class HostConfig:
+    """
+    Connection settings and selections of a T8 unit of the fleet.
+
+    Attributes:
+        name (str): Name of the unit, used to tag its records.
+        url (str): Base URL of the unit.
+        user (str | None): User name for HTTP basic authentication.
+        password (str | None): Password for HTTP basic authentication.
+        selections (list[Selection]): Measurement points to poll.
+        rate (float | None): Maximum number of requests per second.
+        concurrency (int): Maximum number of concurrent requests.
+        retries (int): Number of retries on transient errors.
+        backoff (float): Backoff factor (seconds) between retries.
+        timeout (float): Timeout (seconds) of every request.
+    """
+
+    name: str
+    url: str
+    user: str | None = None
+    password: str | None = None
+    selections: list[Selection] = field(default_factory=list)
+    rate: float | None = None
+    concurrency: int = DEFAULT_WORKERS
+    retries: int = DEFAULT_RETRIES
+    backoff: float = DEFAULT_BACKOFF
+    timeout: float = DEFAULT_TIMEOUT
+
+@dataclass
+class HostResult:
+    """
+    Outcome of polling a T8 unit.
+
+    Attributes:
+        name (str): Name of the unit.
+        result (BulkResult): Counters and failures of its downloads.
+        stats (RequestStats): Request, error and latency counters.
+    """
+
+    name: str
+    result: BulkResult
+    stats: RequestStats
+
+# Function to read a fleet configuration file
+def load_fleet(path: str) -> list[HostConfig]:
+    """
+    Reads a fleet configuration file.
+
+    Passwords can be given directly (`password`) or as the name of an
+    environment variable (`password_env`).
+
+    Args:
+        path (str): Path of the TOML file.
+
+    Returns:
+        list[HostConfig]: Settings of every unit, in file order.
+    """
+    with open(path, "rb") as file:
+        config = tomllib.load(file)
+
+    defaults = config.get("defaults", {})
+    hosts = []
+    for table in config.get("hosts", []):
+        options = {**defaults, **table}
+        if "name" not in options or "url" not in options:
+            raise ValueError(f"Every host of {path} needs a 'name' and a 'url'.")
+        password = options.get("password")
+        if password is None and "password_env" in options:
+            password = os.getenv(options["password_env"])
+        hosts.append(
+            HostConfig(
+                name=options["name"],
+                url=options["url"],
+                user=options.get("user"),
+                password=password,
+                selections=[
+                    parse_selection(text) for text in options.get("select", [])
+                ],
+                rate=options.get("rate"),
+                concurrency=int(options.get("concurrency", DEFAULT_WORKERS)),
+                retries=int(options.get("retries", DEFAULT_RETRIES)),
+                backoff=float(options.get("backoff", DEFAULT_BACKOFF)),
+                timeout=float(options.get("timeout", DEFAULT_TIMEOUT)),
+            )
+        )
+    return hosts
+
+# Function to poll a single unit
+def _poll_host(  # noqa: PLR0913, PLR0917
+    host: HostConfig,
+    kind: str,
+    start: int | None,
+    end: int | None,
+    array_fmt: str,
+    cache: RecordCache | None,
+    index: ListingIndex | None,
+    on_record: Callable[[Record], None] | None,
+) -> HostResult:
+    """
+    Downloads the records of a unit and tags them with its name.
+
+    Returns:
+        HostResult: Outcome and request statistics of the unit.
+    """
+    def tag(record: Record) -> None:
+        record.host = host.name
+        if on_record is not None:
+            on_record(record)
+
+    with T8Client(
+        host.url,
+        host.user,
+        host.password,
+        pool_size=host.concurrency,
+        retries=host.retries,
+        backoff=host.backoff,
+        timeout=host.timeout,
+        rate=host.rate,
+    ) as client:
+        result = fetch_records(
+            client,
+            kind,
+            host.selections,
+            start=start,
+            end=end,
+            array_fmt=array_fmt,
+            workers=host.concurrency,
+            cache=cache,
+            index=index,
+            on_record=tag,
+        )
+    return HostResult(host.name, result, client.stats)
+
+# Function to poll every unit of a fleet
+def poll_fleet(  # noqa: PLR0913, PLR0917
+    hosts: list[HostConfig],
+    kind: str,
+    start: int | None = None,
+    end: int | None = None,
+    array_fmt: str = "zint",
+    cache: RecordCache | None = None,
+    index: ListingIndex | None = None,
+    on_record: Callable[[Record], None] | None = None,
+) -> list[HostResult]:
+    """
+    Downloads the records of every unit of a fleet concurrently.
+
+    Every unit is polled by its own client, within its own rate and
+    concurrency limits, so a slow unit does not hold back the others.
+
+    Args:
+        hosts (list[HostConfig]): Units to poll.
+        kind (str): Record kind (`waves` or `spectra`).
+        start (int | None): Only records at or after this timestamp.
+        end (int | None): Only records at or before this timestamp.
+        array_fmt (str): Array format requested from the servers.
+        cache (RecordCache | None): Cache to read records from and store
+            downloaded records in.
+        index (ListingIndex | None): Index used to list the records
+            incrementally.
+        on_record (Callable[[Record], None] | None): Called from the worker
+            threads with every decoded record, tagged with its unit.
+
+    Returns:
+        list[HostResult]: Outcome of every unit, in the order of `hosts`.
+    """
+    if not hosts:
+        return []
+    with ThreadPoolExecutor(max_workers=len(hosts)) as executor:
+        futures = [
+            executor.submit(
+                _poll_host, host, kind, start, end, array_fmt, cache, index, on_record
+            )
+            for host in hosts
+        ]
+        return [future.result() for future in futures]
+
+# Function to format the outcome of a poll
+def fleet_report(results: list[HostResult]) -> str:
+    """
+    Formats the outcome of every unit as a table.
+
+    Args:
+        results (list[HostResult]): Outcome of every unit.
+
+    Returns:
+        str: One header line and one line per unit with its records, failures,
+            requests, request errors and latency (mean, 95th percentile and
+            maximum, in milliseconds), followed by one line per failure.
+    """
+    lines = [
+        f"{'host':<20} {'records':>8} {'failed':>7} {'requests':>9} {'errors':>7} "
+        f"{'mean ms':>8} {'p95 ms':>8} {'max ms':>8}"
+    ]
+    failures = []
+    for host in results:
+        stats = host.stats
+        lines.append(
+            f"{host.name:<20} {host.result.records:>8} "
+            f"{len(host.result.failures):>7} {stats.requests:>9} {stats.errors:>7} "
+            f"{stats.mean * 1000:>8.1f} {stats.percentile(95) * 1000:>8.1f} "
+            f"{stats.percentile(100) * 1000:>8.1f}"
+        )
+        failures.extend(
+            f"Failed {host.name} {what}: {error}"
+            for what, error in host.result.failures
+        )
+    return "\n".join(lines + failures)
@@ -0,0 +1,233 @@
+"""
+This module provides a persistent local index of the records stored on T8 units.
+
+Listing a measurement point with years of history returns a large document, so
+the timestamps already seen are kept in a SQLite database. Synchronising a
+point only asks the server for the records newer than the last indexed one,
+and range queries (`--from`/`--to`, `--last N`) are then answered locally.
+
+Main classes:
+- `ListingIndex`: Stores, synchronises and queries the indexed timestamps.
+"""
+import os
+import sqlite3
+import threading
+
+from t8_client.functions.client import T8Client
+
+# Default location of the index database
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "t8-client", "index.sqlite"
+)
+
+# Table holding one row per known record
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    host TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    machine TEXT NOT NULL,
+    point TEXT NOT NULL,
+    pmode TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    PRIMARY KEY (host, kind, machine, point, pmode, timestamp)
+) WITHOUT ROWID
+"""
+
+# Columns identifying a measurement point in the index
+POINT_FILTER = "host = ? AND kind = ? AND machine = ? AND point = ? AND pmode = ?"
+
+class ListingIndex:
+    """
+    SQLite index of the record timestamps of every measurement point.
+
+    The index can be shared between threads.
+
+    Args:
+        path (str): Path of the database file, or `:memory:`.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            self.connection.execute(SCHEMA)
+
+    def close(self) -> None:
+        """
+        Closes the database.
+        """
+        self.connection.close()
+
+    def last_timestamp(
+        self, host: str, kind: str, machine: str, point: str, pmode: str
+    ) -> int | None:
+        """
+        Returns the newest indexed timestamp of a measurement point.
+
+        Args:
+            host (str): Base URL of the T8 unit.
+            kind (str): Record kind (`waves` or `spectra`).
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+
+        Returns:
+            int | None: The timestamp, or None if the point is not indexed.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT MAX(timestamp) FROM listings WHERE {POINT_FILTER}",
+                (host, kind, machine, point, pmode),
+            ).fetchone()
+        return row[0]
+
+    def add(  # noqa: PLR0913, PLR0917
+        self,
+        host: str,
+        kind: str,
+        machine: str,
+        point: str,
+        pmode: str,
+        timestamps: list[int],
+    ) -> int:
+        """
+        Adds timestamps to the index, ignoring those already indexed.
+
+        Args:
+            host (str): Base URL of the T8 unit.
+            kind (str): Record kind (`waves` or `spectra`).
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            timestamps (list[int]): Timestamps to add.
+
+        Returns:
+            int: Number of timestamps that were not indexed yet.
+        """
+        with self.lock, self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO listings VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (host, kind, machine, point, pmode, timestamp)
+                    for timestamp in timestamps
+                ],
+            )
+            return self.connection.total_changes - before
+
+    def sync(  # noqa: PLR0913, PLR0917
+        self,
+        client: T8Client,
+        kind: str,
+        machine: str,
+        point: str,
+        pmode: str,
+        array_fmt: str = "zint",
+    ) -> int:
+        """
+        Adds the records created since the last synchronisation to the index.
+
+        Only the records newer than the newest indexed one are requested from
+        the server.
+
+        Args:
+            client (T8Client): Client used to list the records.
+            kind (str): Record kind (`waves` or `spectra`).
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            array_fmt (str): Array format requested from the server.
+
+        Returns:
+            int: Number of new records.
+        """
+        last = self.last_timestamp(client.host, kind, machine, point, pmode)
+        timestamps = client.list_timestamps(
+            kind, machine, point, pmode, array_fmt, since=last
+        )
+        return self.add(client.host, kind, machine, point, pmode, timestamps)
+
+    def query(  # noqa: PLR0913, PLR0917
+        self,
+        host: str,
+        kind: str,
+        machine: str,
+        point: str,
+        pmode: str,
+        start: int | None = None,
+        end: int | None = None,
+        last: int | None = None,
+    ) -> list[int]:
+        """
+        Returns the indexed timestamps of a measurement point.
+
+        Args:
+            host (str): Base URL of the T8 unit.
+            kind (str): Record kind (`waves` or `spectra`).
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            start (int | None): Only timestamps at or after this one.
+            end (int | None): Only timestamps at or before this one.
+            last (int | None): Only the newest `last` timestamps of the range.
+
+        Returns:
+            list[int]: Matching timestamps in ascending order.
+        """
+        sql = f"SELECT timestamp FROM listings WHERE {POINT_FILTER}"
+        params = [host, kind, machine, point, pmode]
+        if start is not None:
+            sql += " AND timestamp >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND timestamp <= ?"
+            params.append(end)
+        # Take the newest rows first when limiting, then restore the order
+        sql += " ORDER BY timestamp DESC" if last is not None else " ORDER BY timestamp"
+        if last is not None:
+            sql += " LIMIT ?"
+            params.append(last)
+
+        with self.lock:
+            rows = self.connection.execute(sql, params).fetchall()
+        timestamps = [row[0] for row in rows]
+        return timestamps[::-1] if last is not None else timestamps
+
+    def timestamps(  # noqa: PLR0913, PLR0917
+        self,
+        client: T8Client,
+        kind: str,
+        machine: str,
+        point: str,
+        pmode: str,
+        start: int | None = None,
+        end: int | None = None,
+        last: int | None = None,
+        array_fmt: str = "zint",
+        sync: bool = True,
+    ) -> list[int]:
+        """
+        Synchronises a measurement point and queries its timestamps.
+
+        Args:
+            client (T8Client): Client used to list the records.
+            kind (str): Record kind (`waves` or `spectra`).
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            start (int | None): Only timestamps at or after this one.
+            end (int | None): Only timestamps at or before this one.
+            last (int | None): Only the newest `last` timestamps of the range.
+            array_fmt (str): Array format requested from the server.
+            sync (bool): Whether to ask the server for new records first.
+
+        Returns:
+            list[int]: Matching timestamps in ascending order.
+        """
+        if sync:
+            self.sync(client, kind, machine, point, pmode, array_fmt)
+        return self.query(
+            client.host, kind, machine, point, pmode, start, end, last
+        )
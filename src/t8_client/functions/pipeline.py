@@ -0,0 +1,376 @@
+"""
+This module runs the decode and export stage of bulk downloads on a pool of
+processes.
+
+The threads of a bulk download spend most of their time waiting on the
+network, but parsing, inflating, converting and exporting a record holds the
+GIL for part of its work, and formatting CSV text holds it all the time, so a
+batch ends up bound to a single core. A `ProcessStage` splits the batch in two
+stages:
+
+- The I/O stage: the download threads of `bulk.py`, which hand every body to
+    `ProcessStage.submit` and go back to downloading, and the thread
+    collecting the batch, which stores every decoded record in the cache and
+    hands it over.
+- The decode/export stage: a `ProcessPoolExecutor` whose workers parse and
+    decode the body and, when an export destination is set, write its file.
+
+The cache stays in the I/O stage: a single `RecordCache` keeps the usage of
+the whole batch in memory, which copies of it in every worker could not.
+
+Bodies and decoded samples are not pickled through the pipes of the pool:
+every body is copied into a shared memory block that the worker parses in
+place, and a record that goes back to the I/O stage has its samples written to
+a block that becomes the buffer of its values, unmapped once they are released.
+Only job descriptions and metadata go through the pipes. At most `queue_depth`
+bodies wait in or for the process stage at once: downloads run ahead of the
+workers until then, and the slot of a body is freed as soon as its job ends,
+which bounds the shared memory in use.
+
+Main classes:
+- `ProcessStage`: Pool of processes decoding (and exporting) downloaded
+    bodies.
+- `SharedSamples`: Decoded samples held in a shared memory block.
+"""
+import ctypes
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass
+from functools import partial
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from t8_client.functions import timings
+from t8_client.functions.cache import METADATA_FIELDS, RecordCache
+from t8_client.functions.export import export_record
+from t8_client.functions.records import Record, parse_record
+from t8_client.functions.timings import Timings
+
+# Default number of worker processes
+DEFAULT_PROCESSES = os.cpu_count() or 1
+# Blocks are attached without registering them again with the resource
+# tracker, where supported; the process that created a block unlinks it
+ATTACH_OPTIONS = {"track": False} if sys.version_info >= (3, 13) else {}
+# Workers are started from a clean server process: forking the client while its
+# download threads hold locks could deadlock the copies
+START_METHOD = (
+    "forkserver"
+    if "forkserver" in multiprocessing.get_all_start_methods()
+    else "spawn"
+)
+
+@dataclass(frozen=True)
+class DecodeJob:
+    """
+    Record to decode on a worker process.
+
+    Attributes:
+        kind (str): Record kind (`waves` or `spectra`).
+        machine (str): Machine identifier.
+        point (str): Measurement point identifier.
+        pmode (str): Mode of operation.
+        timestamp (int): Timestamp of the record.
+        array_fmt (str): Array format of the body.
+        block (str): Name of the shared memory block holding the body.
+        size (int): Size of the body in bytes.
+        export (tuple[str, str] | None): Directory and format of the file to
+            write the record to, instead of returning its samples.
+        keep (bool): Whether to return the samples of an exported record too.
+        collect (bool): Whether to measure the phases of the job.
+    """
+
+    kind: str
+    machine: str
+    point: str
+    pmode: str
+    timestamp: int
+    array_fmt: str
+    block: str
+    size: int
+    export: tuple[str, str] | None = None
+    keep: bool = False
+    collect: bool = False
+
+# Function to prepare a worker process
+def _init_worker() -> None:
+    """
+    Drops the timing hooks inherited from the parent process, which may write
+    to its files; the phases of every job are sent back instead.
+    """
+    timings.HOOKS.clear()
+
+# Function to decode a record on a worker process
+def _run_job(job: DecodeJob) -> tuple[dict, str | None, int]:
+    """
+    Decodes the body of a job and exports or hands back the record.
+
+    Returns:
+        tuple[dict, str | None, int]: Metadata of the record, name of the block
+            holding its samples (None if it was exported and not kept) and
+            number of samples.
+    """
+    block = shared_memory.SharedMemory(job.block, **ATTACH_OPTIONS)
+    try:
+        record = parse_record(
+            job.kind,
+            job.machine,
+            job.point,
+            job.pmode,
+            job.timestamp,
+            block.buf[: job.size],
+            job.array_fmt,
+        )
+    finally:
+        # A failed parse may still hold views of the body in its traceback, the
+        # block is then unmapped once the error is released
+        with suppress(BufferError):
+            block.close()
+
+    metadata = {name: getattr(record, name) for name in METADATA_FIELDS}
+    if job.export is not None:
+        directory, fmt = job.export
+        os.makedirs(directory, exist_ok=True)
+        export_record(record, directory, fmt)
+        if not job.keep:
+            return metadata, None, len(record.values)
+
+    # The I/O thread maps the block as the values of the record and unlinks it
+    out = shared_memory.SharedMemory(create=True, size=max(record.values.nbytes, 1))
+    try:
+        np.ndarray(len(record.values), "f", buffer=out.buf)[:] = record.values
+    finally:
+        out.close()
+    return metadata, out.name, len(record.values)
+
+# Function to decode a record on a worker process, measuring its phases
+def _decode(job: DecodeJob) -> tuple[dict, str | None, int, dict]:
+    """
+    Runs a job on a worker process.
+
+    Returns:
+        tuple[dict, str | None, int, dict]: The outcome of `_run_job` and the
+            totals of the phases of the job, if they were collected.
+    """
+    if not job.collect:
+        return (*_run_job(job), {})
+    with Timings() as collector:
+        outcome = _run_job(job)
+    return (*outcome, collector.totals)
+
+class SharedSamples:
+    """
+    Float32 samples held in a shared memory block, exposed to numpy through
+    the array interface.
+
+    The arrays built from it keep it as their base, so the block stays mapped
+    while any of them is alive and is closed once the last one is released.
+
+    Args:
+        block (shared_memory.SharedMemory): Block holding the samples.
+        n_samples (int): Number of samples.
+    """
+
+    def __init__(self, block: shared_memory.SharedMemory, n_samples: int) -> None:
+        self.block = block
+        # The address is taken without keeping an export of the buffer, which
+        # would stop the block from closing
+        address = ctypes.addressof(ctypes.c_char.from_buffer(block.buf))
+        self.__array_interface__ = {
+            "shape": (n_samples,),
+            "typestr": np.dtype("f").str,
+            "data": (address, False),
+            "version": 3,
+        }
+
+class ProcessStage:
+    """
+    Decode and export stage of bulk downloads, running on a pool of processes.
+
+    The download threads `submit` every body and go back to downloading, up
+    to `queue_depth` bodies ahead of the workers; `run` submits a body and
+    waits for its record.
+
+    Args:
+        processes (int): Number of worker processes.
+        queue_depth (int | None): Maximum number of bodies waiting in or for
+            the process stage; twice the number of processes by default.
+        export (tuple[str, str] | None): Directory and format of the files the
+            workers write every decoded record to. If None, the records are
+            handed back to the download threads.
+    """
+
+    def __init__(
+        self,
+        processes: int = DEFAULT_PROCESSES,
+        queue_depth: int | None = None,
+        export: tuple[str, str] | None = None,
+    ) -> None:
+        if processes < 1:
+            raise ValueError("The process stage needs at least one process.")
+        if queue_depth is not None and queue_depth < 1:
+            raise ValueError("The queue depth must be at least 1.")
+        self.processes = processes
+        self.queue_depth = queue_depth or 2 * processes
+        self.export = export
+        self.slots = threading.BoundedSemaphore(self.queue_depth)
+        self.executor = ProcessPoolExecutor(
+            processes,
+            mp_context=multiprocessing.get_context(START_METHOD),
+            initializer=_init_worker,
+        )
+
+    def __enter__(self) -> "ProcessStage":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Waits for the pending jobs and stops the worker processes.
+        """
+        self.executor.shutdown()
+
+    def submit(  # noqa: PLR0913, PLR0917
+        self,
+        kind: str,
+        machine: str,
+        point: str,
+        pmode: str,
+        timestamp: int,
+        body: bytes,
+        array_fmt: str = "zint",
+        keep: bool = False,
+    ) -> Future:
+        """
+        Hands a body to a worker process without waiting for it to be decoded.
+
+        Only blocks while `queue_depth` bodies are already waiting in or for
+        the process stage.
+
+        Args:
+            kind (str): Record kind (`waves` or `spectra`).
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            timestamp (int): Timestamp of the record.
+            body (bytes): Body of the API response.
+            array_fmt (str): Array format of the body.
+            keep (bool): Whether to hand back records the stage exports too.
+
+        Returns:
+            Future: Resolves to the decoded record, or None if it was exported
+                and not kept.
+        """
+        self.slots.acquire()
+        block = None
+        try:
+            block = shared_memory.SharedMemory(create=True, size=max(len(body), 1))
+            block.buf[: len(body)] = body
+            job = DecodeJob(
+                kind,
+                machine,
+                point,
+                pmode,
+                timestamp,
+                array_fmt,
+                block.name,
+                len(body),
+                self.export,
+                keep,
+                collect=bool(timings.HOOKS),
+            )
+            decoding = self.executor.submit(_decode, job)
+        except BaseException:
+            self._release(block)
+            raise
+        outcome = Future()
+        decoding.add_done_callback(partial(self._finish, block, outcome))
+        return outcome
+
+    def _release(self, block: shared_memory.SharedMemory | None) -> None:
+        """
+        Frees the body block of a job and its slot in the queue.
+        """
+        if block is not None:
+            block.close()
+            block.unlink()
+        self.slots.release()
+
+    def _finish(
+        self, block: shared_memory.SharedMemory, outcome: Future, decoding: Future
+    ) -> None:
+        """
+        Frees the body of a finished job and resolves its outcome with the
+        record, mapping its samples without copying them.
+        """
+        self._release(block)
+        if decoding.cancelled():
+            outcome.cancel()
+            return
+        try:
+            metadata, name, n_samples, totals = decoding.result()
+            for phase, (_, seconds, n_bytes) in totals.items():
+                timings.report(phase, seconds, n_bytes)
+            record = None
+            if name is not None:
+                out = shared_memory.SharedMemory(name, **ATTACH_OPTIONS)
+                # The mapping outlives the name, so nothing is left behind on
+                # errors
+                out.unlink()
+                record = Record(
+                    values=np.asarray(SharedSamples(out, n_samples)), **metadata
+                )
+        except Exception as e:
+            outcome.set_exception(e)
+        else:
+            outcome.set_result(record)
+
+    def run(  # noqa: PLR0913, PLR0917
+        self,
+        kind: str,
+        machine: str,
+        point: str,
+        pmode: str,
+        timestamp: int,
+        body: bytes,
+        array_fmt: str = "zint",
+        cache: RecordCache | None = None,
+        key: str | None = None,
+    ) -> Record | None:
+        """
+        Decodes a body on a worker process and waits for it, storing the record
+        in the cache from the calling thread.
+
+        Args:
+            kind (str): Record kind (`waves` or `spectra`).
+            machine (str): Machine identifier.
+            point (str): Measurement point identifier.
+            pmode (str): Mode of operation.
+            timestamp (int): Timestamp of the record.
+            body (bytes): Body of the API response.
+            array_fmt (str): Array format of the body.
+            cache (RecordCache | None): Cache to store the record in.
+            key (str | None): Cache key of the record.
+
+        Returns:
+            Record | None: The decoded record, or None if it was exported.
+        """
+        record = self.submit(
+            kind,
+            machine,
+            point,
+            pmode,
+            timestamp,
+            body,
+            array_fmt,
+            keep=cache is not None,
+        ).result()
+        if cache is not None:
+            cache.put(key, record)
+        return None if self.export is not None else record
@@ -0,0 +1,258 @@
+"""
+This module renders records with matplotlib, decimated to screen resolution.
+
+Handing a million-sample wave straight to `plot` makes drawing and zooming
+sluggish, while a screen only shows a few thousand columns. Every trace is
+therefore reduced to the minimum and maximum of the samples under each pixel
+column (a min/max envelope), which looks identical to the full trace, and is
+decimated again from the full data whenever the visible range changes, so
+zooming in reveals every sample.
+
+Figures are shown interactively, or rendered straight to a PNG/SVG/PDF file
+with a figure that is not attached to any GUI backend, so plots can be
+generated on headless servers.
+
+Main classes and functions:
+- `minmax_decimate`: Reduces one or more traces to a min/max envelope.
+- `DecimatedLine`: A line that re-decimates when its axes are zoomed.
+- `Waterfall`: Many records of a common axis stacked with a time offset.
+- `plot_records`: Plots records as lines or as a waterfall.
+"""
+from datetime import UTC, datetime
+
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from t8_client.functions.records import Record
+
+# Envelope buckets per pixel column of the axes
+BUCKETS_PER_PIXEL = 1
+# Number of records labelled on the time axis of a waterfall
+WATERFALL_LABELS = 8
+
+# Function to reduce traces to a min/max envelope
+def minmax_decimate(  # noqa: PLR0913, PLR0917
+    values: np.ndarray,
+    start: float,
+    step: float,
+    lower: float,
+    upper: float,
+    buckets: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reduces the visible part of one or more traces to the minimum and maximum
+    of every bucket.
+
+    Args:
+        values (np.ndarray): A trace, or one trace per row of a 2-D array.
+        start (float): Axis value of the first sample.
+        step (float): Axis distance between consecutive samples.
+        lower (float): Lowest visible axis value.
+        upper (float): Highest visible axis value.
+        buckets (int): Number of buckets, usually the width of the axes in
+            pixels.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The axis values and the decimated
+            traces, with the same number of dimensions as `values`. Ranges that
+            hold fewer than two samples per bucket are returned unchanged.
+    """
+    n_samples = values.shape[-1]
+    # Keep one sample beyond each edge so the trace reaches the border
+    if step > 0:
+        first = max(0, int(np.floor((lower - start) / step)) - 1)
+        last = min(n_samples, int(np.ceil((upper - start) / step)) + 2)
+    else:
+        first, last = 0, n_samples
+    last = max(last, first)
+
+    if last - first <= 2 * buckets:
+        indices = np.arange(first, last)
+        return start + step * indices, values[..., first:last]
+
+    # Reduce every bucket of every trace in a single call each
+    edges = np.linspace(first, last, buckets + 1).astype(np.int64)[:-1]
+    visible = values[..., first:last]
+    lows = np.minimum.reduceat(visible, edges - first, axis=-1)
+    highs = np.maximum.reduceat(visible, edges - first, axis=-1)
+
+    envelope = np.empty((*values.shape[:-1], 2 * buckets), dtype=values.dtype)
+    envelope[..., 0::2] = lows
+    envelope[..., 1::2] = highs
+    return np.repeat(start + step * edges, 2), envelope
+
+# Function to measure the width of axes in pixels
+def _buckets(axes: Axes) -> int:
+    """
+    Returns the number of envelope buckets that fill the width of some axes.
+    """
+    return max(1, int(axes.bbox.width * BUCKETS_PER_PIXEL))
+
+class DecimatedLine:
+    """
+    A line drawn from its min/max envelope, decimated again from the full data
+    whenever the visible range of its axes changes.
+
+    Args:
+        axes (Axes): Axes to draw the line on.
+        record (Record): Record whose amplitudes are drawn against its axis.
+        **style (object): Keyword arguments of `Axes.plot`.
+    """
+
+    def __init__(self, axes: Axes, record: Record, **style: object) -> None:
+        self.axes = axes
+        self.values = np.asarray(record.values)
+        self.start = record.axis_start
+        self.step = record.axis_step
+        stop = self.start + self.step * max(len(self.values) - 1, 0)
+
+        x, y = minmax_decimate(
+            self.values, self.start, self.step, self.start, stop, _buckets(axes)
+        )
+        (self.line,) = axes.plot(x, y, **style)
+        axes.set_xlim(self.start, stop)
+        axes.callbacks.connect("xlim_changed", self.update)
+
+    def update(self, axes: Axes) -> None:
+        """
+        Decimates the line to the visible range of the axes.
+
+        Args:
+            axes (Axes): The axes whose limits changed.
+        """
+        lower, upper = sorted(axes.get_xlim())
+        self.line.set_data(
+            *minmax_decimate(
+                self.values, self.start, self.step, lower, upper, _buckets(axes)
+            )
+        )
+
+class Waterfall:
+    """
+    Many records of a common axis drawn as a single collection of lines, each
+    shifted upwards by its position in time and coloured by it.
+
+    Drawing hundreds of traces as one decimated collection keeps panning and
+    zooming responsive.
+
+    Args:
+        axes (Axes): Axes to draw the waterfall on.
+        records (list[Record]): Records sharing the same axis, oldest first.
+        spacing (float | None): Vertical distance between consecutive records.
+            Defaults to half the median peak amplitude.
+
+    Raises:
+        ValueError: If the records do not share the same axis.
+    """
+
+    def __init__(
+        self, axes: Axes, records: list[Record], spacing: float | None = None
+    ) -> None:
+        first = records[0]
+        for record in records:
+            if (
+                len(record.values) != len(first.values)
+                or record.axis_start != first.axis_start
+                or record.axis_step != first.axis_step
+            ):
+                raise ValueError(
+                    f"{record.name} does not share the axis of {first.name}; "
+                    "a waterfall needs records of the same length and axis."
+                )
+
+        self.axes = axes
+        self.values = np.stack([record.values for record in records])
+        self.start = first.axis_start
+        self.step = first.axis_step
+        if spacing is None:
+            spacing = float(np.median(np.max(np.abs(self.values), axis=1))) / 2
+        self.offsets = np.arange(len(records))[:, None] * (spacing or 1.0)
+
+        self.lines = LineCollection([], cmap="viridis", linewidths=0.8)
+        self.lines.set_array(np.arange(len(records)))
+        axes.add_collection(self.lines)
+        stop = self.start + self.step * (self.values.shape[1] - 1)
+        axes.set_xlim(self.start, stop)
+        axes.set_ylim(
+            float(np.min(self.values)),
+            float(np.max(self.values) + self.offsets[-1, 0]),
+        )
+        self.update(axes)
+        axes.callbacks.connect("xlim_changed", self.update)
+
+        # Label a few records with their date
+        ticks = np.unique(
+            np.linspace(0, len(records) - 1, WATERFALL_LABELS).astype(int)
+        )
+        axes.set_yticks(self.offsets[ticks, 0])
+        axes.set_yticklabels(
+            [
+                datetime.fromtimestamp(records[i].timestamp, UTC).strftime(
+                    "%Y-%m-%d %H:%M"
+                )
+                for i in ticks
+            ]
+        )
+
+    def update(self, axes: Axes) -> None:
+        """
+        Decimates every trace to the visible range of the axes.
+
+        Args:
+            axes (Axes): The axes whose limits changed.
+        """
+        lower, upper = sorted(axes.get_xlim())
+        x, y = minmax_decimate(
+            self.values, self.start, self.step, lower, upper, _buckets(axes)
+        )
+        y = y + self.offsets
+        # (traces, points, 2) array of vertices, built without a Python loop
+        self.lines.set_segments(
+            np.stack([np.broadcast_to(x, y.shape), y], axis=-1)
+        )
+
+# Function to plot records
+def plot_records(
+    records: list[Record],
+    title: str,
+    output: str | None = None,
+    waterfall: bool = False,
+) -> None:
+    """
+    Plots records, decimated to the resolution of the figure.
+
+    Args:
+        records (list[Record]): Records to plot.
+        title (str): Title of the figure.
+        output (str | None): Path of the image to render (its extension sets
+            the format, e.g. `.png` or `.svg`). The figure is shown in a window
+            when omitted.
+        waterfall (bool): Whether to stack the records as a waterfall instead
+            of overlaying them.
+    """
+    if output:
+        # A figure without pyplot renders through Agg and needs no display
+        figure = Figure(figsize=(10, 6) if waterfall else (8, 5))
+    else:
+        # pyplot picks a GUI backend, so it is only loaded to show figures
+        from matplotlib import pylab  # noqa: PLC0415
+
+        figure = pylab.figure()
+    axes = figure.add_subplot()
+    axes.set_title(title)
+    axes.set_xlabel(records[0].axis_label)
+    axes.grid(True)
+
+    if waterfall:
+        Waterfall(axes, sorted(records, key=lambda record: record.timestamp))
+    else:
+        axes.set_ylabel("Amplitude")
+        for record in records:
+            DecimatedLine(axes, record)
+
+    if output:
+        figure.savefig(output, bbox_inches="tight")
+    else:
+        pylab.show()
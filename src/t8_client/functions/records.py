@@ -0,0 +1,189 @@
+"""
+This module provides the in-memory representation of decoded waves and spectra.
+
+The `Record` dataclass holds the scaled samples of a wave or a spectrum together
+with the metadata needed to rebuild its axis, and `decode_record` builds one
+from the JSON document returned by the T8 REST API.
+
+Main classes and functions:
+- `Record`: Decoded samples plus metadata of a single wave or spectrum.
+- `decode_record`: Decodes the JSON document of a wave or spectrum.
+- `parse_record`: Parses and decodes the raw body of a wave or spectrum.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from t8_client.functions.client import WAVES
+from t8_client.functions.codecs import get_codec
+from t8_client.functions.fastjson import record_document
+from t8_client.functions.timings import timed
+
+
+@dataclass
+class Record:
+    """
+    Decoded wave or spectrum.
+
+    Attributes:
+        kind (str): Record kind (`waves` or `spectra`).
+        machine (str): Machine identifier.
+        point (str): Measurement point identifier.
+        pmode (str): Mode of operation.
+        timestamp (int): Timestamp of the record.
+        values (np.ndarray): Scaled samples as a float32 array.
+        factor (float): Scale factor applied to the raw samples.
+        sample_rate (float | None): Sample rate in Hz (waves only).
+        min_freq (float | None): Frequency of the first line in Hz (spectra only).
+        max_freq (float | None): Frequency of the last line in Hz (spectra only).
+        host (str | None): Name of the T8 unit the record comes from, when
+            several units are polled.
+    """
+
+    kind: str
+    machine: str
+    point: str
+    pmode: str
+    timestamp: int
+    values: np.ndarray
+    factor: float = 1.0
+    sample_rate: float | None = None
+    min_freq: float | None = None
+    max_freq: float | None = None
+    host: str | None = None
+
+    @property
+    def is_wave(self) -> bool:
+        """
+        bool: Whether the record is a wave.
+        """
+        return self.kind == WAVES
+
+    @property
+    def axis_label(self) -> str:
+        """
+        str: Label of the axis (time for waves, frequency for spectra).
+        """
+        return "Time (ms)" if self.is_wave else "Frequency (Hz)"
+
+    @property
+    def axis_units(self) -> str:
+        """
+        str: Units of the axis (milliseconds for waves, hertz for spectra).
+        """
+        return "ms" if self.is_wave else "Hz"
+
+    @property
+    def axis_start(self) -> float:
+        """
+        float: First value of the axis.
+        """
+        return 0.0 if self.is_wave else float(self.min_freq)
+
+    @property
+    def axis_stop(self) -> float:
+        """
+        float: Last value of the axis.
+        """
+        if self.is_wave:
+            return len(self.values) / self.sample_rate * 1000
+        return float(self.max_freq)
+
+    @property
+    def axis_step(self) -> float:
+        """
+        float: Distance between consecutive axis values.
+        """
+        if len(self.values) < 2:  # noqa: PLR2004
+            return 0.0
+        return (self.axis_stop - self.axis_start) / (len(self.values) - 1)
+
+    @property
+    def name(self) -> str:
+        """
+        str: Base name used for files exported from the record.
+        """
+        return f"{self.machine}_{self.point}_{self.pmode}_{self.timestamp}"
+
+    def axis(self) -> np.ndarray:
+        """
+        Generates the time or frequency axis of the record.
+
+        Returns:
+            np.ndarray: One axis value per sample.
+        """
+        return np.linspace(self.axis_start, self.axis_stop, len(self.values))
+
+# Function to decode a wave or spectrum document
+def decode_record(  # noqa: PLR0913, PLR0917
+    kind: str,
+    machine: str,
+    point: str,
+    pmode: str,
+    timestamp: int,
+    data: dict,
+    array_fmt: str = "zint",
+) -> Record:
+    """
+    Decodes the JSON document of a wave or spectrum.
+
+    Args:
+        kind (str): Record kind (`waves` or `spectra`).
+        machine (str): Machine identifier.
+        point (str): Measurement point identifier.
+        pmode (str): Mode of operation.
+        timestamp (int): Timestamp of the record.
+        data (dict): JSON document returned by the API.
+        array_fmt (str): Array format of the `data` field.
+
+    Returns:
+        Record: The decoded record.
+    """
+    record = Record(kind, machine, point, pmode, timestamp, values=None)
+
+    # Extract relevant fields from the JSON response
+    if kind == WAVES:
+        record.sample_rate = float(data["sample_rate"])
+        record.factor = float(data.get("factor", 1))
+    else:
+        record.min_freq = data.get("min_freq", 0)
+        record.max_freq = data["max_freq"]
+        record.factor = data["factor"]
+
+    # Decode the raw data using the specified format and apply the factor
+    record.values = get_codec(array_fmt).decode(data["data"], record.factor)
+    return record
+
+# Function to parse and decode the body of a record response
+def parse_record(  # noqa: PLR0913, PLR0917
+    kind: str,
+    machine: str,
+    point: str,
+    pmode: str,
+    timestamp: int,
+    body: bytes | memoryview,
+    array_fmt: str = "zint",
+) -> Record:
+    """
+    Parses the raw JSON body of a wave or spectrum and decodes it.
+
+    Both steps are CPU bound, so callers running an event loop hand this
+    function to an executor as a single unit. The body is parsed with the
+    fastest installed JSON backend, which may hand the samples to the codec
+    without copying them out of `body`.
+
+    Args:
+        kind (str): Record kind (`waves` or `spectra`).
+        machine (str): Machine identifier.
+        point (str): Measurement point identifier.
+        pmode (str): Mode of operation.
+        timestamp (int): Timestamp of the record.
+        body (bytes | memoryview): Body of the API response.
+        array_fmt (str): Array format of the `data` field.
+
+    Returns:
+        Record: The decoded record.
+    """
+    with timed("json", len(body)):
+        data = record_document(body)
+    return decode_record(kind, machine, point, pmode, timestamp, data, array_fmt)
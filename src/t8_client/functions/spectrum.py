@@ -0,0 +1,227 @@
+"""
+This module computes amplitude spectra from decoded waves on the client.
+
+The spectra served by the T8 units come in fixed resolutions and processing
+modes. Computing them locally from the waves allows any window, resolution and
+averaging:
+
+- Every wave is split into segments of `segment` samples overlapping by
+    `overlap` (Welch's method), each segment is windowed and transformed with a
+    real FFT, and the power of the segments is averaged. Without `segment`,
+    each wave is transformed as a whole.
+- Amplitudes are single-sided peak amplitudes, corrected for the gain of the
+    window, so a sine of amplitude A shows a line of height A.
+- Waves of the same length and sample rate are stacked into a 2-D array and
+    transformed in a single FFT call, which is much faster than one call per
+    wave for many short waves.
+
+The power of the lines and frequency bands of peak amplitude spectra, used by
+the features and the comparison of spectra, is computed here as well.
+
+Main functions:
+- `get_window`: Looks up a window function by name.
+- `amplitude_spectra`: Computes the spectra of the rows of a 2-D array.
+- `line_power`: Computes the power of every line of amplitude spectra.
+- `band_power`: Computes the power of frequency bands of amplitude spectra.
+- `compute_spectra`: Computes the spectrum records of a list of wave records.
+"""
+from collections.abc import Callable
+from dataclasses import replace
+
+import numpy as np
+
+from t8_client.functions.client import SPECTRA
+from t8_client.functions.records import Record
+
+# Window functions by name, returning `n` coefficients
+WINDOWS = {
+    "rect": np.ones,
+    "hann": np.hanning,
+    "hamming": np.hamming,
+    "blackman": np.blackman,
+}
+# Default window applied to every segment
+DEFAULT_WINDOW = "hann"
+# Default fraction of overlap between consecutive segments
+DEFAULT_OVERLAP = 0.5
+
+# Function to look up a window function by name
+def get_window(name: str) -> Callable[[int], np.ndarray]:
+    """
+    Returns the window function registered under a name.
+
+    Args:
+        name (str): Name of the window.
+
+    Returns:
+        Callable[[int], np.ndarray]: Function returning the `n` coefficients of
+            the window.
+
+    Raises:
+        ValueError: If no window is registered under that name.
+    """
+    try:
+        return WINDOWS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown window '{name}'. Available windows: {', '.join(WINDOWS)}."
+        ) from None
+
+# Function to compute the amplitude spectra of a batch of waves
+def amplitude_spectra(
+    waves: np.ndarray,
+    sample_rate: float,
+    window: str = DEFAULT_WINDOW,
+    segment: int | None = None,
+    overlap: float = DEFAULT_OVERLAP,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the averaged amplitude spectrum of every row of a 2-D array.
+
+    Args:
+        waves (np.ndarray): One wave per row, all of the same length. A 1-D
+            array is handled as a single wave.
+        sample_rate (float): Sample rate of the waves in Hz.
+        window (str): Name of the window applied to every segment.
+        segment (int | None): Number of samples of every segment. The whole
+            wave is a single segment when omitted.
+        overlap (float): Fraction of overlap between consecutive segments,
+            between 0 (included) and 1 (excluded).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The frequency of every line in Hz and
+            the amplitude spectra, with one row per wave.
+
+    Raises:
+        ValueError: If the window is unknown, or the segment or overlap are out
+            of range.
+    """
+    window_function = get_window(window)
+    waves = np.atleast_2d(np.asarray(waves, dtype=np.float32))
+    n_samples = waves.shape[-1]
+    segment = segment or n_samples
+    if not 2 <= segment <= n_samples:  # noqa: PLR2004
+        raise ValueError(f"The segment must have between 2 and {n_samples} samples.")
+    if not 0 <= overlap < 1:
+        raise ValueError("The overlap must be at least 0 and less than 1.")
+
+    # Split every wave into overlapping segments without copying them:
+    # (waves, segments, samples)
+    step = max(1, int(segment * (1 - overlap)))
+    frames = np.lib.stride_tricks.sliding_window_view(waves, segment, axis=-1)
+    frames = frames[:, ::step]
+
+    # Window and transform every segment of every wave in one call
+    coefficients = window_function(segment).astype(np.float32)
+    transform = np.fft.rfft(frames * coefficients, axis=-1)
+
+    # Average the power of the segments, then scale to peak amplitudes:
+    # doubled except for the DC and Nyquist lines, and corrected for the
+    # coherent gain of the window
+    power = np.mean(transform.real**2 + transform.imag**2, axis=1)
+    amplitudes = np.sqrt(power) * (2 / coefficients.sum())
+    amplitudes[:, 0] /= 2
+    if segment % 2 == 0:
+        amplitudes[:, -1] /= 2
+
+    frequencies = np.fft.rfftfreq(segment, 1 / sample_rate)
+    return frequencies, amplitudes.astype(np.float32)
+
+# Function to compute the power of the lines of amplitude spectra
+def line_power(amplitudes: np.ndarray, bandwidth: float = 1.0) -> np.ndarray:
+    """
+    Computes the power of every line of peak amplitude spectra.
+
+    Args:
+        amplitudes (np.ndarray): Peak amplitude spectra.
+        bandwidth (float): Noise bandwidth of the window the spectra were
+            computed with, in lines.
+
+    Returns:
+        np.ndarray: The float64 power of every line.
+    """
+    # Each line of peak amplitude A carries a power of A² / 2
+    return amplitudes.astype(np.float64) ** 2 / (2 * bandwidth)
+
+# Function to compute the power of frequency bands of amplitude spectra
+def band_power(
+    frequencies: np.ndarray,
+    amplitudes: np.ndarray,
+    bands: list[tuple[float, float]],
+    bandwidth: float = 1.0,
+) -> np.ndarray:
+    """
+    Computes the power of every band of every row of a 2-D array of peak
+    amplitude spectra, as the product of the line powers and a line-to-band
+    matrix. Bands include both of their edges.
+
+    Args:
+        frequencies (np.ndarray): Frequency of every line in Hz.
+        amplitudes (np.ndarray): One spectrum per row.
+        bands (list[tuple[float, float]]): Frequency bands.
+        bandwidth (float): Noise bandwidth of the window, in lines.
+
+    Returns:
+        np.ndarray: The power of every band (column) of every spectrum (row).
+    """
+    matrix = (
+        (frequencies[:, None] >= [low for low, _ in bands])
+        & (frequencies[:, None] <= [high for _, high in bands])
+    ).astype(np.float64)
+    return line_power(amplitudes, bandwidth) @ matrix
+
+# Function to compute the spectra of many wave records
+def compute_spectra(
+    waves: list[Record],
+    window: str = DEFAULT_WINDOW,
+    segment: int | None = None,
+    overlap: float = DEFAULT_OVERLAP,
+) -> list[Record]:
+    """
+    Computes the amplitude spectrum of every wave record.
+
+    Waves of the same length and sample rate are transformed together in a
+    single batch.
+
+    Args:
+        waves (list[Record]): Wave records.
+        window (str): Name of the window applied to every segment.
+        segment (int | None): Number of samples of every segment. The whole
+            wave is a single segment when omitted.
+        overlap (float): Fraction of overlap between consecutive segments.
+
+    Returns:
+        list[Record]: One spectrum record per wave, in the order of `waves`,
+            keeping its metadata and covering 0 Hz to the Nyquist frequency.
+
+    Raises:
+        ValueError: If a record is not a wave, or the options are invalid.
+    """
+    # Group the waves that can be stacked into the same array
+    batches: dict[tuple[int, float], list[int]] = {}
+    for i, record in enumerate(waves):
+        if not record.is_wave or not record.sample_rate:
+            raise ValueError(f"{record.name} is not a wave with a sample rate.")
+        key = (len(record.values), record.sample_rate)
+        batches.setdefault(key, []).append(i)
+
+    spectra: list[Record | None] = [None] * len(waves)
+    for (_, sample_rate), indices in batches.items():
+        frequencies, amplitudes = amplitude_spectra(
+            np.stack([waves[i].values for i in indices]),
+            sample_rate,
+            window,
+            segment,
+            overlap,
+        )
+        for i, values in zip(indices, amplitudes, strict=True):
+            spectra[i] = replace(
+                waves[i],
+                kind=SPECTRA,
+                values=values,
+                factor=1.0,
+                sample_rate=None,
+                min_freq=float(frequencies[0]),
+                max_freq=float(frequencies[-1]),
+            )
+    return spectra
@@ -0,0 +1,378 @@
+"""
+This module downloads, decodes and exports a single record in bounded memory.
+
+Loading a long capture at once keeps the JSON body, the decoded base64 bytes,
+the inflated bytes and the float32 array alive together, several times the
+size of the samples. In streaming mode the body is read from the socket in
+pieces, and every piece goes through base64 decoding, inflating, conversion,
+scaling and export before the next one is read, so peak memory is set by the
+chunk size, derived from a memory budget (`--max-memory`), and not by the
+length of the record.
+
+The axis of a record depends on its number of samples, and the scale factor
+may follow the samples in the body, so neither is known until the whole body
+has been read. The raw samples are therefore spooled to a temporary file while
+downloading, and read back, scaled and exported a chunk at a time once the
+record is complete.
+
+Main classes and functions:
+- `parse_size`: Parses a memory size such as `64M`.
+- `BodySplitter`: Splits a record body read in pieces into its fields and its
+    base64 payload.
+- `stream_record`: Downloads a record and yields its scaled samples in chunks.
+- `stream_export`: Downloads a record straight to a CSV or `.npy` file.
+"""
+import json
+import os
+import re
+import tempfile
+import time
+from collections.abc import Iterator
+from typing import BinaryIO
+
+import numpy as np
+
+from t8_client.functions import timings
+from t8_client.functions.client import WAVES, T8Client
+from t8_client.functions.codecs import get_codec
+from t8_client.functions.export import EXTENSIONS, record_metadata
+from t8_client.functions.fastjson import loads
+from t8_client.functions.records import Record
+from t8_client.functions.save_to_csv import open_csv, write_rows
+from t8_client.functions.timings import timed
+
+# Default memory budget of a streamed record
+DEFAULT_MAX_MEMORY = 64 << 20
+# Smallest memory budget accepted
+MIN_MEMORY = 1 << 20
+# Bytes held per sample of a chunk while decoding it: the network, base64 and
+# inflated pieces, the raw samples and their scaled float32 copy
+DECODE_BYTES_PER_SAMPLE = 32
+# Bytes held per row while formatting CSV text: the axis and interleaved
+# values, their Python floats and the formatted text
+CSV_BYTES_PER_ROW = 320
+# Largest size of the fields before or after the payload
+MAX_FIELDS_SIZE = 1 << 20
+# Formats that can be written a chunk at a time
+STREAM_FORMATS = ("csv", "csv.gz", "npy")
+# Multipliers of the memory size suffixes
+SIZE_UNITS = {"": 1, "k": 1 << 10, "m": 1 << 20, "g": 1 << 30}
+# A memory size, e.g. `64M`, `1.5GB` or `512KiB`
+SIZE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([kmg]?)(?:i?b)?", re.IGNORECASE)
+# Start of the payload field
+DATA_FIELD = re.compile(rb'"data"\s*:\s*"')
+
+# Function to parse a memory size
+def parse_size(text: str) -> int:
+    """
+    Parses a memory size such as `64M`, `1.5G` or `512KiB` to bytes.
+
+    Args:
+        text (str): A number of bytes, optionally followed by `K`, `M` or `G`
+            (powers of 1024).
+
+    Returns:
+        int: Size in bytes.
+
+    Raises:
+        ValueError: If the text is not a valid size or is below `MIN_MEMORY`.
+    """
+    match = SIZE_PATTERN.fullmatch(text.strip())
+    if not match:
+        raise ValueError(f"Invalid memory size: {text}. Expected e.g. 64M or 1G.")
+    size = int(float(match[1]) * SIZE_UNITS[match[2].lower()])
+    if size < MIN_MEMORY:
+        raise ValueError(f"The memory budget must be at least {MIN_MEMORY >> 20}M.")
+    return size
+
+# Function to parse the fields around the payload
+def _parse_fields(text: bytes, before: bool) -> dict:
+    """
+    Parses the fields before (`{"a": 1, `) or after (`, "b": 2}`) the payload
+    of a record body.
+    """
+    text = text.strip()
+    if before:
+        text = text.removesuffix(b",").rstrip() + b"}"
+    else:
+        text = b"{" + text.removeprefix(b",")
+    try:
+        fields = loads(text)
+    except ValueError as e:
+        raise ValueError(f"Invalid record body: {e}") from e
+    if not isinstance(fields, dict):
+        raise ValueError("Invalid record body: it is not a JSON object.")
+    return fields
+
+class BodySplitter:
+    """
+    Splits a record body read in pieces into its fields and its payload.
+
+    The base64 characters of the `data` field are returned as they arrive,
+    while the other fields, which are small, are buffered and parsed once the
+    body is complete.
+
+    Attributes:
+        size (int): Number of payload characters returned so far.
+    """
+
+    def __init__(self) -> None:
+        self.size = 0
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.in_payload = False
+        self.done = False
+
+    def feed(self, piece: bytes) -> bytes:
+        """
+        Consumes the next piece of the body.
+
+        Args:
+            piece (bytes): The piece.
+
+        Returns:
+            bytes: The characters of the payload inside the piece, possibly
+                none.
+
+        Raises:
+            ValueError: If the fields before or after the payload are larger
+                than `MAX_FIELDS_SIZE`.
+        """
+        if self.done:
+            self.tail += piece
+            if len(self.tail) > MAX_FIELDS_SIZE:
+                raise ValueError("Invalid record body: trailing fields too large.")
+            return b""
+
+        if not self.in_payload:
+            self.head += piece
+            match = DATA_FIELD.search(self.head)
+            if match is None:
+                if len(self.head) > MAX_FIELDS_SIZE:
+                    raise ValueError("Invalid record body: no data field found.")
+                return b""
+            piece = bytes(self.head[match.end() :])
+            del self.head[match.start() :]
+            self.in_payload = True
+
+        end = piece.find(b'"')
+        if end >= 0:
+            self.done = True
+            self.tail += piece[end + 1 :]
+            piece = piece[:end]
+        # Base64 never needs escaping, but some encoders write `/` as `\/`
+        if b"\\" in piece:
+            piece = piece.replace(b"\\", b"")
+        self.size += len(piece)
+        return piece
+
+    def fields(self) -> dict:
+        """
+        Returns the fields of the body other than the payload.
+
+        Returns:
+            dict: The fields before and after the payload.
+
+        Raises:
+            ValueError: If the body ended before the end of the payload.
+        """
+        if not self.done:
+            raise ValueError("Invalid record body: the data field is incomplete.")
+        return {
+            **_parse_fields(bytes(self.head), before=True),
+            **_parse_fields(bytes(self.tail), before=False),
+        }
+
+# Function to build the metadata of a record of known length
+def _describe(  # noqa: PLR0913, PLR0917
+    kind: str,
+    machine: str,
+    point: str,
+    pmode: str,
+    timestamp: int,
+    fields: dict,
+    n_samples: int,
+) -> Record:
+    """
+    Builds a record with the metadata of a streamed record. Its values are a
+    read-only view of the final length that holds no memory, so its axis and
+    metadata match those of the same record loaded at once.
+    """
+    record = Record(
+        kind,
+        machine,
+        point,
+        pmode,
+        timestamp,
+        values=np.broadcast_to(np.float32(0), (n_samples,)),
+    )
+    if kind == WAVES:
+        record.sample_rate = float(fields["sample_rate"])
+        record.factor = float(fields.get("factor", 1))
+    else:
+        record.min_freq = fields.get("min_freq", 0)
+        record.max_freq = fields["max_freq"]
+        record.factor = fields["factor"]
+    return record
+
+# Function to read the scaled samples of a spool
+def _read_spool(
+    spool: BinaryIO, dtype: str, factor: float, chunk: int
+) -> Iterator[np.ndarray]:
+    """
+    Reads the raw samples of a spool back as scaled float32 chunks, and closes
+    it once they have been read.
+    """
+    itemsize = np.dtype(dtype).itemsize
+    scale = np.float32(factor)
+    spent = 0.0
+    n_bytes = 0
+    with spool:
+        while data := spool.read(chunk * itemsize):
+            began = time.perf_counter()
+            values = np.multiply(np.frombuffer(data, dtype=dtype), scale, dtype="f")
+            spent += time.perf_counter() - began
+            n_bytes += values.nbytes
+            yield values
+    timings.report("convert", spent, n_bytes)
+
+# Function to download a record and yield its samples in chunks
+def stream_record(  # noqa: PLR0913, PLR0917
+    client: T8Client,
+    kind: str,
+    machine: str,
+    point: str,
+    pmode: str,
+    timestamp: int,
+    array_fmt: str = "zint",
+    max_memory: int = DEFAULT_MAX_MEMORY,
+) -> tuple[Record, Iterator[np.ndarray]]:
+    """
+    Downloads a wave or spectrum in bounded memory, spooling its raw samples to
+    a temporary file.
+
+    Args:
+        client (T8Client): Client to download the record with.
+        kind (str): Record kind (`waves` or `spectra`).
+        machine (str): Machine identifier.
+        point (str): Measurement point identifier.
+        pmode (str): Mode of operation.
+        timestamp (int): Timestamp of the record.
+        array_fmt (str): Array format requested from the server.
+        max_memory (int): Memory budget of the download and of every chunk,
+            in bytes.
+
+    Returns:
+        tuple[Record, Iterator[np.ndarray]]: The metadata of the record, whose
+            values only hold its length, and its scaled float32 samples in
+            consecutive chunks.
+    """
+    codec = get_codec(array_fmt)
+    chunk = max_memory // 2 // DECODE_BYTES_PER_SAMPLE
+    splitter = BodySplitter()
+    spent = {"base64": 0.0, "zlib": 0.0}
+    n_samples = 0
+
+    pieces = client.stream(
+        client.url(kind, machine, point, pmode, timestamp),
+        chunk * 4,
+        array_fmt=array_fmt,
+    )
+    spool = tempfile.TemporaryFile()  # noqa: SIM115
+    try:
+        for samples in codec.iter_samples(
+            (splitter.feed(piece) for piece in pieces), spent, chunk * 4
+        ):
+            spool.write(samples)
+            n_samples += len(samples)
+        record = _describe(
+            kind, machine, point, pmode, timestamp, splitter.fields(), n_samples
+        )
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    timings.report("base64", spent["base64"], splitter.size)
+    if codec.compressed:
+        n_bytes = n_samples * np.dtype(codec.dtype).itemsize
+        timings.report("zlib", spent["zlib"], n_bytes)
+    return record, _read_spool(spool, codec.dtype, record.factor, chunk)
+
+# Function to download a record straight to a file
+def stream_export(  # noqa: PLR0913, PLR0917
+    client: T8Client,
+    kind: str,
+    machine: str,
+    point: str,
+    pmode: str,
+    timestamp: int,
+    directory: str = ".",
+    fmt: str = "csv",
+    array_fmt: str = "zint",
+    max_memory: int = DEFAULT_MAX_MEMORY,
+) -> str:
+    """
+    Downloads a wave or spectrum and writes it to a file a chunk at a time, so
+    the peak memory stays within `max_memory` whatever its length.
+
+    Args:
+        client (T8Client): Client to download the record with.
+        kind (str): Record kind (`waves` or `spectra`).
+        machine (str): Machine identifier.
+        point (str): Measurement point identifier.
+        pmode (str): Mode of operation.
+        timestamp (int): Timestamp of the record.
+        directory (str): Directory where the file is written.
+        fmt (str): Export format, one of `STREAM_FORMATS`. The files are the
+            same as those written by `export_record`.
+        array_fmt (str): Array format requested from the server.
+        max_memory (int): Memory budget in bytes.
+
+    Returns:
+        str: Path of the written file.
+
+    Raises:
+        ValueError: If the format cannot be written a chunk at a time.
+    """
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(
+            f"The {fmt} format cannot be streamed. "
+            f"Streamable formats: {', '.join(STREAM_FORMATS)}."
+        )
+    record, chunks = stream_record(
+        client, kind, machine, point, pmode, timestamp, array_fmt, max_memory
+    )
+    path = os.path.join(directory, f"{record.name}{EXTENSIONS[fmt]}")
+
+    with timed("export") as phase:
+        if fmt == "npy":
+            with open(path, "wb") as file:
+                np.lib.format.write_array_header_1_0(
+                    file,
+                    {
+                        "descr": "<f4",
+                        "fortran_order": False,
+                        "shape": (len(record.values),),
+                    },
+                )
+                for values in chunks:
+                    file.write(values)
+            with open(f"{path}.json", "w", encoding="utf-8") as file:
+                json.dump(record_metadata(record), file)
+        else:
+            block_rows = max(1, max_memory // 2 // CSV_BYTES_PER_ROW)
+            with open_csv(path, compress=fmt == "csv.gz") as file:
+                file.write(f"{record.axis_label},Amplitude\n")
+                first = 0
+                for values in chunks:
+                    write_rows(
+                        file,
+                        values,
+                        record.axis_start,
+                        record.axis_step,
+                        first,
+                        block_rows,
+                    )
+                    first += len(values)
+        phase.n_bytes = os.path.getsize(path)
+    return path
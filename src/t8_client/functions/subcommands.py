@@ -9,114 +9,275 @@ CSV files.
 Main functions:
 - `list_waves`: Lists available waves and displays their timestamps.
 - `list_spectra`: Lists available spectra and displays their timestamps.
-- `get_wave`: Downloads a specific wave, decodes it, and saves it to a CSV file.
+- `get_wave`: Downloads a specific wave, decodes it, and saves it to a CSV (or
+    binary) file.
 - `get_spectrum`: Downloads a specific spectrum, decodes it, and saves it to a
-    CSV file.
+    CSV (or binary) file.
+    Both can stream long records to the file in bounded memory instead.
 - `plot_wave`: Downloads and plots a specific wave.
 - `plot_spectrum`: Downloads and plots a specific spectrum.
+    Both can render the plot to an image instead of showing it.
+- `plot_waterfall`: Downloads and plots every spectrum of a time range as a
+    waterfall.
+- `fetch_waves`: Downloads every wave of a time range concurrently to files.
+- `fetch_spectra`: Downloads every spectrum of a time range concurrently to
+    files.
+    Both can append the records to a single archive or JSON lines stream
+    instead, and decode and export on a pool of processes.
+- `compute_spectrum`: Downloads every wave of a time range and saves its
+    spectrum, computed on the client.
+- `extract_features`: Downloads every record of a time range and writes one
+    row of condition indicators per record.
+- `compare_spectra`: Compares every spectrum of a time range against a
+    baseline, or the spectra before it, and reports the band deltas and alarms.
+- `poll`: Downloads the records of every T8 unit of a fleet concurrently and
+    reports the latency and errors of each unit.
+- `watch`: Polls measurement points until interrupted and saves every new
+    record as soon as it appears.
+- `cache_stats`: Displays the usage of the local record cache.
+- `cache_clear`: Removes every record from the local record cache.
 
 Dependencies:
 - This module uses environment variables (`T8_HOST`, `T8_USER`, `T8_PASSWORD`)
-    to connect to the server.
-- Requires the `save_to_csv` and `utc_to_timestamp` functions from other
-    project modules.
+    to connect to the server. The optional `T8_POOL_SIZE`, `T8_RETRIES` and
+    `T8_BACKOFF` variables tune the shared connection pool.
+- Every request goes through a single pooled `T8Client` returned by
+    `get_client`, so consecutive calls reuse their connections.
+- Decoded records are kept in the local cache returned by `get_cache`, located
+    in `T8_CACHE_DIR` and capped to `T8_CACHE_SIZE` bytes.
+- Known record timestamps are kept in the listing index returned by
+    `get_index`, stored in the `T8_INDEX` SQLite file.
+- Requires the `save_to_csv` function, the date parsing functions and the
+    codec registry from other project modules. Time ranges accept ISO 8601
+    dates, relative dates such as `now-6h` and a `last` duration such as `6h`.
+- Only the listing modules are imported with this module. The `.env` file,
+    NumPy, the export formats and matplotlib are loaded by the subcommands that
+    need them, so short invocations start quickly.
 """
 import os
-from base64 import b64decode
+import sys
+from collections.abc import Callable
+from contextlib import ExitStack, suppress
 from datetime import UTC, datetime
-from struct import unpack
-from zlib import decompress
+from functools import cache
+from typing import TYPE_CHECKING
 
-import numpy as np
 import requests
-from dotenv import load_dotenv
-from matplotlib import pylab
 
-from t8_client.functions.save_to_csv import save_to_csv
-from t8_client.functions.timestamp import utc_to_timestamp
+from t8_client.functions.client import (
+    DEFAULT_BACKOFF,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_RETRIES,
+    SPECTRA,
+    WAVES,
+    T8Client,
+)
+from t8_client.functions.index import DEFAULT_INDEX_PATH, ListingIndex
+from t8_client.functions.timestamp import (
+    format_timestamps,
+    parse_range,
+    parse_time,
+    utc_to_timestamp,
+)
+
+# NumPy, matplotlib and the modules built on them are imported by the
+# subcommands that use them, so listing records does not pay for them
+if TYPE_CHECKING:
+    from t8_client.functions.cache import RecordCache
+    from t8_client.functions.records import Record
+
+# Default options of the subcommands
+FORMAT = "zint"
+OUTPUT_FORMAT = "csv"
+WORKERS = 8
+WATCH_INTERVAL = 10.0
+WATCH_MAX_INTERVAL = 300.0
+WINDOW = "hann"
+OVERLAP = 0.5
+SPLIT = 8
+ALARM_DB = 6.0
+LIMIT = 10
+
+# Function to load the environment variables
+@cache
+def load_environment() -> None:
+    """
+    Loads the environment variables of the `.env` file, once per process.
+
+    It is called by the functions that read the configuration, so the file is
+    only read by the subcommands that need it.
+    """
+    from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+    load_dotenv()
 
-# Define connection variables
-HOST = os.getenv("T8_HOST")
-USER = os.getenv("T8_USER")
-PASSWORD = os.getenv("T8_PASSWORD")
-FORMAT = "zint"
+# Client shared by every subcommand, created on first use
+_client: T8Client | None = None
 
-# Function to decode compressed data in zint format
-def zint_to_float(raw_: str) -> np.ndarray:
+# Function to get the shared client
+def get_client() -> T8Client:
     """
-    Decodes compressed data in zint format to a float array.
+    Returns the client shared by all the subcommands.
 
-    Args:
-        raw_ (str): The compressed data as a base64 encoded string.
+    The client is created on first use from the connection variables, so all
+    the requests of a process share the same connection pool.
 
     Returns:
-        np.array: The decompressed data as a float array.
-    """
-    # Decode base64 and decompress the data
-    d = decompress(b64decode(raw_.encode()))
-    # Convert the decompressed data into a float array
-    return np.array(
-        [unpack("h", d[i * 2 : (i + 1) * 2])[0] for i in range(int(len(d) / 2))],
-        dtype="f",
+        T8Client: The shared client.
+    """
+    global _client  # noqa: PLW0603
+    if _client is None:
+        load_environment()
+        _client = T8Client(
+            os.getenv("T8_HOST"),
+            os.getenv("T8_USER"),
+            os.getenv("T8_PASSWORD"),
+            pool_size=int(os.getenv("T8_POOL_SIZE", DEFAULT_POOL_SIZE)),
+            retries=int(os.getenv("T8_RETRIES", DEFAULT_RETRIES)),
+            backoff=float(os.getenv("T8_BACKOFF", DEFAULT_BACKOFF)),
+        )
+    return _client
+
+# Cache shared by every subcommand, created on first use
+_cache: "RecordCache | None" = None
+
+# Function to get the shared cache
+def get_cache() -> "RecordCache":
+    """
+    Returns the record cache shared by all the subcommands.
+
+    Returns:
+        RecordCache: The shared cache.
+    """
+    from t8_client.functions.cache import (
+        DEFAULT_CACHE_DIR,
+        DEFAULT_CACHE_SIZE,
+        RecordCache,
     )
 
-# Dictionary to select the appropriate decoding function
-decode_format = {
-    "zint": zint_to_float,
-}
+    global _cache  # noqa: PLW0603
+    if _cache is None:
+        load_environment()
+        _cache = RecordCache(
+            os.getenv("T8_CACHE_DIR", DEFAULT_CACHE_DIR),
+            int(os.getenv("T8_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+        )
+    return _cache
+
+# Index shared by every subcommand, created on first use
+_index: ListingIndex | None = None
 
-# Function to list available waveforms and display their timestamps
-def list_waves(machine: str, point: str, pmode: str) -> None:
+# Function to get the shared listing index
+def get_index() -> ListingIndex:
     """
-    Lists available waveforms and displays their timestamps.
+    Returns the listing index shared by all the subcommands.
+
+    Returns:
+        ListingIndex: The shared index.
+    """
+    global _index  # noqa: PLW0603
+    if _index is None:
+        load_environment()
+        _index = ListingIndex(os.getenv("T8_INDEX", DEFAULT_INDEX_PATH))
+    return _index
+
+# Function to list available records and display their timestamps
+def _list_records(  # noqa: PLR0913, PLR0917
+    kind: str,
+    machine: str,
+    point: str,
+    pmode: str,
+    array_fmt: str = FORMAT,
+    start: str | None = None,
+    end: str | None = None,
+    last: int | str | None = None,
+    use_index: bool = True,
+    sync: bool = True,
+) -> None:
+    """
+    Lists available records and displays their timestamps.
 
     Args:
+        kind (str): Record kind (`waves` or `spectra`).
         machine (str): Machine identifier.
         point (str): Measurement point identifier.
         pmode (str): Mode of operation.
+        array_fmt (str): Array format requested from the server.
+        start (str | None): Only records at or after this UTC date.
+        end (str | None): Only records at or before this UTC date.
+        last (int | str | None): Only the newest `last` records of the range
+            if it is a number, or the records of this duration before `end`
+            (or now) if it is a duration such as `6h`.
+        use_index (bool): Whether to answer from the local listing index.
+        sync (bool): Whether to ask the server for new records before
+            answering from the index.
     """
-    url = f"{HOST}/rest/waves/{machine}/{point}/{pmode}/?array_fmt={FORMAT}"
+    # Convert the dates to timestamps; a bare number is a count of records and
+    # anything else the duration of the range
+    duration = None
+    if isinstance(last, str) and not last.isdigit():
+        duration, last = last, None
+    start, end = parse_range(start, end, duration)
+    last = int(last) if last is not None else None
 
     try:
-        # Send a GET request to the API
-        response = requests.get(url, auth=(USER, PASSWORD), timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
-
-        if "_items" not in data:
-            print("No waveforms found in the response.")
+        if use_index:
+            # Fetch only the new records and answer the query locally
+            timestamps = get_index().timestamps(
+                get_client(),
+                kind,
+                machine,
+                point,
+                pmode,
+                start,
+                end,
+                last,
+                array_fmt,
+                sync,
+            )
+        else:
+            # Send a GET request to the API and extract the record timestamps
+            timestamps = [
+                timestamp
+                for timestamp in get_client().list_timestamps(
+                    kind, machine, point, pmode, array_fmt
+                )
+                if (start is None or timestamp >= start)
+                and (end is None or timestamp <= end)
+            ]
+            if last is not None:
+                timestamps = sorted(timestamps)[-last:] if last else []
+
+        if not timestamps:
+            if start is None and end is None and last is None:
+                name = "waveforms" if kind == WAVES else "spectra"
+                print(f"No {name} found in the response.")
+            else:
+                print("No valid timestamps found.")
             return
 
-        timestamps = []
-
-        for item in data["_items"]:
-            if "_links" in item and "self" in item["_links"]:
-                url_self = item["_links"]["self"]
-                # Extract the timestamp from the URL
-                timestamp = int(url_self.split("/")[-1])
-
-                if timestamp != 0:
-                    # Format the timestamp into a readable string
-                    formatted_time = datetime.fromtimestamp(timestamp, tz=UTC).strftime(
-                        "%Y-%m-%dT%H:%M:%S"
-                    )
-                    timestamps.append(formatted_time)
-
-        if timestamps:
-            # Display all timestamps in separate lines
-            print("\n".join(timestamps))
-        else:
-            print("No valid timestamps found.")
+        # Display all timestamps in separate lines
+        print("\n".join(format_timestamps(timestamps)))
 
     except requests.exceptions.RequestException as e:
         print(f"Error communicating with the API: {e}")
 
+# Function to list available waveforms and display their timestamps
+def list_waves(machine: str, point: str, pmode: str, **options: object) -> None:
+    """
+    Lists available waveforms and displays their timestamps.
+
+    Args:
+        machine (str): Machine identifier.
+        point (str): Measurement point identifier.
+        pmode (str): Mode of operation.
+        **options (object): Array format, range and index options, as accepted
+            by `_list_records`.
+    """
+    _list_records(WAVES, machine, point, pmode, **options)
+
 # Function to list available spectra and display their timestamps
-def list_spectra(machine: str, point: str, pmode: str) -> None:
+def list_spectra(machine: str, point: str, pmode: str, **options: object) -> None:
     """
     Lists available spectra and displays their timestamps.
 
@@ -124,46 +285,158 @@ def list_spectra(machine: str, point: str, pmode: str) -> None:
         machine (str): Machine identifier.
         point (str): Measurement point identifier.
         pmode (str): Mode of operation.
+        **options (object): Array format, range and index options, as accepted
+            by `_list_records`.
+    """
+    _list_records(SPECTRA, machine, point, pmode, **options)
+
+# Function to download and decode a single record
+def fetch_record(  # noqa: PLR0913, PLR0917
+    kind: str,
+    machine: str,
+    point: str,
+    pmode: str,
+    timestamp: int,
+    array_fmt: str = FORMAT,
+    use_cache: bool = True,
+) -> "Record":
     """
-    url = f"{HOST}/rest/spectra/{machine}/{point}/{pmode}/?array_fmt={FORMAT}"
+    Downloads and decodes a single wave or spectrum, unless it is cached.
 
-    try:
-        # Send a GET request to the API
-        response = requests.get(url, auth=(USER, PASSWORD), timeout=10)
-        response.raise_for_status()
+    Args:
+        kind (str): Record kind (`waves` or `spectra`).
+        machine (str): Machine identifier.
+        point (str): Measurement point identifier.
+        pmode (str): Mode of operation.
+        timestamp (int): Timestamp of the record.
+        array_fmt (str): Array format requested from the server.
+        use_cache (bool): Whether to read and store the record in the local
+            cache.
 
-        data = response.json()
+    Returns:
+        Record: The decoded record.
+    """
+    from t8_client.functions.cache import RecordCache
+    from t8_client.functions.codecs import get_codec
+    from t8_client.functions.records import parse_record
+
+    # Reject unknown array formats before contacting the server
+    get_codec(array_fmt)
+    client = get_client()
+    key = RecordCache.key(
+        client.host, kind, machine, point, pmode, timestamp, array_fmt
+    )
+    if use_cache and (record := get_cache().get(key)) is not None:
+        return record
 
-        if "_items" not in data:
-            print("No spectra found in the response.")
-            return
+    # Send a GET request to the API
+    response = client.get(
+        client.url(kind, machine, point, pmode, timestamp), array_fmt=array_fmt
+    )
+    record = parse_record(
+        kind, machine, point, pmode, timestamp, response.content, array_fmt
+    )
 
-        timestamps = []
+    if use_cache:
+        get_cache().put(key, record)
+    return record
 
-        for item in data["_items"]:
-            if "_links" in item and "self" in item["_links"]:
-                url_self = item["_links"]["self"]
-                # Extract the timestamp from the URL
-                timestamp = int(url_self.split("/")[-1])
+# Function to save a record to a file
+def save_record(
+    record: "Record", directory: str = ".", output_format: str = OUTPUT_FORMAT
+) -> str | None:
+    """
+    Saves a record to a file named after the record.
 
-                if timestamp != 0:
-                    # Format the timestamp into a readable string
-                    formatted_time = datetime.fromtimestamp(timestamp, tz=UTC).strftime(
-                        "%Y-%m-%dT%H:%M:%S"
-                    )
-                    timestamps.append(formatted_time)
+    Args:
+        record (Record): Record to save.
+        directory (str): Directory where the file is written.
+        output_format (str): Export format (`csv`, `csv.gz`, `npy`, `npz`,
+            `parquet`, `hdf5` or `t8c`).
 
-        if timestamps:
-            # Display all timestamps in separate lines
-            print("\n".join(timestamps))
-        else:
-            print("No valid timestamps found.")
+    Returns:
+        str | None: Path of the written file, or None if it could not be
+            written.
+    """
+    from t8_client.functions.export import export_record
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error communicating with the API: {e}")
+    try:
+        filename = export_record(record, directory, output_format)
+    except OSError as e:
+        # Catches errors related to the file system (such as permissions
+        # or invalid paths).
+        print(f"Error writing the file {record.name}: {e}")
+        return None
+    print(f"Data saved to: {filename}")
+    return filename
+
+# Function to stream a record to a file in bounded memory
+def save_streamed(  # noqa: PLR0913, PLR0917
+    kind: str,
+    machine: str,
+    point: str,
+    pmode: str,
+    timestamp: int,
+    array_fmt: str = FORMAT,
+    output_format: str = OUTPUT_FORMAT,
+    max_memory: str = "64M",
+    directory: str = ".",
+) -> str | None:
+    """
+    Downloads a record and writes it to a file a chunk at a time, so memory
+    stays below `max_memory` whatever its length. The cache is bypassed.
+
+    Args:
+        kind (str): Record kind (`waves` or `spectra`).
+        machine (str): Machine identifier.
+        point (str): Measurement point identifier.
+        pmode (str): Mode of operation.
+        timestamp (int): Timestamp of the record.
+        array_fmt (str): Array format requested from the server.
+        output_format (str): Export format (`csv`, `csv.gz` or `npy`).
+        max_memory (str): Memory budget, such as `64M`.
+        directory (str): Directory where the file is written.
+
+    Returns:
+        str | None: Path of the written file, or None if it could not be
+            written.
+    """
+    from t8_client.functions.codecs import get_codec
+    from t8_client.functions.streaming import parse_size, stream_export
+
+    # Reject invalid options before contacting the server
+    get_codec(array_fmt)
+    budget = parse_size(max_memory)
+    try:
+        filename = stream_export(
+            get_client(),
+            kind,
+            machine,
+            point,
+            pmode,
+            timestamp,
+            directory,
+            output_format,
+            array_fmt,
+            budget,
+        )
+    except OSError as e:
+        print(f"Error writing the file: {e}")
+        return None
+    print(f"Data saved to: {filename}")
+    return filename
 
 # Function to retrieve a specific waveform given a timestamp
-def get_wave(machine: str, point: str, pmode: str, date: str) -> None:
+def get_wave(  # noqa: PLR0913, PLR0917
+    machine: str,
+    point: str,
+    pmode: str,
+    date: str,
+    array_fmt: str = FORMAT,
+    use_cache: bool = True,
+    output_format: str = OUTPUT_FORMAT,
+    max_memory: str | None = None,
+) -> None:
     """
     Retrieves a specific waveform given a timestamp.
 
@@ -172,46 +445,53 @@ def get_wave(machine: str, point: str, pmode: str, date: str) -> None:
         point (str): Measurement point identifier.
         pmode (str): Mode of operation.
         date (str): Timestamp in UTC format.
+        array_fmt (str): Array format requested from the server.
+        use_cache (bool): Whether to read and store the record in the local
+            cache.
+        output_format (str): Export format of the saved file.
+        max_memory (str | None): If given, the record is streamed to the file
+            keeping memory below this size (e.g. `64M`), bypassing the cache.
     """
     # Convert the date to a timestamp
     date = utc_to_timestamp(date)
 
-    url = (
-        f"{HOST}/rest/waves/{machine}/{point}/{pmode}/{date}/?array_fmt={FORMAT}"
-    )
-
     try:
-        # Send a GET request to the API
-        response = requests.get(url, auth=(USER, PASSWORD), timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
-
-        # Extract relevant fields from the JSON response
-        srate = float(data["sample_rate"])
-        factor = float(data.get("factor", 1))
-        raw = data["data"]
-
-        # Decode the raw data using the specified format
-        wave = decode_format[FORMAT](raw)
-
-        # Apply the numeric factor to the data
-        wave *= factor
-
-        # Generate the time axis
-        t = pylab.linspace(0, (len(wave) / srate) * 1000, len(wave))
+        if max_memory is not None:
+            # Stream the record to the file without loading it
+            save_streamed(
+                WAVES,
+                machine,
+                point,
+                pmode,
+                date,
+                array_fmt,
+                output_format,
+                max_memory,
+            )
+            return
 
-        # Generate the filename
-        filename = f"{machine}_{point}_{pmode}_{date}.csv"
+        # Download and decode the record
+        record = fetch_record(
+            WAVES, machine, point, pmode, date, array_fmt, use_cache
+        )
 
-        # Save the data to a CSV file
-        save_to_csv(filename, t, wave, "Time (ms)", "Amplitude")
+        # Save the data to a file
+        save_record(record, output_format=output_format)
 
     except requests.exceptions.RequestException as e:
         print(f"Error communicating with the API: {e}")
 
 # Function to retrieve a specific spectrum given a timestamp
-def get_spectrum(machine: str, point: str, pmode: str, date: str) -> None:
+def get_spectrum(  # noqa: PLR0913, PLR0917
+    machine: str,
+    point: str,
+    pmode: str,
+    date: str,
+    array_fmt: str = FORMAT,
+    use_cache: bool = True,
+    output_format: str = OUTPUT_FORMAT,
+    max_memory: str | None = None,
+) -> None:
     """
     Retrieves a specific spectrum given a timestamp.
 
@@ -220,48 +500,70 @@ def get_spectrum(machine: str, point: str, pmode: str, date: str) -> None:
         point (str): Measurement point identifier.
         pmode (str): Mode of operation.
         date (str): Timestamp in UTC format.
+        array_fmt (str): Array format requested from the server.
+        use_cache (bool): Whether to read and store the record in the local
+            cache.
+        output_format (str): Export format of the saved file.
+        max_memory (str | None): If given, the record is streamed to the file
+            keeping memory below this size (e.g. `64M`), bypassing the cache.
     """
     # Convert the date to a timestamp
     date = utc_to_timestamp(date)
 
-    url = (
-        f"{HOST}/rest/spectra/{machine}/{point}/{pmode}/{date}/"
-        f"?array_fmt={FORMAT}"
-    )
-
     try:
-        # Send a GET request to the API
-        response = requests.get(url, auth=(USER, PASSWORD), timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
-
-        # Extract relevant fields from the JSON response
-        fmin = data.get("min_freq", 0)
-        fmax = data["max_freq"]
-        factor = data["factor"]
-        raw = data["data"]
+        if max_memory is not None:
+            # Stream the record to the file without loading it
+            save_streamed(
+                SPECTRA,
+                machine,
+                point,
+                pmode,
+                date,
+                array_fmt,
+                output_format,
+                max_memory,
+            )
+            return
 
-        # Decode the raw data using the specified format
-        sp = decode_format[FORMAT](raw)
+        # Download and decode the record
+        record = fetch_record(
+            SPECTRA, machine, point, pmode, date, array_fmt, use_cache
+        )
 
-        # Apply the numeric factor to the data
-        sp *= factor
+        # Save the data to a file
+        save_record(record, output_format=output_format)
 
-        # Generate the frequency axis
-        freq = pylab.linspace(fmin, fmax, len(sp))
+    except requests.exceptions.RequestException as e:
+        print(f"Error communicating with the API: {e}")
 
-        # Generate the filename
-        filename = f"{machine}_{point}_{pmode}_{date}.csv"
+# Function to plot a record
+def _plot_record(record: "Record", title: str, output: str | None = None) -> None:
+    """
+    Plots the amplitudes of a record against its axis.
 
-        # Save the data to a CSV file
-        save_to_csv(filename, freq, sp, "Frequency (Hz)", "Amplitude")
+    Args:
+        record (Record): Record to plot.
+        title (str): Title of the figure.
+        output (str | None): Path of the image to render instead of showing
+            the figure.
+    """
+    # matplotlib takes longer to import than the rest of the client together
+    from t8_client.functions.plotting import plot_records
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error communicating with the API: {e}")
+    plot_records([record], title, output)
+    if output:
+        print(f"Plot saved to: {output}")
 
 # Function to plot a specific waveform given a timestamp
-def plot_wave(machine: str, point: str, pmode: str, date: str) -> None:
+def plot_wave(  # noqa: PLR0913, PLR0917
+    machine: str,
+    point: str,
+    pmode: str,
+    date: str,
+    array_fmt: str = FORMAT,
+    use_cache: bool = True,
+    output: str | None = None,
+) -> None:
     """
     Plots a specific waveform given a timestamp.
 
@@ -270,51 +572,41 @@ def plot_wave(machine: str, point: str, pmode: str, date: str) -> None:
         point (str): Measurement point identifier.
         pmode (str): Mode of operation.
         date (str): Timestamp in UTC format.
+        array_fmt (str): Array format requested from the server.
+        use_cache (bool): Whether to read and store the record in the local
+            cache.
+        output (str | None): Path of the image (PNG, SVG, ...) to render
+            instead of showing the plot.
     """
     # Convert the date to a timestamp
     date = utc_to_timestamp(date)
 
-    url = (
-        f"{HOST}/rest/waves/{machine}/{point}/{pmode}/{date}/?array_fmt={FORMAT}"
-    )
-
     try:
-        # Send a GET request to the API
-        response = requests.get(url, auth=(USER, PASSWORD), timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
-
-        # Extract relevant fields from the JSON response
-        srate = float(data["sample_rate"])
-        factor = float(data.get("factor", 1))
-        raw = data["data"]
-
-        # Decode the raw data using the specified format
-        wave = decode_format[FORMAT](raw)
-
-        # Apply the numeric factor to the data
-        wave *= factor
-
-        # Generate the time axis
-        t = pylab.linspace(0, (len(wave) / srate) * 1000, len(wave))
+        # Download and decode the record
+        record = fetch_record(
+            WAVES, machine, point, pmode, date, array_fmt, use_cache
+        )
 
         # Plot the waveform
-        pylab.figure()
-        pylab.title(
-            f"Waveform - Machine: {machine}, Point: {point}, Mode: {pmode}"
+        _plot_record(
+            record,
+            f"Waveform - Machine: {machine}, Point: {point}, Mode: {pmode}",
+            output,
         )
-        pylab.xlabel("Time (ms)")
-        pylab.ylabel("Amplitude")
-        pylab.plot(t, wave)
-        pylab.grid(True)
-        pylab.show()
 
     except requests.exceptions.RequestException as e:
         print(f"Error communicating with the API: {e}")
 
 # Function to plot a specific spectrum given a timestamp
-def plot_spectrum(machine: str, point: str, pmode: str, date: str) -> None:
+def plot_spectrum(  # noqa: PLR0913, PLR0917
+    machine: str,
+    point: str,
+    pmode: str,
+    date: str,
+    array_fmt: str = FORMAT,
+    use_cache: bool = True,
+    output: str | None = None,
+) -> None:
     """
     Plots a specific spectrum given a timestamp.
 
@@ -323,47 +615,790 @@ def plot_spectrum(machine: str, point: str, pmode: str, date: str) -> None:
         point (str): Measurement point identifier.
         pmode (str): Mode of operation.
         date (str): Timestamp in UTC format.
+        array_fmt (str): Array format requested from the server.
+        use_cache (bool): Whether to read and store the record in the local
+            cache.
+        output (str | None): Path of the image (PNG, SVG, ...) to render
+            instead of showing the plot.
     """
     # Convert the date to a timestamp
     date = utc_to_timestamp(date)
 
-    url = (
-        f"{HOST}/rest/spectra/{machine}/{point}/{pmode}/{date}/"
-        f"?array_fmt={FORMAT}"
+    try:
+        # Download and decode the record
+        record = fetch_record(
+            SPECTRA, machine, point, pmode, date, array_fmt, use_cache
+        )
+
+        # Plot the spectrum
+        _plot_record(
+            record,
+            f"Spectrum - Machine: {machine}, Point: {point}, Mode: {pmode}",
+            output,
+        )
+
+    except requests.exceptions.RequestException as e:
+        print(f"Error communicating with the API: {e}")
+
+# Function to plot many records of a time range as a waterfall
+def plot_waterfall(  # noqa: PLR0913, PLR0917
+    machine: str | None = None,
+    point: str | None = None,
+    pmode: str | None = None,
+    select: list[str] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    last: str | None = None,
+    workers: int = WORKERS,
+    array_fmt: str = FORMAT,
+    use_cache: bool = True,
+    compute: bool = False,
+    output: str | None = None,
+) -> None:
+    """
+    Plots every spectrum of a time range stacked as a waterfall.
+
+    Args:
+        machine (str | None): Machine identifier.
+        point (str | None): Measurement point identifier.
+        pmode (str | None): Mode of operation.
+        select (list[str] | None): Additional `MACHINE:POINT:PMODE` selections.
+        start (str | None): Only records at or after this UTC date.
+        end (str | None): Only records at or before this UTC date.
+        last (str | None): Only records of this duration before `end`, or
+            now, such as `6h` or `7d`.
+        workers (int): Maximum number of concurrent downloads.
+        array_fmt (str): Array format requested from the server.
+        use_cache (bool): Whether to read and store the records in the local
+            cache.
+        compute (bool): Whether to download the waveforms and compute their
+            spectra on the client instead of downloading the spectra.
+        output (str | None): Path of the image (PNG, SVG, ...) to render
+            instead of showing the plot.
+    """
+    from t8_client.functions.bulk import fetch_records
+    from t8_client.functions.codecs import get_codec
+    from t8_client.functions.plotting import plot_records
+
+    get_codec(array_fmt)
+    start, end = parse_range(start, end, last)
+    selections = _gather_selections(machine, point, pmode, select)
+    if not selections:
+        return
+
+    records = []
+    result = fetch_records(
+        get_client(),
+        WAVES if compute else SPECTRA,
+        selections,
+        start=start,
+        end=end,
+        array_fmt=array_fmt,
+        workers=workers,
+        cache=get_cache() if use_cache else None,
+        index=get_index(),
+        on_record=records.append,
+    )
+    print(result.summary())
+    if not records:
+        return
+    if compute:
+        from t8_client.functions.spectrum import compute_spectra
+
+        records = compute_spectra(records)
+
+    plot_records(
+        records,
+        f"Spectra - {', '.join(':'.join(selection) for selection in selections)}",
+        output,
+        waterfall=True,
     )
+    if output:
+        print(f"Plot saved to: {output}")
+
+# Function to open the destination of downloaded records
+def _open_sink(
+    stack: ExitStack,
+    output_dir: str = ".",
+    output_format: str = OUTPUT_FORMAT,
+    archive: str | None = None,
+    jsonl: str | None = None,
+) -> Callable[["Record"], None]:
+    """
+    Opens the destination of the records of a bulk download.
 
-    try:
-        # Send a GET request to the API
-        response = requests.get(url, auth=(USER, PASSWORD), timeout=10)
-        response.raise_for_status()
+    Args:
+        stack (ExitStack): Stack closing the destination when the download ends.
+        output_dir (str): Directory where the files are written. Records of a
+            fleet are written to a subdirectory named after their unit.
+        output_format (str): Export format of the saved files.
+        archive (str | None): Path of an archive to append the records to,
+            instead of saving one file per record.
+        jsonl (str | None): Path of a JSON lines file (or `-` for the standard
+            output) to stream the records to, instead of saving one file per
+            record.
+
+    Returns:
+        Callable[[Record], None]: Called with every record, from any thread.
+            Its errors are reported as failures of the batch.
+    """
+    from t8_client.functions.archive import RecordArchive
+    from t8_client.functions.export import JsonLinesWriter, export_record
+
+    if archive:
+        # Append every record to a single archive
+        return stack.enter_context(RecordArchive(archive, "a")).append
+    if jsonl:
+        # Stream every record to a single JSON lines file
+        return stack.enter_context(JsonLinesWriter(jsonl)).write
+
+    # Save every record to its own file
+    def save(record: "Record") -> None:
+        directory = os.path.join(output_dir, record.host or "")
+        os.makedirs(directory, exist_ok=True)
+        export_record(record, directory, output_format)
+
+    return save
+
+# Function to gather the measurement points selected on the command line
+def _gather_selections(
+    machine: str | None,
+    point: str | None,
+    pmode: str | None,
+    select: list[str] | None,
+) -> list[tuple[str, str, str]]:
+    """
+    Gathers the measurement points given as separate options and as
+    `MACHINE:POINT:PMODE` triples.
+
+    Args:
+        machine (str | None): Machine identifier.
+        point (str | None): Measurement point identifier.
+        pmode (str | None): Mode of operation.
+        select (list[str] | None): Additional `MACHINE:POINT:PMODE` selections.
 
-        data = response.json()
+    Returns:
+        list[tuple[str, str, str]]: The selections, or an empty list (after
+            printing why) if none was given or they are incomplete.
+    """
+    from t8_client.functions.bulk import parse_selection
+
+    selections = [parse_selection(text) for text in select or []]
+    if machine or point or pmode:
+        if not (machine and point and pmode):
+            print("--machine, --point and --pmode must be given together.")
+            return []
+        selections.insert(0, (machine, point, pmode))
+    if not selections:
+        print("No measurement point selected.")
+    return selections
+
+# Function to download many records of the same kind
+def _fetch_many(  # noqa: PLR0913, PLR0917
+    kind: str,
+    machine: str | None = None,
+    point: str | None = None,
+    pmode: str | None = None,
+    select: list[str] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    last: str | None = None,
+    workers: int = WORKERS,
+    output_dir: str = ".",
+    array_fmt: str = FORMAT,
+    use_cache: bool = True,
+    output_format: str = OUTPUT_FORMAT,
+    archive: str | None = None,
+    jsonl: str | None = None,
+    processes: int = 0,
+    queue_depth: int | None = None,
+) -> None:
+    """
+    Downloads every record of one or more measurement points to files.
 
-        # Extract relevant fields from the JSON response
-        fmin = data.get("min_freq", 0)
-        fmax = data["max_freq"]
-        factor = data["factor"]
-        raw = data["data"]
+    Args:
+        kind (str): Record kind (`waves` or `spectra`).
+        machine (str | None): Machine identifier.
+        point (str | None): Measurement point identifier.
+        pmode (str | None): Mode of operation.
+        select (list[str] | None): Additional `MACHINE:POINT:PMODE` selections.
+        start (str | None): Only records at or after this UTC date.
+        end (str | None): Only records at or before this UTC date.
+        last (str | None): Only records of this duration before `end`, or
+            now, such as `6h` or `7d`.
+        workers (int): Maximum number of concurrent downloads.
+        output_dir (str): Directory where the files are written.
+        array_fmt (str): Array format requested from the server.
+        use_cache (bool): Whether to read and store the records in the local
+            cache.
+        output_format (str): Export format of the saved files.
+        archive (str | None): Path of an archive to append the records to,
+            instead of saving one file per record.
+        jsonl (str | None): Path of a JSON lines file (or `-` for the standard
+            output) to stream the records to.
+        processes (int): Number of processes decoding and exporting the
+            records, or 0 to decode them on the download threads.
+        queue_depth (int | None): Maximum number of downloaded records waiting
+            for the processes; twice their number by default.
+    """
+    from t8_client.functions.bulk import fetch_records
+    from t8_client.functions.codecs import get_codec
+    from t8_client.functions.export import get_exporter
+
+    # Reject unknown formats before downloading anything
+    get_codec(array_fmt)
+    get_exporter(output_format)
+    start, end = parse_range(start, end, last)
+
+    selections = _gather_selections(machine, point, pmode, select)
+    if not selections:
+        return
+
+    with ExitStack() as stack:
+        on_record = _open_sink(stack, output_dir, output_format, archive, jsonl)
+        stage = None
+        if processes:
+            from t8_client.functions.pipeline import ProcessStage
+
+            # Workers write their own files; archives and JSON lines streams
+            # are written by the download threads
+            export = None if archive or jsonl else (output_dir, output_format)
+            stage = stack.enter_context(
+                ProcessStage(processes, queue_depth, export)
+            )
+        result = fetch_records(
+            get_client(),
+            kind,
+            selections,
+            start=start,
+            end=end,
+            array_fmt=array_fmt,
+            workers=workers,
+            cache=get_cache() if use_cache else None,
+            index=get_index(),
+            on_record=on_record,
+            stage=stage,
+        )
+    # Keep the standard output for the records when streaming them there
+    print(result.summary(), file=sys.stderr if jsonl == "-" else sys.stdout)
 
-        # Decode the raw data using the specified format
-        sp = decode_format[FORMAT](raw)
+# Function to download every waveform of a time range
+def fetch_waves(**options: object) -> None:
+    """
+    Downloads every waveform of one or more measurement points concurrently.
 
-        # Apply the numeric factor to the data
-        sp *= factor
+    Args:
+        **options (object): Selections, time range and download options, as
+            accepted by `_fetch_many`.
+    """
+    _fetch_many(WAVES, **options)
 
-        # Generate the frequency axis
-        freq = pylab.linspace(fmin, fmax, len(sp))
+# Function to download every spectrum of a time range
+def fetch_spectra(**options: object) -> None:
+    """
+    Downloads every spectrum of one or more measurement points concurrently.
 
-        # Plot the spectrum
-        pylab.figure()
-        pylab.title(
-            f"Spectrum - Machine: {machine}, Point: {point}, Mode: {pmode}"
+    Args:
+        **options (object): Selections, time range and download options, as
+            accepted by `_fetch_many`.
+    """
+    _fetch_many(SPECTRA, **options)
+
+# Function to compute the spectra of every waveform of a time range
+def compute_spectrum(  # noqa: PLR0913, PLR0917
+    machine: str | None = None,
+    point: str | None = None,
+    pmode: str | None = None,
+    select: list[str] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    last: str | None = None,
+    workers: int = WORKERS,
+    output_dir: str = ".",
+    array_fmt: str = FORMAT,
+    use_cache: bool = True,
+    output_format: str = OUTPUT_FORMAT,
+    archive: str | None = None,
+    jsonl: str | None = None,
+    window: str = WINDOW,
+    segment: int | None = None,
+    overlap: float = OVERLAP,
+) -> None:
+    """
+    Downloads every waveform of one or more measurement points and saves its
+    amplitude spectrum, computed on the client.
+
+    Args:
+        machine (str | None): Machine identifier.
+        point (str | None): Measurement point identifier.
+        pmode (str | None): Mode of operation.
+        select (list[str] | None): Additional `MACHINE:POINT:PMODE` selections.
+        start (str | None): Only waveforms at or after this UTC date.
+        end (str | None): Only waveforms at or before this UTC date.
+        last (str | None): Only waveforms of this duration before `end`, or
+            now, such as `6h` or `7d`.
+        workers (int): Maximum number of concurrent downloads.
+        output_dir (str): Directory where the files are written.
+        array_fmt (str): Array format requested from the server.
+        use_cache (bool): Whether to read and store the waveforms in the local
+            cache.
+        output_format (str): Export format of the saved files.
+        archive (str | None): Path of an archive to append the spectra to.
+        jsonl (str | None): Path of a JSON lines file (or `-` for the standard
+            output) to stream the spectra to.
+        window (str): Window applied to every segment.
+        segment (int | None): Samples per averaged segment. The whole waveform
+            is transformed at once when omitted.
+        overlap (float): Fraction of overlap between consecutive segments.
+    """
+    from t8_client.functions.bulk import fetch_records
+    from t8_client.functions.codecs import get_codec
+    from t8_client.functions.export import get_exporter
+    from t8_client.functions.spectrum import compute_spectra, get_window
+
+    # Reject unknown formats and windows before downloading anything
+    get_codec(array_fmt)
+    get_exporter(output_format)
+    get_window(window)
+    start, end = parse_range(start, end, last)
+
+    selections = _gather_selections(machine, point, pmode, select)
+    if not selections:
+        return
+
+    # Download the waveforms, then transform them in as few batches as possible
+    waves = []
+    result = fetch_records(
+        get_client(),
+        WAVES,
+        selections,
+        start=start,
+        end=end,
+        array_fmt=array_fmt,
+        workers=workers,
+        cache=get_cache() if use_cache else None,
+        index=get_index(),
+        on_record=waves.append,
+    )
+    waves.sort(key=lambda r: (r.machine, r.point, r.pmode, r.timestamp))
+    spectra = compute_spectra(waves, window, segment, overlap)
+
+    with ExitStack() as stack:
+        save = _open_sink(stack, output_dir, output_format, archive, jsonl)
+        for spectrum in spectra:
+            save(spectrum)
+    # Keep the standard output for the spectra when streaming them there
+    output = sys.stderr if jsonl == "-" else sys.stdout
+    print(result.summary(), file=output)
+    print(f"{len(spectra)} spectra computed.", file=output)
+
+# Function to write the condition indicators of every record of a time range
+def extract_features(  # noqa: PLR0913, PLR0917
+    kind: str = WAVES,
+    machine: str | None = None,
+    point: str | None = None,
+    pmode: str | None = None,
+    select: list[str] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    last: str | None = None,
+    workers: int = WORKERS,
+    array_fmt: str = FORMAT,
+    use_cache: bool = True,
+    bands: list[str] | None = None,
+    window: str = WINDOW,
+    output: str = "-",
+) -> None:
+    """
+    Downloads every record of one or more measurement points and writes one
+    row of condition indicators per record.
+
+    A single record is selected by giving the same date to `start` and `end`.
+
+    Args:
+        kind (str): Record kind (`waves` or `spectra`).
+        machine (str | None): Machine identifier.
+        point (str | None): Measurement point identifier.
+        pmode (str | None): Mode of operation.
+        select (list[str] | None): Additional `MACHINE:POINT:PMODE` selections.
+        start (str | None): Only records at or after this UTC date.
+        end (str | None): Only records at or before this UTC date.
+        last (str | None): Only records of this duration before `end`, or
+            now, such as `6h` or `7d`.
+        workers (int): Maximum number of concurrent downloads.
+        array_fmt (str): Array format requested from the server.
+        use_cache (bool): Whether to read and store the records in the local
+            cache.
+        bands (list[str] | None): `LOW:HIGH` frequency bands whose RMS is
+            computed.
+        window (str): Window of the spectra computed from waveforms.
+        output (str): Path of the table, or `-` for the standard output.
+    """
+    from t8_client.functions.bulk import fetch_records
+    from t8_client.functions.codecs import get_codec
+    from t8_client.functions.features import FeatureWriter, parse_band
+
+    # Reject unknown formats and bands before downloading anything
+    get_codec(array_fmt)
+    bands = [parse_band(text) for text in bands or []]
+    start, end = parse_range(start, end, last)
+
+    selections = _gather_selections(machine, point, pmode, select)
+    if not selections:
+        return
+
+    with FeatureWriter(output, bands, window) as table:
+        result = fetch_records(
+            get_client(),
+            kind,
+            selections,
+            start=start,
+            end=end,
+            array_fmt=array_fmt,
+            workers=workers,
+            cache=get_cache() if use_cache else None,
+            index=get_index(),
+            on_record=table.add,
         )
-        pylab.xlabel("Frequency (Hz)")
-        pylab.ylabel("Amplitude")
-        pylab.plot(freq, sp)
-        pylab.grid(True)
-        pylab.show()
+    # Keep the standard output for the table when writing it there
+    print(result.summary(), file=sys.stderr if output == "-" else sys.stdout)
+
+# Function to load the spectra of a time range from the server or an archive
+def _load_spectra(  # noqa: PLR0913, PLR0917
+    selections: list[tuple[str, str, str]],
+    start: int | None,
+    end: int | None,
+    archive: str | None,
+    workers: int,
+    array_fmt: str,
+    use_cache: bool,
+) -> list["Record"]:
+    """
+    Loads every spectrum of a set of selections inside a time range, from a
+    local archive or from the server (through the cache).
+
+    Returns:
+        list[Record]: The spectra, in any order.
+    """
+    if archive is not None:
+        from t8_client.functions.archive import RecordArchive
+
+        with RecordArchive(archive) as records:
+            return [
+                record
+                for record in records.window(start, end)
+                if record.kind == SPECTRA
+                and (record.machine, record.point, record.pmode) in selections
+            ]
+
+    from t8_client.functions.bulk import fetch_records
+
+    spectra = []
+    result = fetch_records(
+        get_client(),
+        SPECTRA,
+        selections,
+        start=start,
+        end=end,
+        array_fmt=array_fmt,
+        workers=workers,
+        cache=get_cache() if use_cache else None,
+        index=get_index(),
+        on_record=spectra.append,
+    )
+    if result.failures:
+        print(result.summary())
+    return spectra
+
+# Function to compare the spectra of a time range against a baseline
+def compare_spectra(  # noqa: PLR0913, PLR0917
+    machine: str | None = None,
+    point: str | None = None,
+    pmode: str | None = None,
+    select: list[str] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    last: str | None = None,
+    baseline: str | None = None,
+    baseline_to: str | None = None,
+    previous: int | None = None,
+    bands: list[str] | None = None,
+    split: int = SPLIT,
+    alarm_db: float = ALARM_DB,
+    alarm_level: float | None = None,
+    limit: int = LIMIT,
+    archive: str | None = None,
+    workers: int = WORKERS,
+    array_fmt: str = FORMAT,
+    use_cache: bool = True,
+) -> None:
+    """
+    Compares every spectrum of a time range against a baseline, or against the
+    spectra before it, and prints a report of the band deltas and alarms of
+    every measurement point.
 
+    Args:
+        machine (str | None): Machine identifier.
+        point (str | None): Measurement point identifier.
+        pmode (str | None): Mode of operation.
+        select (list[str] | None): Additional `MACHINE:POINT:PMODE` selections.
+        start (str | None): Only spectra at or after this UTC date.
+        end (str | None): Only spectra at or before this UTC date.
+        last (str | None): Only spectra of this duration before `end`, or now,
+            such as `6h` or `7d`.
+        baseline (str | None): Date of the baseline spectrum. The earliest
+            spectrum of the range when neither `baseline` nor `previous` is
+            given.
+        baseline_to (str | None): If given, the baseline is the mean of every
+            spectrum from `baseline` to this date.
+        previous (int | None): Compare every spectrum with the mean of this many
+            spectra before it instead of a baseline.
+        bands (list[str] | None): `LOW:HIGH` frequency bands to compare. The
+            common grid is split into `split` equal bands by default.
+        split (int): Number of equal bands used when no band is given.
+        alarm_db (float): Rise of a band, in dB, that raises an alarm.
+        alarm_level (float | None): RMS of a band that raises an alarm.
+        limit (int): Maximum number of alarmed spectra listed per point.
+        archive (str | None): Read the spectra from this archive instead of
+            the server.
+        workers (int): Maximum number of concurrent downloads.
+        array_fmt (str): Array format requested from the server.
+        use_cache (bool): Whether to read and store the spectra in the local
+            cache.
+    """
+    from t8_client.functions import compare
+    from t8_client.functions.codecs import get_codec
+    from t8_client.functions.features import parse_band
+
+    # Reject invalid options before downloading anything
+    get_codec(array_fmt)
+    bands = [parse_band(text) for text in bands or []]
+    if baseline is not None and previous is not None:
+        raise ValueError("--baseline and --previous cannot be given together.")
+    if baseline_to is not None and baseline is None:
+        raise ValueError("--baseline-to requires --baseline.")
+    start, end = parse_range(start, end, last)
+    selections = _gather_selections(machine, point, pmode, select)
+    if not selections:
+        return
+
+    try:
+        window = _load_spectra(
+            selections, start, end, archive, workers, array_fmt, use_cache
+        )
+        references = []
+        if baseline is not None:
+            first = parse_time(baseline)
+            references = _load_spectra(
+                selections,
+                first,
+                first if baseline_to is None else parse_time(baseline_to),
+                archive,
+                workers,
+                array_fmt,
+                use_cache,
+            )
     except requests.exceptions.RequestException as e:
         print(f"Error communicating with the API: {e}")
+        return
+
+    def of(records: list["Record"], selection: tuple[str, str, str]) -> list:
+        return [
+            record
+            for record in records
+            if (record.machine, record.point, record.pmode) == selection
+        ]
+
+    for selection in selections:
+        name = ":".join(selection)
+        spectra = of(window, selection)
+        reference = of(references, selection)
+        if not spectra:
+            print(f"{name}: no spectra in the time range.")
+            continue
+        if baseline is not None and not reference:
+            print(f"{name}: no baseline spectrum found.")
+            continue
+        comparison = compare.compare_spectra(
+            spectra, reference, previous, bands, split, alarm_db, alarm_level
+        )
+        print(name)
+        print(compare.comparison_report(comparison, limit))
+
+# Function to poll every unit of a fleet
+def poll(  # noqa: PLR0913, PLR0917
+    fleet: str | None = None,
+    kind: str = WAVES,
+    start: str | None = None,
+    end: str | None = None,
+    last: str | None = None,
+    output_dir: str = ".",
+    array_fmt: str = FORMAT,
+    use_cache: bool = True,
+    output_format: str = OUTPUT_FORMAT,
+    archive: str | None = None,
+    jsonl: str | None = None,
+) -> None:
+    """
+    Downloads the records of every T8 unit of a fleet concurrently, and reports
+    the records, failures, request errors and latency of each unit.
+
+    Args:
+        fleet (str | None): Path of the fleet configuration file. Defaults to
+            the `T8_FLEET` environment variable.
+        kind (str): Record kind (`waves` or `spectra`).
+        start (str | None): Only records at or after this UTC date.
+        end (str | None): Only records at or before this UTC date.
+        last (str | None): Only records of this duration before `end`, or
+            now, such as `6h` or `7d`.
+        output_dir (str): Directory where the files are written, in one
+            subdirectory per unit.
+        array_fmt (str): Array format requested from the servers.
+        use_cache (bool): Whether to read and store the records in the local
+            cache.
+        output_format (str): Export format of the saved files.
+        archive (str | None): Path of an archive to append every record to.
+        jsonl (str | None): Path of a JSON lines file (or `-` for the standard
+            output) to stream every record to.
+    """
+    from t8_client.functions.codecs import get_codec
+    from t8_client.functions.export import get_exporter
+    from t8_client.functions.fleet import fleet_report, load_fleet, poll_fleet
+
+    # Reject unknown formats before downloading anything
+    get_codec(array_fmt)
+    get_exporter(output_format)
+    start, end = parse_range(start, end, last)
+
+    load_environment()
+    fleet = fleet or os.getenv("T8_FLEET")
+    if not fleet:
+        print("No fleet configuration given (--fleet or T8_FLEET).")
+        return
+    hosts = load_fleet(fleet)
+
+    with ExitStack() as stack:
+        results = poll_fleet(
+            hosts,
+            kind,
+            start=start,
+            end=end,
+            array_fmt=array_fmt,
+            cache=get_cache() if use_cache else None,
+            index=get_index(),
+            on_record=_open_sink(stack, output_dir, output_format, archive, jsonl),
+        )
+    print(fleet_report(results), file=sys.stderr if jsonl == "-" else sys.stdout)
+
+# Function to stream the new records of measurement points as they appear
+def watch(  # noqa: PLR0913, PLR0917
+    kind: str = WAVES,
+    machine: str | None = None,
+    point: str | None = None,
+    pmode: str | None = None,
+    select: list[str] | None = None,
+    start: str | None = None,
+    interval: float = WATCH_INTERVAL,
+    max_interval: float = WATCH_MAX_INTERVAL,
+    workers: int = WORKERS,
+    output_dir: str = ".",
+    array_fmt: str = FORMAT,
+    use_cache: bool = True,
+    output_format: str = OUTPUT_FORMAT,
+    archive: str | None = None,
+    jsonl: str | None = None,
+) -> None:
+    """
+    Polls one or more measurement points until interrupted, and saves every new
+    record as soon as it appears.
+
+    A line per poll with the new records and the next interval, and a summary
+    with the lag between the timestamp of the records and their arrival, are
+    printed to the standard error.
+
+    Args:
+        kind (str): Record kind (`waves` or `spectra`).
+        machine (str | None): Machine identifier.
+        point (str | None): Measurement point identifier.
+        pmode (str | None): Mode of operation.
+        select (list[str] | None): Additional `MACHINE:POINT:PMODE` selections.
+        start (str | None): Also emit the existing records at or after this UTC
+            date, which may be relative such as `now-1h`. By default only
+            records created after the start are emitted.
+        interval (float): Time between polls in seconds.
+        max_interval (float): Longest time between polls when nothing is new.
+        workers (int): Maximum number of concurrent downloads.
+        output_dir (str): Directory where the files are written.
+        array_fmt (str): Array format requested from the server.
+        use_cache (bool): Whether to store the records in the local cache.
+        output_format (str): Export format of the saved files.
+        archive (str | None): Path of an archive to append the records to.
+        jsonl (str | None): Path of a JSON lines file (or `-` for the standard
+            output) to stream the records to.
+    """
+    from t8_client.functions.codecs import get_codec
+    from t8_client.functions.export import get_exporter
+    from t8_client.functions.watch import Watcher
+
+    # Reject unknown formats before polling anything
+    get_codec(array_fmt)
+    get_exporter(output_format)
+    if interval <= 0:
+        raise ValueError("--interval must be positive.")
+
+    selections = _gather_selections(machine, point, pmode, select)
+    if not selections:
+        return
+
+    def report(emitted: int) -> None:
+        print(
+            f"{datetime.now(UTC):%Y-%m-%dT%H:%M:%S} {emitted} new {kind}, "
+            f"next poll in {watcher.interval:g} s",
+            file=sys.stderr,
+        )
+
+    with ExitStack() as stack:
+        watcher = Watcher(
+            get_client(),
+            kind,
+            selections,
+            interval=interval,
+            max_interval=max_interval,
+            start=parse_time(start) if start else None,
+            array_fmt=array_fmt,
+            workers=workers,
+            cache=get_cache() if use_cache else None,
+            index=get_index(),
+            on_record=_open_sink(stack, output_dir, output_format, archive, jsonl),
+        )
+        # Stop on Ctrl+C, after closing the destination
+        with suppress(KeyboardInterrupt):
+            watcher.run(on_poll=report)
+    stats = watcher.stats
+    if stats.failed > len(stats.failures):
+        print(
+            f"Latest {len(stats.failures)} of {stats.failed} failures:",
+            file=sys.stderr,
+        )
+    for what, error in stats.failures:
+        print(f"Failed {what}: {error}", file=sys.stderr)
+    print(stats.summary(), file=sys.stderr)
+
+# Function to display the usage of the record cache
+def cache_stats() -> None:
+    """
+    Displays the location, number of entries and size of the record cache.
+    """
+    stats = get_cache().stats()
+    print(f"Directory: {stats['directory']}")
+    print(f"Entries: {stats['entries']}")
+    print(
+        f"Size: {stats['bytes'] / 1e6:.2f} MB of {stats['max_bytes'] / 1e6:.2f} MB"
+    )
+
+# Function to empty the record cache
+def cache_clear() -> None:
+    """
+    Removes every record from the record cache.
+    """
+    print(f"Removed {get_cache().clear()} cached records.")
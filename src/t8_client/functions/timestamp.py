@@ -1,22 +1,60 @@
 """
-This module provides a function to convert dates in UTC format to timestamps.
+This module provides functions to convert dates in UTC format to timestamps.
 
 The `utc_to_timestamp` function takes a date in UTC format (`YYYY-MM-DDTHH:MM:SS`)
 and converts it to a timestamp.
 
+Bulk listings and time ranges hold hundreds of thousands of dates, so the batch
+functions convert whole arrays between ISO 8601 strings and int64 epochs with
+NumPy `datetime64` instead of one `datetime` at a time. NumPy is imported by
+the batch functions only, so short listings do not pay for it.
+
+Time ranges also accept relative dates: `now`, `now-6h` or `now+1d`, and a
+window ending at `end` (or now) with a duration such as `6h`, `90m`, `7d` or
+`1d12h` (units `s`, `m`, `h`, `d` and `w`).
+
 Main functions:
 - `utc_to_timestamp`: Converts a date in UTC format to a timestamp.
+- `utc_to_timestamps`: Converts an array of ISO 8601 dates to timestamps.
+- `timestamps_to_utc`: Converts an array of timestamps to ISO 8601 dates.
+- `format_timestamps`: Formats timestamps, in batch for long lists.
+- `parse_duration`: Parses a duration such as `6h` to seconds.
+- `parse_time`: Parses an absolute or relative date to a timestamp.
+- `parse_range`: Parses the bounds of a time range.
 
 Usage:
-- This function is useful for preparing dates in queries to servers that
-    require timestamps.
+- `utc_to_timestamp` and `parse_time` prepare single dates for queries to
+    servers that require timestamps, and `parse_range` the bounds of the
+    `--from`, `--to` and `--last` options.
+- `utc_to_timestamps` and `timestamps_to_utc` convert whole arrays through
+    NumPy `datetime64[s]`, e.g. to turn the timestamps of a bulk listing into
+    dates, and `format_timestamps` picks the batch path for long lists only.
 
 Exceptions:
 - Raises a `ValueError` if the date is not in the correct format.
 - Raises a `TypeError` if the provided argument is not a string.
 """
+import re
+import time
+from collections.abc import Sequence
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    import numpy as np
+
+# Format of the dates printed by the client
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+# Number of timestamps from which formatting them with NumPy pays for its import
+BATCH_THRESHOLD = 20000
+# Seconds of every duration unit
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+# A duration made of one or more amounts with a unit, e.g. `1d12h`
+DURATION_PATTERN = re.compile(r"(?:\d+(?:\.\d+)?[smhdw])+")
+# An amount with its unit inside a duration
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)([smhdw])")
+# A date relative to the current time, e.g. `now-6h`
+RELATIVE_PATTERN = re.compile(r"now(?:([+-])(.+))?")
 
 def utc_to_timestamp(utc_date: str) -> int:
     """
@@ -40,3 +78,161 @@ def utc_to_timestamp(utc_date: str) -> int:
         raise ValueError(
             f"Invalid date format: {utc_date}. It must be 'YYYY-MM-DDTHH:MM:SS'."
         ) from e
+
+# Function to convert an array of dates to timestamps
+def utc_to_timestamps(dates: "Sequence[str] | np.ndarray") -> "np.ndarray":
+    """
+    Converts ISO 8601 dates in UTC to timestamps in a single vectorized pass.
+
+    Args:
+        dates (Sequence[str] | np.ndarray): Dates such as `2024-01-01`,
+            `2024-01-01T06:30` or `2024-01-01T06:30:15`.
+
+    Returns:
+        np.ndarray: One int64 timestamp per date.
+
+    Raises:
+        ValueError: If any date is not a valid ISO 8601 date.
+    """
+    import numpy as np  # noqa: PLC0415
+
+    try:
+        return np.asarray(dates, dtype="datetime64[s]").astype(np.int64)
+    except ValueError as e:
+        raise ValueError(f"Invalid date format: {e}. Expected ISO 8601 dates.") from e
+
+# Function to convert an array of timestamps to dates
+def timestamps_to_utc(timestamps: "Sequence[int] | np.ndarray") -> "np.ndarray":
+    """
+    Converts timestamps to ISO 8601 dates in UTC in a single vectorized pass.
+
+    Args:
+        timestamps (Sequence[int] | np.ndarray): Timestamps in seconds.
+
+    Returns:
+        np.ndarray: One `YYYY-MM-DDTHH:MM:SS` string per timestamp.
+    """
+    import numpy as np  # noqa: PLC0415
+
+    return np.datetime_as_string(
+        np.asarray(timestamps, dtype=np.int64).astype("datetime64[s]")
+    )
+
+# Function to format timestamps as dates
+def format_timestamps(timestamps: Sequence[int]) -> list[str]:
+    """
+    Formats timestamps as `YYYY-MM-DDTHH:MM:SS` dates in UTC.
+
+    Long lists are formatted with `timestamps_to_utc`, short ones one at a time
+    so they do not wait for NumPy to be imported.
+
+    Args:
+        timestamps (Sequence[int]): Timestamps in seconds.
+
+    Returns:
+        list[str]: One date per timestamp.
+    """
+    if len(timestamps) >= BATCH_THRESHOLD:
+        return timestamps_to_utc(timestamps).tolist()
+    return [
+        datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime(DATE_FORMAT)
+        for timestamp in timestamps
+    ]
+
+# Function to parse a duration
+def parse_duration(text: str) -> int:
+    """
+    Parses a duration such as `6h`, `90m` or `1d12h` to seconds.
+
+    Args:
+        text (str): One or more amounts followed by a unit (`s`, `m`, `h`, `d`
+            or `w`).
+
+    Returns:
+        int: Duration in seconds.
+
+    Raises:
+        ValueError: If the text is not a valid duration.
+    """
+    if not DURATION_PATTERN.fullmatch(text):
+        raise ValueError(
+            f"Invalid duration: {text}. Expected an amount and a unit "
+            "(s, m, h, d or w), e.g. '6h' or '1d12h'."
+        )
+    return int(
+        sum(
+            float(amount) * DURATION_UNITS[unit]
+            for amount, unit in DURATION_PART.findall(text)
+        )
+    )
+
+# Function to parse an absolute or relative date
+def parse_time(text: str, now: int | None = None) -> int:
+    """
+    Parses a date to a timestamp.
+
+    Args:
+        text (str): An ISO 8601 date in UTC (`2024-01-01`, `2024-01-01T06:30`,
+            ...), `now`, or a date relative to it such as `now-6h`.
+        now (int | None): Current timestamp; the system clock by default.
+
+    Returns:
+        int: Timestamp of the date.
+
+    Raises:
+        ValueError: If the text is not a valid date.
+    """
+    relative = RELATIVE_PATTERN.fullmatch(text)
+    if relative:
+        now = int(time.time()) if now is None else now
+        sign, duration = relative.groups()
+        if duration is None:
+            return now
+        offset = parse_duration(duration)
+        return now - offset if sign == "-" else now + offset
+    try:
+        date = datetime.fromisoformat(text)
+    except ValueError as e:
+        raise ValueError(
+            f"Invalid date: {text}. Expected an ISO 8601 date such as "
+            "'YYYY-MM-DDTHH:MM:SS', 'now' or 'now-6h'."
+        ) from e
+    # Dates without an offset are in UTC
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return int(date.timestamp())
+
+# Function to parse the bounds of a time range
+def parse_range(
+    start: str | None = None,
+    end: str | None = None,
+    last: str | None = None,
+    now: int | None = None,
+) -> tuple[int | None, int | None]:
+    """
+    Parses the bounds of a time range given as dates and/or a duration.
+
+    Args:
+        start (str | None): First date of the range (see `parse_time`).
+        end (str | None): Last date of the range (see `parse_time`).
+        last (str | None): Duration of a range ending at `end`, or now.
+        now (int | None): Current timestamp; the system clock by default.
+
+    Returns:
+        tuple[int | None, int | None]: First and last timestamp of the range,
+            None for an open bound.
+
+    Raises:
+        ValueError: If a bound is invalid, if both `start` and `last` are
+            given, or if the range ends before it starts.
+    """
+    now = int(time.time()) if now is None else now
+    first = parse_time(start, now) if start else None
+    final = parse_time(end, now) if end else None
+    if last:
+        if start:
+            raise ValueError("A time range takes either a start date or --last.")
+        first = (now if final is None else final) - parse_duration(last)
+    if first is not None and final is not None and first > final:
+        raise ValueError(f"The time range ends before it starts: {start} > {end}.")
+    return first, final
@@ -0,0 +1,258 @@
+"""
+This module collects per-phase timings of the work done by the T8 client.
+
+The code paths of the client report how long each phase took (and how many
+bytes it handled) through a lightweight hook interface:
+
+- `timed` is a context manager that measures a phase and reports it to every
+    registered hook. Code that accumulates a phase over a loop reports the
+    total with `report` instead.
+- Hooks are plain callables `hook(phase, seconds, n_bytes)` registered with
+    `add_hook`. Without hooks, reporting a phase costs a single list check.
+
+The reported phases are `network` (request and download), `json` (parsing the
+body), `base64`, `zlib` and `convert` (int16/float32 to scaled float32),
+`export` (writing a file, which includes the `axis`, `format` and `write`
+phases of CSV files) and `cache` (reading or writing the record cache).
+
+`Timings` is a hook that adds up every phase and can print them as a table,
+stream every measurement as a JSON line and write Prometheus/OpenMetrics text
+for a scraper. `run_instrumented` runs a subcommand with the requested
+timings and an optional cProfile profile.
+
+Main classes and functions:
+- `add_hook` / `remove_hook`: Register and unregister a hook.
+- `report`: Reports a measured phase to every hook.
+- `timed`: Measures a phase and reports it.
+- `Timings`: Hook adding up the phases.
+- `run_instrumented`: Runs a function with timings and profiling.
+"""
+import json
+import sys
+import threading
+import time
+from collections.abc import Callable
+from typing import TextIO
+
+# Hooks called with the name, duration in seconds and bytes of every phase
+HOOKS: list[Callable[[str, float, int], None]] = []
+# Prefix of the OpenMetrics metric names
+METRICS_PREFIX = "t8_client_phase"
+
+# Function to register a hook
+def add_hook(hook: Callable[[str, float, int], None]) -> None:
+    """
+    Registers a hook called with every measured phase.
+
+    Args:
+        hook (Callable[[str, float, int], None]): Called from any thread with
+            the phase name, its duration in seconds and its bytes.
+    """
+    HOOKS.append(hook)
+
+# Function to unregister a hook
+def remove_hook(hook: Callable[[str, float, int], None]) -> None:
+    """
+    Unregisters a hook.
+
+    Args:
+        hook (Callable[[str, float, int], None]): A registered hook.
+    """
+    HOOKS.remove(hook)
+
+# Function to report a measured phase
+def report(phase: str, seconds: float, n_bytes: int = 0) -> None:
+    """
+    Reports a measured phase to every registered hook.
+
+    Args:
+        phase (str): Name of the phase.
+        seconds (float): Duration of the phase.
+        n_bytes (int): Bytes handled by the phase.
+    """
+    for hook in HOOKS:
+        hook(phase, seconds, n_bytes)
+
+class timed:  # noqa: N801
+    """
+    Context manager measuring a phase and reporting it to every hook.
+
+    The bytes handled by the phase can be set on the context while it runs:
+
+        with timed("network") as phase:
+            response = session.get(url)
+            phase.n_bytes = len(response.content)
+
+    Args:
+        phase (str): Name of the phase.
+        n_bytes (int): Bytes handled by the phase, if known beforehand.
+    """
+
+    __slots__ = ("n_bytes", "phase", "start")
+
+    def __init__(self, phase: str, n_bytes: int = 0) -> None:
+        self.phase = phase
+        self.n_bytes = n_bytes
+        self.start = 0.0
+
+    def __enter__(self) -> "timed":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if HOOKS:
+            report(self.phase, time.perf_counter() - self.start, self.n_bytes)
+
+class Timings:
+    """
+    Hook adding up the calls, duration and bytes of every phase.
+
+    Use it as a context manager to register it as a hook while a block runs.
+
+    Args:
+        events (TextIO | None): Stream where every measurement is written as
+            a JSON line as soon as it is reported.
+    """
+
+    def __init__(self, events: TextIO | None = None) -> None:
+        self.events = events
+        # Calls, seconds and bytes of every phase, in order of first report
+        self.totals: dict[str, list] = {}
+        self.lock = threading.Lock()
+
+    def __enter__(self) -> "Timings":
+        add_hook(self)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        remove_hook(self)
+
+    def __call__(self, phase: str, seconds: float, n_bytes: int = 0) -> None:
+        """
+        Adds a measurement to the totals of its phase.
+
+        Args:
+            phase (str): Name of the phase.
+            seconds (float): Duration of the phase.
+            n_bytes (int): Bytes handled by the phase.
+        """
+        with self.lock:
+            total = self.totals.setdefault(phase, [0, 0.0, 0])
+            total[0] += 1
+            total[1] += seconds
+            total[2] += n_bytes
+            if self.events is not None:
+                line = {"phase": phase, "seconds": seconds, "bytes": n_bytes}
+                self.events.write(json.dumps(line) + "\n")
+
+    def table(self) -> str:
+        """
+        Formats the totals as a table.
+
+        Returns:
+            str: One header line and one line per phase with its calls, total
+                and mean duration in milliseconds, and bytes.
+        """
+        lines = [
+            f"{'phase':<10} {'calls':>7} {'total ms':>10} {'mean ms':>9} {'bytes':>12}"
+        ]
+        with self.lock:
+            for phase, (calls, seconds, n_bytes) in self.totals.items():
+                lines.append(
+                    f"{phase:<10} {calls:>7} {seconds * 1000:>10.2f} "
+                    f"{seconds * 1000 / calls:>9.3f} {n_bytes:>12}"
+                )
+        return "\n".join(lines)
+
+    def openmetrics(self) -> str:
+        """
+        Formats the totals in the Prometheus/OpenMetrics text format.
+
+        Returns:
+            str: Counters of the calls, seconds and bytes of every phase,
+                labelled by phase and terminated by `# EOF`.
+        """
+        metrics = (
+            ("calls", "", "Number of times every phase ran.", 0),
+            ("seconds", "seconds", "Time spent in every phase.", 1),
+            ("bytes", "bytes", "Bytes handled by every phase.", 2),
+        )
+        lines = []
+        with self.lock:
+            for name, unit, description, column in metrics:
+                metric = f"{METRICS_PREFIX}_{name}"
+                lines.append(f"# TYPE {metric} counter")
+                if unit:
+                    lines.append(f"# UNIT {metric} {unit}")
+                lines.append(f"# HELP {metric} {description}")
+                lines.extend(
+                    f'{metric}_total{{phase="{phase}"}} {total[column]}'
+                    for phase, total in self.totals.items()
+                )
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+# Function to run a function with timings and profiling
+def run_instrumented(  # noqa: PLR0913, PLR0917
+    func: Callable[..., object],
+    options: dict,
+    timings: bool = False,
+    timings_jsonl: str | None = None,
+    metrics: str | None = None,
+    profile: str | None = None,
+) -> None:
+    """
+    Calls a function with keyword arguments, collecting the requested timings
+    and profile.
+
+    Args:
+        func (Callable[..., object]): Function to run.
+        options (dict): Keyword arguments of the function.
+        timings (bool): Whether to print the table of timings to the standard
+            error when the function returns.
+        timings_jsonl (str | None): Path of a JSON lines file (or `-` for the
+            standard error) to stream every measurement to.
+        metrics (str | None): Path of an OpenMetrics text file to write the
+            totals to when the function returns.
+        profile (str | None): Path where cProfile statistics are dumped, and
+            summarised on the standard error.
+    """
+    if not (timings or timings_jsonl or metrics or profile):
+        func(**options)
+        return
+
+    events = None
+    if timings_jsonl:
+        events = (
+            sys.stderr
+            if timings_jsonl == "-"
+            else open(timings_jsonl, "a", encoding="utf-8")  # noqa: SIM115
+        )
+    profiler = None
+    if profile:
+        import cProfile  # noqa: PLC0415
+
+        profiler = cProfile.Profile()
+
+    try:
+        with Timings(events) as collector:
+            if profiler is not None:
+                profiler.runcall(func, **options)
+            else:
+                func(**options)
+    finally:
+        if events is not None and events is not sys.stderr:
+            events.close()
+        if profiler is not None:
+            import pstats  # noqa: PLC0415
+
+            profiler.dump_stats(profile)
+            print(f"Profile saved to: {profile}", file=sys.stderr)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats(
+                "cumulative"
+            ).print_stats(15)
+        if timings:
+            print(collector.table(), file=sys.stderr)
+        if metrics:
+            with open(metrics, "w", encoding="utf-8") as file:
+                file.write(collector.openmetrics())
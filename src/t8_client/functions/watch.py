@@ -0,0 +1,288 @@
+"""
+This module provides a continuous watch of new waves and spectra.
+
+A `Watcher` polls a set of measurement points at a fixed interval and emits
+every record that appeared since the previous poll, exactly once:
+
+- Listings are synchronised through a `ListingIndex`, so every poll only asks
+    the server for the records newer than the last one seen.
+- Only the new records are downloaded and decoded, concurrently.
+- When a poll finds nothing new (or fails), the interval grows by a backoff
+    factor up to a maximum, and it returns to the base interval as soon as new
+    records appear.
+- The lag between the timestamp of every record and the moment it is
+    available locally is measured, as an end-to-end latency metric.
+
+A watch can run for weeks, so its statistics have a fixed size: failures are
+counted and only the latest ones are kept, and the lag percentiles are taken
+over a window of the latest records.
+
+Records are handed to a callback, which the CLI connects to a JSON lines
+stream, an archive or files.
+
+Main classes:
+- `WatchStats`: Counters and lag of a watch.
+- `Watcher`: Polls measurement points and emits their new records.
+"""
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from t8_client.functions.bulk import DEFAULT_WORKERS, Selection, fetch_timestamps
+from t8_client.functions.cache import RecordCache
+from t8_client.functions.client import RequestStats, T8Client
+from t8_client.functions.index import ListingIndex
+from t8_client.functions.records import Record
+
+# Default time between polls in seconds
+DEFAULT_INTERVAL = 10.0
+# Default longest time between polls when nothing is new, in seconds
+DEFAULT_MAX_INTERVAL = 300.0
+# Default growth of the interval after a poll without new records
+DEFAULT_BACKOFF = 2.0
+# Number of latest failures kept with their error message
+MAX_FAILURES = 100
+# Number of latest records whose lag is kept for the percentiles
+LAG_WINDOW = 10000
+
+@dataclass
+class WatchStats:
+    """
+    Counters of a watch.
+
+    Attributes:
+        polls (int): Number of polls.
+        empty_polls (int): Number of polls without new records.
+        records (int): Number of records emitted.
+        failed (int): Number of listings and records that failed.
+        failures (deque[tuple[str, str]]): Description and error message of
+            the latest `MAX_FAILURES` listings or records that failed.
+        lag (RequestStats): Seconds between the timestamp of every record and
+            the moment it was emitted, with percentiles over the latest
+            `LAG_WINDOW` records.
+    """
+
+    polls: int = 0
+    empty_polls: int = 0
+    records: int = 0
+    failed: int = 0
+    failures: deque[tuple[str, str]] = field(
+        default_factory=lambda: deque(maxlen=MAX_FAILURES)
+    )
+    lag: RequestStats = field(default_factory=lambda: RequestStats(LAG_WINDOW))
+
+    def fail(self, what: str, error: str) -> None:
+        """
+        Counts a failed listing or record and keeps its error message.
+
+        Args:
+            what (str): Description of the listing or record.
+            error (str): Error message.
+        """
+        self.failed += 1
+        self.failures.append((what, error))
+
+    def summary(self) -> str:
+        """
+        Builds a human readable summary of the watch.
+
+        Returns:
+            str: One line with the counters and the lag (mean, 95th percentile
+                and maximum, in seconds).
+        """
+        return (
+            f"{self.polls} polls ({self.empty_polls} empty), {self.records} "
+            f"records, {self.failed} failed, lag mean "
+            f"{self.lag.mean:.2f} s, p95 {self.lag.percentile(95):.2f} s, "
+            f"max {self.lag.longest:.2f} s"
+        )
+
+class Watcher:
+    """
+    Polls a set of measurement points and emits their new records.
+
+    Args:
+        client (T8Client): Client used for every request.
+        kind (str): Record kind (`waves` or `spectra`).
+        selections (list[Selection]): Measurement points to watch.
+        interval (float): Time between polls in seconds.
+        max_interval (float): Longest time between polls when nothing is new.
+        backoff (float): Growth of the interval after a poll without new
+            records.
+        start (int | None): Emit the records at or after this timestamp that
+            already exist. When omitted, only records created after the watch
+            starts are emitted.
+        array_fmt (str): Array format requested from the server.
+        workers (int): Maximum number of concurrent downloads.
+        cache (RecordCache | None): Cache to store the downloaded records in.
+        index (ListingIndex | None): Index used to list the records
+            incrementally. An in-memory index is used when omitted.
+        on_record (Callable[[Record], None] | None): Called from the worker
+            threads with every new record.
+        clock (Callable[[], float]): Returns the current UNIX time, used to
+            measure the lag.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        client: T8Client,
+        kind: str,
+        selections: list[Selection],
+        interval: float = DEFAULT_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+        start: int | None = None,
+        array_fmt: str = "zint",
+        workers: int = DEFAULT_WORKERS,
+        cache: RecordCache | None = None,
+        index: ListingIndex | None = None,
+        on_record: Callable[[Record], None] | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.client = client
+        self.kind = kind
+        self.selections = selections
+        self.base_interval = interval
+        self.max_interval = max(interval, max_interval)
+        self.backoff = backoff
+        self.interval = interval
+        self.array_fmt = array_fmt
+        self.workers = workers
+        self.cache = cache
+        self.index = index or ListingIndex(":memory:")
+        self.on_record = on_record
+        self.clock = clock
+        self.stats = WatchStats()
+        self._stop = threading.Event()
+
+        # Newest timestamp already handled of every selection; None when
+        # every record of the selection is still to be emitted. Selections
+        # whose first listing failed are missing until a poll lists them.
+        self.cursors: dict[Selection, int | None] = {}
+        for selection in selections:
+            if start is not None:
+                self.cursors[selection] = start - 1
+            else:
+                self._start(selection)
+
+    def _start(self, selection: Selection) -> bool:
+        """
+        Lists the existing records of a selection, so only newer ones are
+        emitted. A failure is counted and the listing retried on the next poll.
+
+        Args:
+            selection (Selection): Measurement point to start watching.
+
+        Returns:
+            bool: Whether the selection could be listed.
+        """
+        try:
+            self.index.sync(self.client, self.kind, *selection, self.array_fmt)
+        except Exception as e:
+            self.stats.fail(f"listing {':'.join(selection)}", str(e))
+            return False
+        self.cursors[selection] = self.index.last_timestamp(
+            self.client.host, self.kind, *selection
+        )
+        return True
+
+    def stop(self) -> None:
+        """
+        Asks a running watch to stop, from any thread.
+        """
+        self._stop.set()
+
+    def _emit(self, record: Record) -> None:
+        """
+        Measures the lag of a new record and hands it over.
+
+        Args:
+            record (Record): The new record.
+        """
+        self.stats.lag.add(self.clock() - record.timestamp)
+        if self.on_record is not None:
+            self.on_record(record)
+
+    def poll(self) -> int:
+        """
+        Lists, downloads and emits the records created since the previous poll,
+        and adapts the interval before the next one.
+
+        Returns:
+            int: Number of records emitted.
+        """
+        pending = []
+        failed = False
+        for selection in self.selections:
+            if selection not in self.cursors:
+                # Its first listing failed: nothing is emitted until it works
+                failed |= not self._start(selection)
+                continue
+            cursor = self.cursors[selection]
+            try:
+                timestamps = self.index.timestamps(
+                    self.client,
+                    self.kind,
+                    *selection,
+                    start=None if cursor is None else cursor + 1,
+                    array_fmt=self.array_fmt,
+                )
+            except Exception as e:
+                self.stats.fail(f"listing {':'.join(selection)}", str(e))
+                failed = True
+                continue
+            if timestamps:
+                # Failed records are reported, not retried, so a broken record
+                # cannot stall the watch
+                self.cursors[selection] = timestamps[-1]
+                pending.extend((selection, timestamp) for timestamp in timestamps)
+
+        result = fetch_timestamps(
+            self.client,
+            self.kind,
+            pending,
+            self.array_fmt,
+            self.workers,
+            self.cache,
+            self._emit,
+        )
+        self.stats.polls += 1
+        self.stats.records += result.records
+        for what, error in result.failures:
+            self.stats.fail(what, error)
+
+        # Poll again soon while records keep coming, and slow down otherwise
+        if result.records and not failed:
+            self.interval = self.base_interval
+        else:
+            self.stats.empty_polls += not result.records
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        return result.records
+
+    def run(
+        self,
+        max_polls: int | None = None,
+        on_poll: Callable[[int], None] | None = None,
+    ) -> WatchStats:
+        """
+        Polls until `stop` is called or `max_polls` polls are done.
+
+        Args:
+            max_polls (int | None): Number of polls after which to stop.
+            on_poll (Callable[[int], None] | None): Called after every poll
+                with the number of records it emitted.
+
+        Returns:
+            WatchStats: Counters and lag of the watch.
+        """
+        while not self._stop.is_set():
+            emitted = self.poll()
+            if on_poll is not None:
+                on_poll(emitted)
+            if max_polls is not None and self.stats.polls >= max_polls:
+                break
+            # Sleep until the next poll, waking up early if stopped
+            self._stop.wait(self.interval)
+        return self.stats
@@ -4,28 +4,79 @@ This module defines the command-line interface for the T8 client.
 It provides subcommands to list, retrieve, and plot data for spectra and waves.
 Each subcommand is dynamically configured and executes specific functions
 based on the arguments provided by the user.
+
+Subcommands are referenced by the name of their function, and the module
+implementing them is only imported once the command line has been parsed, so
+`--help` and invalid invocations return immediately. Option values (formats,
+dates, sizes, bands...) are validated before the subcommand runs and reported
+as usage errors; errors found while it runs are printed to the standard error.
+
+`get-wave` and `get-spectrum` accept `--max-memory` to stream long records to
+their file in bounded memory (see `functions/streaming.py`).
+
+The global `--timings`, `--timings-jsonl`, `--metrics` and `--profile` options
+report where the time of any subcommand goes (see `functions/timings.py`).
 """
 import argparse
+import importlib
+import sys
 from argparse import _SubParsersAction
-from typing import Callable
 
-# Importing functions for subcommands from the module
-from t8_client.functions.subcommands import (
-    get_spectrum,
-    get_wave,
-    list_spectra,
-    list_waves,
-    plot_spectrum,
-    plot_wave,
-)
+from t8_client.functions.timings import run_instrumented
+
+# Module implementing the subcommands, imported when one of them runs
+SUBCOMMANDS_MODULE = "t8_client.functions.subcommands"
 
+# Default options, kept in sync with those of the subcommands module
+FORMAT = "zint"
+OUTPUT_FORMAT = "csv"
+WORKERS = 8
+WATCH_INTERVAL = 10.0
+WATCH_MAX_INTERVAL = 300.0
+WINDOW = "hann"
+OVERLAP = 0.5
+SPLIT = 8
+ALARM_DB = 6.0
+LIMIT = 10
 
-def add_subcommand(
+# Functions validating the value of an option, as (module, function) pairs
+# imported only when the option is given a non-default value
+VALIDATORS = {
+    "array_fmt": ("t8_client.functions.codecs", "get_codec"),
+    "output_format": ("t8_client.functions.export", "get_exporter"),
+    "max_memory": ("t8_client.functions.streaming", "parse_size"),
+    "window": ("t8_client.functions.spectrum", "get_window"),
+    "date": ("t8_client.functions.timestamp", "utc_to_timestamp"),
+    "baseline": ("t8_client.functions.timestamp", "parse_time"),
+    "baseline_to": ("t8_client.functions.timestamp", "parse_time"),
+    "select": ("t8_client.functions.bulk", "parse_selection"),
+    "bands": ("t8_client.functions.features", "parse_band"),
+}
+# Defaults known to be valid, which are not validated
+VALID_DEFAULTS = {"array_fmt": FORMAT, "output_format": OUTPUT_FORMAT, "window": WINDOW}
+# Checks of the numeric options, with the requirement they enforce
+RANGES = {
+    "workers": (lambda value: value >= 1, "must be at least 1"),
+    "processes": (lambda value: value >= 0, "must be at least 0"),
+    "queue_depth": (lambda value: value >= 1, "must be at least 1"),
+    "segment": (lambda value: value >= 2, "must be at least 2"),  # noqa: PLR2004
+    "overlap": (lambda value: 0 <= value < 1, "must be at least 0 and below 1"),
+    "previous": (lambda value: value >= 1, "must be at least 1"),
+    "split": (lambda value: value >= 1, "must be at least 1"),
+    "limit": (lambda value: value >= 0, "must be at least 0"),
+    "interval": (lambda value: value > 0, "must be positive"),
+    "max_interval": (lambda value: value > 0, "must be positive"),
+}
+
+
+def add_subcommand(  # noqa: PLR0913, PLR0917
     subparsers: _SubParsersAction,
     name: str,
     help_text: str,
-    func: Callable,
-    include_datetime: bool = False
+    func: str,
+    include_datetime: bool = False,
+    include_export: bool = False,
+    include_plot: bool = False,
 ) -> None:
     """
     Adds a subcommand to the parser.
@@ -34,8 +85,10 @@ def add_subcommand(
         subparsers (_SubParsersAction): The subparsers object to add the subcommand to.
         name (str): The name of the subcommand.
         help_text (str): The help text for the subcommand.
-        func (Callable): The function to execute for the subcommand.
+        func (str): Name of the function to execute for the subcommand.
         include_datetime (bool): Whether the subcommand requires a datetime argument.
+        include_export (bool): Whether the subcommand saves the record to a file.
+        include_plot (bool): Whether the subcommand plots the record.
     """
     # Create a new subparser for the subcommand
     parser = subparsers.add_parser(name, help=help_text)
@@ -46,16 +99,589 @@ def add_subcommand(
     )
     parser.add_argument("--point", "-p", required=True, help="Measurement point")
     parser.add_argument("--pmode", "-m", required=True, help="Processing mode")
+    parser.add_argument(
+        "--format",
+        "-f",
+        dest="array_fmt",
+        default=FORMAT,
+        help=f"Array format requested from the server (default: {FORMAT})",
+    )
 
     # Optionally add a datetime argument if required
     if include_datetime:
         parser.add_argument(
-            "--datetime", "-t", required=True, help="Spectrum date (timestamp)"
+            "--datetime",
+            "-t",
+            dest="date",
+            required=True,
+            help="Spectrum date (timestamp)",
+        )
+        parser.add_argument(
+            "--no-cache",
+            dest="use_cache",
+            action="store_false",
+            help="Do not read or store the record in the local cache",
+        )
+
+    else:
+        # Listing subcommands accept a time range and index options
+        add_time_range(parser, "list")
+        parser.add_argument(
+            "--last",
+            "-n",
+            metavar="N|DURATION",
+            help="Only list the newest N records, or those of the last DURATION "
+            "(e.g. 6h, 7d)",
+        )
+        parser.add_argument(
+            "--no-sync",
+            dest="sync",
+            action="store_false",
+            help="Answer from the local index without contacting the server",
+        )
+        parser.add_argument(
+            "--no-index",
+            dest="use_index",
+            action="store_false",
+            help="Download the full listing instead of using the local index",
+        )
+
+    # Optionally add the export format of the saved file
+    if include_export:
+        add_output_format(parser)
+        parser.add_argument(
+            "--max-memory",
+            metavar="SIZE",
+            help="Stream the record to a csv, csv.gz or npy file in chunks, "
+            "keeping memory below SIZE whatever its length (e.g. 64M); "
+            "bypasses the cache",
         )
 
+    # Optionally render the plot to an image instead of showing it
+    if include_plot:
+        add_plot_output(parser)
+
     # Set the default function to execute when this subcommand is called
     parser.set_defaults(func=func)
 
+def add_time_range(
+    parser: argparse.ArgumentParser, verb: str, include_last: bool = False
+) -> None:
+    """
+    Adds the `--from` and `--to` options of a time range.
+
+    Args:
+        parser (argparse.ArgumentParser): The subcommand parser.
+        verb (str): What the subcommand does with the records, for the help.
+        include_last (bool): Whether to add `--last` to select a range by its
+            duration.
+    """
+    parser.add_argument(
+        "--from",
+        dest="start",
+        help=f"First date to {verb} (YYYY-MM-DDTHH:MM:SS, YYYY-MM-DD, now-6h...)",
+    )
+    parser.add_argument(
+        "--to",
+        dest="end",
+        help=f"Last date to {verb} (YYYY-MM-DDTHH:MM:SS, YYYY-MM-DD, now...)",
+    )
+    if include_last:
+        parser.add_argument(
+            "--last",
+            metavar="DURATION",
+            help=f"Only {verb} the records of the last DURATION before --to or "
+            "now (e.g. 6h, 90m, 7d)",
+        )
+
+def add_output_format(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds the option selecting the export format of saved records.
+
+    Args:
+        parser (argparse.ArgumentParser): The subcommand parser.
+    """
+    parser.add_argument(
+        "--output-format",
+        "-F",
+        default=OUTPUT_FORMAT,
+        help=f"Format of the saved files (default: {OUTPUT_FORMAT})",
+    )
+
+def add_plot_output(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds the option rendering a plot to an image instead of showing it.
+
+    Args:
+        parser (argparse.ArgumentParser): The subcommand parser.
+    """
+    parser.add_argument(
+        "--output",
+        "-o",
+        help="Render the plot to this image (PNG, SVG, PDF) instead of showing it",
+    )
+
+def add_destination(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds the options selecting where downloaded records are saved.
+
+    Args:
+        parser (argparse.ArgumentParser): The subcommand parser.
+    """
+    parser.add_argument(
+        "--output-dir", "-o", default=".", help="Directory for the saved files"
+    )
+    add_output_format(parser)
+    destination = parser.add_mutually_exclusive_group()
+    destination.add_argument(
+        "--archive",
+        "-a",
+        help="Append the records to this archive instead of saving one file each",
+    )
+    destination.add_argument(
+        "--jsonl",
+        metavar="PATH",
+        help="Stream the records as JSON lines to this file ('-' for stdout)",
+    )
+
+def add_bulk_subcommand(
+    subparsers: _SubParsersAction,
+    name: str,
+    help_text: str,
+    func: str,
+    include_destination: bool = True,
+) -> argparse.ArgumentParser:
+    """
+    Adds a bulk download subcommand to the parser.
+
+    Args:
+        subparsers (_SubParsersAction): The subparsers object to add the subcommand to.
+        name (str): The name of the subcommand.
+        help_text (str): The help text for the subcommand.
+        func (str): Name of the function to execute for the subcommand.
+        include_destination (bool): Whether to add the options selecting where
+            the records are saved.
+
+    Returns:
+        argparse.ArgumentParser: The subcommand parser, to add further options.
+    """
+    parser = subparsers.add_parser(name, help=help_text)
+
+    # A measurement point can be given with separate options and/or as triples
+    parser.add_argument("--machine", "-M", help="Machine identifier")
+    parser.add_argument("--point", "-p", help="Measurement point")
+    parser.add_argument("--pmode", "-m", help="Processing mode")
+    parser.add_argument(
+        "--select",
+        "-s",
+        action="append",
+        metavar="MACHINE:POINT:PMODE",
+        help="Additional measurement point (can be repeated)",
+    )
+
+    # Optional time range
+    add_time_range(parser, "fetch", include_last=True)
+
+    # Download options
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=WORKERS,
+        help=f"Number of concurrent downloads (default: {WORKERS})",
+    )
+    if include_destination:
+        add_destination(parser)
+    parser.add_argument(
+        "--format",
+        "-f",
+        dest="array_fmt",
+        default=FORMAT,
+        help=f"Array format requested from the server (default: {FORMAT})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help="Do not read or store the records in the local cache",
+    )
+
+    parser.set_defaults(func=func)
+    return parser
+
+def add_process_options(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds the options of the process stage decoding and exporting the records.
+
+    Args:
+        parser (argparse.ArgumentParser): The subcommand parser.
+    """
+    parser.add_argument(
+        "--processes",
+        "-P",
+        type=int,
+        default=0,
+        help="Decode and export the records on this many processes while the "
+        "download threads keep downloading (default: 0, decode on the threads)",
+    )
+    parser.add_argument(
+        "--queue-depth",
+        type=int,
+        help="Maximum number of downloaded records waiting for the processes "
+        "(default: twice the number of processes)",
+    )
+
+def add_spectrum_subcommand(subparsers: _SubParsersAction) -> None:
+    """
+    Adds the `compute-spectrum` subcommand, which computes spectra from waves.
+
+    Args:
+        subparsers (_SubParsersAction): The subparsers object to add the subcommand to.
+    """
+    parser = add_bulk_subcommand(
+        subparsers,
+        "compute-spectrum",
+        "Computes the spectrum of every waveform in a time range",
+        "compute_spectrum",
+    )
+    parser.add_argument(
+        "--window",
+        default=WINDOW,
+        help=f"Window applied to every segment: rect, hann, hamming or blackman "
+        f"(default: {WINDOW})",
+    )
+    parser.add_argument(
+        "--segment",
+        type=int,
+        help="Samples per averaged segment (default: the whole waveform)",
+    )
+    parser.add_argument(
+        "--overlap",
+        type=float,
+        default=OVERLAP,
+        help=f"Overlap between segments, from 0 to 1 (default: {OVERLAP})",
+    )
+
+def add_features_subcommand(subparsers: _SubParsersAction) -> None:
+    """
+    Adds the `extract-features` subcommand, which writes condition indicators.
+
+    Args:
+        subparsers (_SubParsersAction): The subparsers object to add the subcommand to.
+    """
+    parser = add_bulk_subcommand(
+        subparsers,
+        "extract-features",
+        "Writes the condition indicators of every record in a time range",
+        "extract_features",
+        include_destination=False,
+    )
+    parser.add_argument(
+        "--kind",
+        "-k",
+        choices=["waves", "spectra"],
+        default="waves",
+        help="Kind of records to process (default: waves)",
+    )
+    parser.add_argument(
+        "--band",
+        "-b",
+        dest="bands",
+        action="append",
+        metavar="LOW:HIGH",
+        help="Frequency band in Hz whose RMS is computed (can be repeated)",
+    )
+    parser.add_argument(
+        "--window",
+        default=WINDOW,
+        help=f"Window of the spectra computed from waveforms (default: {WINDOW})",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        default="-",
+        help="CSV table, or JSON lines if it ends in .jsonl (default: stdout)",
+    )
+
+def add_compare_subcommand(subparsers: _SubParsersAction) -> None:
+    """
+    Adds the `compare-spectra` subcommand, which compares spectra band by band.
+
+    Args:
+        subparsers (_SubParsersAction): The subparsers object to add the subcommand to.
+    """
+    parser = add_bulk_subcommand(
+        subparsers,
+        "compare-spectra",
+        "Compares every spectrum in a time range against a baseline and "
+        "reports the bands in alarm",
+        "compare_spectra",
+        include_destination=False,
+    )
+    reference = parser.add_mutually_exclusive_group()
+    reference.add_argument(
+        "--baseline",
+        metavar="DATE",
+        help="Date of the baseline spectrum (default: the first of the range)",
+    )
+    reference.add_argument(
+        "--previous",
+        type=int,
+        metavar="N",
+        help="Compare every spectrum with the mean of the N spectra before it",
+    )
+    parser.add_argument(
+        "--baseline-to",
+        metavar="DATE",
+        help="Use the mean of every spectrum from --baseline to this date",
+    )
+    parser.add_argument(
+        "--band",
+        "-b",
+        dest="bands",
+        action="append",
+        metavar="LOW:HIGH",
+        help="Frequency band in Hz to compare (can be repeated)",
+    )
+    parser.add_argument(
+        "--split",
+        type=int,
+        default=SPLIT,
+        help=f"Number of equal bands compared when no --band is given "
+        f"(default: {SPLIT})",
+    )
+    parser.add_argument(
+        "--alarm-db",
+        type=float,
+        default=ALARM_DB,
+        help=f"Rise of a band in dB that raises an alarm (default: {ALARM_DB})",
+    )
+    parser.add_argument(
+        "--alarm-level",
+        type=float,
+        help="RMS of a band that raises an alarm, whatever the baseline",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=LIMIT,
+        help=f"Number of spectra in alarm listed (default: {LIMIT})",
+    )
+    parser.add_argument(
+        "--archive",
+        "-a",
+        help="Read the spectra from this archive instead of the server",
+    )
+
+def add_waterfall_subcommand(subparsers: _SubParsersAction) -> None:
+    """
+    Adds the `plot-waterfall` subcommand, which plots many spectra at once.
+
+    Args:
+        subparsers (_SubParsersAction): The subparsers object to add the subcommand to.
+    """
+    parser = add_bulk_subcommand(
+        subparsers,
+        "plot-waterfall",
+        "Plots every spectrum in a time range as a waterfall",
+        "plot_waterfall",
+        include_destination=False,
+    )
+    parser.add_argument(
+        "--compute",
+        action="store_true",
+        help="Compute the spectra from the waveforms instead of downloading them",
+    )
+    add_plot_output(parser)
+
+def add_poll_subcommand(subparsers: _SubParsersAction) -> None:
+    """
+    Adds the `poll` subcommand, which downloads records from a fleet of units.
+
+    Args:
+        subparsers (_SubParsersAction): The subparsers object to add the subcommand to.
+    """
+    parser = subparsers.add_parser(
+        "poll", help="Fetches records from every T8 unit of a fleet concurrently"
+    )
+    parser.add_argument(
+        "--fleet",
+        "-c",
+        help="Fleet configuration file (default: the T8_FLEET variable)",
+    )
+    parser.add_argument(
+        "--kind",
+        "-k",
+        choices=["waves", "spectra"],
+        default="waves",
+        help="Kind of records to fetch (default: waves)",
+    )
+    add_time_range(parser, "fetch", include_last=True)
+    add_destination(parser)
+    parser.add_argument(
+        "--format",
+        "-f",
+        dest="array_fmt",
+        default=FORMAT,
+        help=f"Array format requested from the servers (default: {FORMAT})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help="Do not read or store the records in the local cache",
+    )
+    parser.set_defaults(func="poll")
+
+def add_watch_subcommand(subparsers: _SubParsersAction) -> None:
+    """
+    Adds the `watch` subcommand, which streams new records as they appear.
+
+    Args:
+        subparsers (_SubParsersAction): The subparsers object to add the subcommand to.
+    """
+    parser = subparsers.add_parser(
+        "watch", help="Polls measurement points and saves every new record"
+    )
+    parser.add_argument(
+        "--kind",
+        "-k",
+        choices=["waves", "spectra"],
+        default="waves",
+        help="Kind of records to watch (default: waves)",
+    )
+    parser.add_argument("--machine", "-M", help="Machine identifier")
+    parser.add_argument("--point", "-p", help="Measurement point")
+    parser.add_argument("--pmode", "-m", help="Processing mode")
+    parser.add_argument(
+        "--select",
+        "-s",
+        action="append",
+        metavar="MACHINE:POINT:PMODE",
+        help="Additional measurement point (can be repeated)",
+    )
+    parser.add_argument(
+        "--from",
+        dest="start",
+        help="Also emit the existing records since this date (YYYY-MM-DDTHH:MM:SS "
+        "or relative, e.g. now-1h)",
+    )
+    parser.add_argument(
+        "--interval",
+        "-i",
+        type=float,
+        default=WATCH_INTERVAL,
+        help=f"Seconds between polls (default: {WATCH_INTERVAL:g})",
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
+        default=WATCH_MAX_INTERVAL,
+        help="Longest seconds between polls while nothing is new "
+        f"(default: {WATCH_MAX_INTERVAL:g})",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=WORKERS,
+        help=f"Number of concurrent downloads (default: {WORKERS})",
+    )
+    add_destination(parser)
+    parser.add_argument(
+        "--format",
+        "-f",
+        dest="array_fmt",
+        default=FORMAT,
+        help=f"Array format requested from the server (default: {FORMAT})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help="Do not store the records in the local cache",
+    )
+    parser.set_defaults(func="watch")
+
+def add_cache_subcommand(subparsers: _SubParsersAction) -> None:
+    """
+    Adds the `cache` subcommand, with its `stats` and `clear` actions.
+
+    Args:
+        subparsers (_SubParsersAction): The subparsers object to add the subcommand to.
+    """
+    parser = subparsers.add_parser("cache", help="Manages the local record cache")
+    actions = parser.add_subparsers(dest="action", required=True)
+    actions.add_parser("stats", help="Shows the cache usage").set_defaults(
+        func="cache_stats"
+    )
+    actions.add_parser("clear", help="Removes every cached record").set_defaults(
+        func="cache_clear"
+    )
+
+def add_instrument_options(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds the global options that measure and profile a subcommand.
+
+    Args:
+        parser (argparse.ArgumentParser): The main parser.
+    """
+    group = parser.add_argument_group("instrumentation")
+    group.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print the time and bytes of every phase to the standard error",
+    )
+    group.add_argument(
+        "--timings-jsonl",
+        metavar="PATH",
+        help="Append every measured phase as a JSON line ('-' for stderr)",
+    )
+    group.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="Write the phase totals as Prometheus/OpenMetrics text",
+    )
+    group.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Run under cProfile and dump the statistics to PATH",
+    )
+
+def check_options(options: dict) -> None:
+    """
+    Validates the values of the options of a subcommand before running it, so
+    invalid values are reported as usage errors without contacting the server.
+
+    Args:
+        options (dict): Parsed options of the subcommand.
+
+    Raises:
+        ValueError: If the value of an option is invalid.
+    """
+    for name, (module, function) in VALIDATORS.items():
+        value = options.get(name)
+        if value is None or value == VALID_DEFAULTS.get(name):
+            continue
+        validate = getattr(importlib.import_module(module), function)
+        for item in value if isinstance(value, list) else [value]:
+            validate(item)
+
+    # The listings, which have an index, take a bare number as a count of
+    # records instead of a duration
+    last = options.get("last")
+    if "use_index" in options and last is not None and last.isdigit():
+        last = None
+    if options.get("start") or options.get("end") or last:
+        importlib.import_module("t8_client.functions.timestamp").parse_range(
+            options.get("start"), options.get("end"), last
+        )
+    for name, (check, requirement) in RANGES.items():
+        if options.get(name) is not None and not check(options[name]):
+            raise ValueError(f"--{name.replace('_', '-')} {requirement}.")
+    if options.get("baseline_to") is not None and options.get("baseline") is None:
+        raise ValueError("--baseline-to requires --baseline.")
+
 def main() -> None:
     """
     Main function to parse arguments and execute the corresponding subcommand.
@@ -64,31 +690,83 @@ def main() -> None:
     parser = argparse.ArgumentParser(
         description="T8 client to manage spectrum and wave data"
     )
+    add_instrument_options(parser)
     # Create subparsers for the available subcommands
     subparsers = parser.add_subparsers(dest="command", help="Available subcommands")
 
     # List of subcommands with their associated functions
     commands = [
-        ("list-waves", "Lists waveforms", list_waves, False),
-        ("list-spectra", "Lists spectra", list_spectra, False),
-        ("get-wave", "Gets a specific waveform", get_wave, True),
-        ("get-spectrum", "Gets a specific spectrum", get_spectrum, True),
-        ("plot-wave", "Plots a specific waveform", plot_wave, True),
-        ("plot-spectrum", "Plots a specific spectrum", plot_spectrum, True)
+        ("list-waves", "Lists waveforms", "list_waves", False, False, False),
+        ("list-spectra", "Lists spectra", "list_spectra", False, False, False),
+        ("get-wave", "Gets a specific waveform", "get_wave", True, True, False),
+        ("get-spectrum", "Gets a specific spectrum", "get_spectrum", True, True, False),
+        ("plot-wave", "Plots a specific waveform", "plot_wave", True, False, True),
+        (
+            "plot-spectrum",
+            "Plots a specific spectrum",
+            "plot_spectrum",
+            True,
+            False,
+            True,
+        ),
     ]
 
     # Dynamically add the subcommands to the parser
-    for name, help_text, func, include_datetime in commands:
-        add_subcommand(subparsers, name, help_text, func, include_datetime)
+    for name, help_text, func, *flags in commands:
+        add_subcommand(subparsers, name, help_text, func, *flags)
+
+    # Bulk download subcommands, which can decode on several processes
+    add_process_options(
+        add_bulk_subcommand(
+            subparsers,
+            "fetch-waves",
+            "Fetches every waveform in a time range",
+            "fetch_waves",
+        )
+    )
+    add_process_options(
+        add_bulk_subcommand(
+            subparsers,
+            "fetch-spectra",
+            "Fetches every spectrum in a time range",
+            "fetch_spectra",
+        )
+    )
+    add_spectrum_subcommand(subparsers)
+    add_features_subcommand(subparsers)
+    add_compare_subcommand(subparsers)
+    add_waterfall_subcommand(subparsers)
+    add_poll_subcommand(subparsers)
+    add_watch_subcommand(subparsers)
+    add_cache_subcommand(subparsers)
 
     # Parse the command-line arguments
     args = parser.parse_args()
     if args.command:
-        # Execute the corresponding function for the subcommand
-        if hasattr(args, "datetime"):
-            args.func(args.machine, args.point, args.pmode, args.datetime)
-        else:
-            args.func(args.machine, args.point, args.pmode)
+        # Execute the corresponding function for the subcommand, passing every
+        # parsed option as a keyword argument
+        options = vars(args)
+        func = getattr(
+            importlib.import_module(SUBCOMMANDS_MODULE), options.pop("func")
+        )
+        options.pop("command")
+        options.pop("action", None)
+        instruments = {
+            name: options.pop(name)
+            for name in ("timings", "timings_jsonl", "metrics", "profile")
+        }
+        try:
+            check_options(options)
+        except ValueError as e:
+            # Invalid option values (dates, formats, selections) are reported
+            # like any other usage error
+            parser.error(str(e))
+        try:
+            run_instrumented(func, options, **instruments)
+        except ValueError as e:
+            # Errors found while running (invalid bodies, corrupt files...)
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
     else:
         # If no subcommand is provided, display the help message
         parser.print_help()
@@ -0,0 +1,120 @@
+"""
+This module contains automated tests for the record archive of the `archive.py`
+module.
+
+Included tests:
+- `test_append_and_read`: Verifies that appended records are read back with their
+    samples and metadata.
+- `test_reads_are_zero_copy`: Verifies that records are slices of the memory mapped
+    data file.
+- `test_time_window`: Verifies time window queries on sorted and unsorted archives,
+    also after appending to them.
+- `test_reopen_and_append`: Verifies that an existing archive can be reopened and
+    extended, and that readers see new records.
+- `test_long_names`: Ensures that a `ValueError` is raised when a name of a record
+    does not fit in the index, and that nothing is appended.
+- `test_missing_archive`: Ensures that a `FileNotFoundError` is raised when reading
+    an archive that does not exist.
+"""
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+
+from t8_client.functions.archive import RecordArchive
+from t8_client.functions.client import SPECTRA, WAVES
+from t8_client.functions.records import Record
+
+
+def make_record(timestamp: int, n: int = 4, kind: str = WAVES) -> Record:
+    """Builds a record whose samples depend on its timestamp."""
+    values = np.full(n, timestamp, dtype="f")
+    if kind == WAVES:
+        return Record(kind, "M", "P", "AM1", timestamp, values, 0.5, 1000.0)
+    return Record(
+        kind, "M", "P", "AM1", timestamp, values, 2.0, min_freq=0.0, max_freq=100.0
+    )
+
+def test_append_and_read(tmp_path: Path) -> None:
+    """Test that appended records are read back unchanged."""
+    path = tmp_path / "waves.t8a"
+    with RecordArchive(path, "a") as archive:
+        archive.append(make_record(10))
+        archive.append(make_record(20, n=6, kind=SPECTRA))
+
+    archive = RecordArchive(path)
+    assert len(archive) == 2  # noqa: PLR2004
+    wave, spectrum = archive[0], archive[-1]
+    assert (wave.kind, wave.timestamp, wave.sample_rate) == (WAVES, 10, 1000.0)
+    assert wave.values.tolist() == [10.0] * 4
+    assert (spectrum.kind, spectrum.max_freq, spectrum.sample_rate) == (
+        SPECTRA,
+        100.0,
+        None,
+    )
+    assert spectrum.values.tolist() == [20.0] * 6
+
+def test_reads_are_zero_copy(tmp_path: Path) -> None:
+    """Test that records are views of the memory mapped data."""
+    path = tmp_path / "waves.t8a"
+    with RecordArchive(path, "a") as archive:
+        archive.append(make_record(10))
+        archive.append(make_record(20))
+    archive = RecordArchive(path)
+    assert np.shares_memory(archive[1].values, archive.data)
+
+def test_time_window(tmp_path: Path) -> None:
+    """Test time window queries on sorted and unsorted archives."""
+    for order in ([10, 20, 30, 40], [30, 10, 40, 20]):
+        path = tmp_path / f"{order[0]}.t8a"
+        with RecordArchive(path, "a") as archive:
+            for timestamp in order:
+                archive.append(make_record(timestamp))
+        reader = RecordArchive(path)
+        records = reader.window(start=20, end=30)
+        assert sorted(record.timestamp for record in records) == [20, 30]
+        assert all(record.values[0] == record.timestamp for record in records)
+        assert [record.timestamp for record in reader.window(end=25)] == [
+            t for t in order if t <= 25  # noqa: PLR2004
+        ]
+        with RecordArchive(path, "a") as archive:
+            archive.append(make_record(25))
+        assert sorted(r.timestamp for r in reader.window(20, 30)) == [20, 25, 30]
+
+def test_reopen_and_append(tmp_path: Path) -> None:
+    """Test that an archive can be extended while a reader has it open."""
+    path = tmp_path / "waves.t8a"
+    with RecordArchive(path, "a") as archive:
+        archive.append(make_record(10))
+    reader = RecordArchive(path)
+    assert len(reader) == 1
+    with RecordArchive(path, "a") as archive:
+        archive.append(make_record(20))
+    assert len(reader) == 2  # noqa: PLR2004
+    assert reader[1].values.tolist() == [20.0] * 4
+
+def test_long_names(tmp_path: Path) -> None:
+    """Test that names longer than their index field are rejected."""
+    path = tmp_path / "waves.t8a"
+    with RecordArchive(path, "a") as archive:
+        for changes in (
+            {"machine": "M" * 65},
+            {"pmode": "AM1" * 11},
+            {"host": "ñ" * 33},
+        ):
+            try:
+                archive.append(replace(make_record(10), **changes))
+                raise AssertionError("Expected a ValueError exception")
+            except ValueError:
+                pass  # This error was expected
+        archive.append(replace(make_record(10), machine="M" * 64))
+    assert RecordArchive(path)[0].machine == "M" * 64
+    assert len(RecordArchive(path)) == 1
+
+def test_missing_archive(tmp_path: Path) -> None:
+    """Test that reading a missing archive fails."""
+    try:
+        RecordArchive(tmp_path / "missing.t8a")
+        raise AssertionError("Expected a FileNotFoundError exception")
+    except FileNotFoundError:
+        pass  # This error was expected
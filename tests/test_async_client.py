@@ -0,0 +1,134 @@
+"""
+This module contains automated tests for the asyncio client of the
+`async_client.py` module.
+
+The tests use an in-memory transport, so no T8 unit is needed. They are skipped
+when the optional `httpx` package is not installed.
+
+Included tests:
+- `test_list_waves`: Verifies that listings are parsed and filtered.
+- `test_get_wave`: Verifies that a wave is downloaded and decoded with its
+    metadata.
+- `test_parsing_off_loop`: Verifies that listings and records are parsed in
+    the executor, not on the event loop thread.
+- `test_concurrency_limit`: Verifies that no more than `max_concurrency` requests
+    are in flight at once.
+- `test_retries`: Verifies that transient errors are retried and permanent ones
+    raised.
+"""
+import asyncio
+import json
+import threading
+
+import numpy as np
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from t8_client.functions import async_client  # noqa: E402
+from t8_client.functions.async_client import AsyncT8Client  # noqa: E402
+from t8_client.functions.codecs import get_codec  # noqa: E402
+
+# Timestamps of the fake listing
+TIMESTAMPS = [0, 10, 20, 30]
+
+def record_document() -> dict:
+    """Builds the JSON document of a small wave."""
+    return {"sample_rate": 100, "factor": 2, "data": get_codec("zint").encode([1, 2])}
+
+def listing_document(path: str) -> dict:
+    """Builds the JSON document of a listing."""
+    return {"_items": [{"_links": {"self": f"{path}{t}/"}} for t in TIMESTAMPS]}
+
+def make_client(handler: object, **options: object) -> AsyncT8Client:
+    """Builds a client answered by an in-memory transport."""
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncT8Client("http://t8.test", "user", "pass", http=http, **options)
+
+def answer(request: httpx.Request) -> httpx.Response:
+    """Answers listings and records."""
+    path = request.url.path
+    if path.count("/") == 6:  # noqa: PLR2004
+        return httpx.Response(200, json=listing_document(path))
+    return httpx.Response(200, json=record_document())
+
+def test_list_waves() -> None:
+    """Test that listings are parsed and filtered."""
+    async def run() -> tuple[list[int], list[int]]:
+        client = make_client(answer)
+        return (
+            await client.list_waves("M", "P", "AM1"),
+            await client.list_waves("M", "P", "AM1", since=10),
+        )
+
+    assert asyncio.run(run()) == ([10, 20, 30], [20, 30])
+
+def test_get_wave() -> None:
+    """Test that a wave is downloaded and decoded."""
+    async def run() -> object:
+        return await make_client(answer).get_wave("M", "P", "AM1", 20)
+
+    wave = asyncio.run(run())
+    assert (wave.timestamp, wave.sample_rate, wave.factor) == (20, 100.0, 2.0)
+    assert np.array_equal(wave.values, [2.0, 4.0])
+
+def test_parsing_off_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that bodies are parsed outside the event loop thread."""
+    threads = {}
+    for name in ("parse_listing", "parse_record"):
+        function = getattr(async_client, name)
+
+        def spy(*args: object, name: str = name, function: object = function) -> object:
+            """Records the thread running the parser."""
+            threads[name] = threading.get_ident()
+            return function(*args)
+
+        monkeypatch.setattr(async_client, name, spy)
+
+    async def run() -> None:
+        client = make_client(answer)
+        timestamps = await client.list_waves("M", "P", "AM1")
+        await client.get_wave("M", "P", "AM1", timestamps[0])
+
+    asyncio.run(run())
+    assert set(threads) == {"parse_listing", "parse_record"}
+    assert threading.get_ident() not in threads.values()
+
+def test_concurrency_limit() -> None:
+    """Test that concurrent requests are bounded per client."""
+    in_flight, peak = 0, 0
+
+    async def slow(_request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, content=json.dumps(record_document()))
+
+    async def run() -> list:
+        client = make_client(slow, max_concurrency=3)
+        return await client.get_records("waves", "M", "P", "AM1", list(range(12)))
+
+    records = asyncio.run(run())
+    assert [record.timestamp for record in records] == list(range(12))
+    assert peak == 3  # noqa: PLR2004
+
+def test_retries() -> None:
+    """Test that transient errors are retried and permanent ones raised."""
+    statuses = {"M": [503, 503, 200], "N": [404]}
+
+    def flaky(request: httpx.Request) -> httpx.Response:
+        status = statuses[request.url.path.split("/")[3]].pop(0)
+        return httpx.Response(status, json=record_document())
+
+    async def run(machine: str) -> object:
+        client = make_client(flaky, retries=2, backoff=0)
+        return await client.get_wave(machine, "P", "AM1", 20)
+
+    assert asyncio.run(run("M")).timestamp == 20  # noqa: PLR2004
+    try:
+        asyncio.run(run("N"))
+        raise AssertionError("Expected an HTTPStatusError exception")
+    except httpx.HTTPStatusError:
+        pass  # This error was expected
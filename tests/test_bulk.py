@@ -0,0 +1,93 @@
+"""
+This module contains automated tests for the bulk downloads of the `bulk.py`
+module.
+
+The tests use an in-memory client, so no T8 unit is needed.
+
+Included tests:
+- `test_parse_selection`: Verifies that `MACHINE:POINT:PMODE` triples are parsed.
+- `test_invalid_selection`: Ensures that a `ValueError` is raised for incomplete
+    selections.
+- `test_fetch_records_in_range`: Verifies that only the records inside the time
+    range are fetched and handed over.
+- `test_failures_are_isolated`: Verifies that failing listings and records are
+    reported without aborting the batch.
+"""
+import json
+
+import numpy as np
+
+from t8_client.functions.bulk import fetch_records, parse_selection
+from t8_client.functions.client import WAVES
+from t8_client.functions.codecs import get_codec
+
+
+class FakeResponse:
+    """Response holding a canned JSON document."""
+
+    def __init__(self, document: dict) -> None:
+        self.content = json.dumps(document).encode()
+
+class FakeClient:
+    """Client answering listings and records from memory."""
+
+    host = "http://t8.test"
+
+    def __init__(self, timestamps: dict, broken: set) -> None:
+        self.timestamps = timestamps
+        self.broken = broken
+
+    def url(self, *parts: object) -> str:
+        """Builds a URL from its parts."""
+        return "/".join(str(part) for part in parts)
+
+    def list_timestamps(self, _kind: str, *selection: str) -> list[int]:
+        """Lists the timestamps of a selection."""
+        return self.timestamps[selection[:3]]
+
+    def get(self, url: str, **_params: object) -> FakeResponse:
+        """Returns a record, failing for the broken timestamps."""
+        if int(url.rpartition("/")[2]) in self.broken:
+            raise OSError("connection reset")
+        return FakeResponse(
+            {"sample_rate": 100, "factor": 2, "data": get_codec("zint").encode([1, 2])}
+        )
+
+def test_parse_selection() -> None:
+    """Test that a selection triple is parsed."""
+    assert parse_selection("LP_Turbine:MAD31CY005:AM1") == (
+        "LP_Turbine",
+        "MAD31CY005",
+        "AM1",
+    )
+
+def test_invalid_selection() -> None:
+    """Test that an incomplete selection is rejected."""
+    for text in ("LP_Turbine:MAD31CY005", "LP_Turbine::AM1"):
+        try:
+            parse_selection(text)
+            raise AssertionError("Expected a ValueError exception")
+        except ValueError:
+            pass  # This error was expected
+
+def test_fetch_records_in_range() -> None:
+    """Test that only the records inside the time range are fetched."""
+    client = FakeClient({("M", "P", "AM1"): [10, 20, 30, 40]}, broken=set())
+    received = []
+    result = fetch_records(
+        client, WAVES, [("M", "P", "AM1")], start=20, end=30,
+        on_record=received.append,
+    )
+    assert result.records == 2  # noqa: PLR2004
+    assert result.n_bytes == 2 * len(client.get("M/1").content)
+    assert not result.failures
+    assert sorted(record.timestamp for record in received) == [20, 30]
+    assert np.array_equal(received[0].values, [2.0, 4.0])
+
+def test_failures_are_isolated() -> None:
+    """Test that failing listings and records do not abort the batch."""
+    client = FakeClient({("M", "P", "AM1"): [10, 20, 30]}, broken={20})
+    result = fetch_records(client, WAVES, [("M", "P", "AM1"), ("M", "Q", "AM1")])
+    assert result.records == 2  # noqa: PLR2004
+    failed = sorted(what for what, _ in result.failures)
+    assert failed == ["M:P:AM1@20", "listing M:Q:AM1"]
@@ -0,0 +1,98 @@
+"""
+This module contains automated tests for the record cache of the `cache.py` module.
+
+Included tests:
+- `test_round_trip`: Verifies that a stored record is loaded back with its samples
+    and metadata, including its host.
+- `test_missing_entry`: Verifies that an unknown key is a cache miss.
+- `test_key_identity`: Verifies that keys differ for every identifying field.
+- `test_lru_eviction`: Verifies that the least recently used entries are evicted
+    when the cache exceeds its cap.
+- `test_single_scan`: Verifies that the directory is listed once, not on every
+    stored record.
+- `test_stats_and_clear`: Verifies the reported usage and that clearing removes
+    every entry.
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from t8_client.functions.cache import RecordCache
+from t8_client.functions.client import SPECTRA, WAVES
+from t8_client.functions.records import Record
+
+
+def make_record(timestamp: int, n: int = 1000) -> Record:
+    """Builds a wave record with `n` samples."""
+    return Record(
+        WAVES, "M", "P", "AM1", timestamp, np.arange(n, dtype="f"), 0.5, 2560.0
+    )
+
+def test_round_trip(tmp_path: Path) -> None:
+    """Test that a stored record is loaded back unchanged."""
+    cache = RecordCache(tmp_path)
+    record = make_record(10)
+    record.host = "t8-a"
+    cache.put("abc", record)
+    loaded = cache.get("abc")
+    assert np.array_equal(loaded.values, record.values)
+    assert isinstance(loaded.values, np.memmap)
+    assert (loaded.kind, loaded.timestamp, loaded.factor) == (WAVES, 10, 0.5)
+    assert loaded.sample_rate == record.sample_rate
+    assert loaded.host == "t8-a"
+
+def test_missing_entry(tmp_path: Path) -> None:
+    """Test that an unknown key is a cache miss."""
+    assert RecordCache(tmp_path).get("missing") is None
+
+def test_key_identity() -> None:
+    """Test that every identifying field changes the key."""
+    base = ("http://t8", WAVES, "M", "P", "AM1", 10, "zint")
+    keys = {RecordCache.key(*base)}
+    for i, value in enumerate(("http://t9", SPECTRA, "N", "Q", "AM2", 11, "int")):
+        keys.add(RecordCache.key(*base[:i], value, *base[i + 1 :]))
+    assert len(keys) == 8  # noqa: PLR2004
+
+def test_lru_eviction(tmp_path: Path) -> None:
+    """Test that the least recently used entries are evicted first."""
+    entry_size = 1000 * 4 + 128  # Samples plus the .npy header
+    cache = RecordCache(tmp_path, max_bytes=2 * entry_size)
+    for i, key in enumerate(("a", "b")):
+        cache.put(key, make_record(i))
+        os.utime(tmp_path / f"{key}.npy", (i, i))
+    # Using "a" makes "b" the least recently used entry
+    assert cache.get("a") is not None
+    cache.put("c", make_record(2))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+def test_single_scan(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that storing records does not list the cache every time."""
+    scans = []
+    entries = RecordCache._entries
+    monkeypatch.setattr(
+        RecordCache, "_entries", lambda self: scans.append(1) or entries(self)
+    )
+    entry_size = 1000 * 4 + 128
+    cache = RecordCache(tmp_path, max_bytes=10 * entry_size)
+    for i in range(50):
+        cache.put(str(i), make_record(i))
+    assert len(scans) == 1
+    assert len(list(tmp_path.glob("*.npy"))) == 10  # noqa: PLR2004
+    assert cache.get("39") is None
+    assert cache.get("40") is not None
+
+def test_stats_and_clear(tmp_path: Path) -> None:
+    """Test the reported usage and clearing the cache."""
+    cache = RecordCache(tmp_path / "cache")
+    assert cache.stats()["entries"] == 0
+    cache.put("a", make_record(1))
+    cache.put("b", make_record(2))
+    stats = cache.stats()
+    assert stats["entries"] == 2  # noqa: PLR2004
+    assert stats["bytes"] > 2 * 4000
+    assert cache.clear() == 2  # noqa: PLR2004
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,116 @@
+"""
+This module contains automated tests for the codec registry from the `codecs.py`
+module.
+
+Included tests:
+- `test_matches_struct_decoding`: Verifies that the vectorized decoder returns the
+    same values as decoding every sample with `struct.unpack`.
+- `test_factor_is_applied`: Verifies that the scale factor is applied to the samples.
+- `test_writes_into_output_array`: Verifies that a caller-supplied array is filled.
+- `test_output_shape_mismatch`: Ensures that a `ValueError` is raised when the
+    output array has the wrong shape.
+- `test_odd_trailing_byte`: Verifies that a trailing odd byte is ignored.
+- `test_round_trip_all_formats`: Verifies that every registered codec decodes what
+    it encodes.
+- `test_chunked_decoding`: Verifies that samples split across base64 and inflate
+    chunks are decoded correctly.
+- `test_string_pieces`: Verifies that a payload streamed in string pieces split
+    inside base64 groups is decoded.
+- `test_partial_sample_in_stream`: Ensures that a `ValueError` is raised when a
+    streamed payload ends with a partial sample.
+- `test_unknown_format`: Ensures that a `ValueError` is raised for unknown formats.
+"""
+from base64 import b64encode
+from struct import pack, unpack
+from zlib import compress
+
+import numpy as np
+import pytest
+
+from t8_client.functions import codecs
+from t8_client.functions.codecs import CODECS, get_codec, zint_to_float
+
+# Samples covering the whole int16 range
+SAMPLES = [0, 1, -1, 1234, -1234, 32767, -32768]
+
+def encode(payload: bytes) -> str:
+    """Encodes raw bytes as a zint payload."""
+    return b64encode(compress(payload)).decode()
+
+def test_matches_struct_decoding() -> None:
+    """Test that the decoder agrees with per-sample struct decoding."""
+    payload = pack(f"<{len(SAMPLES)}h", *SAMPLES)
+    expected = [unpack("<h", payload[i : i + 2])[0] for i in range(0, len(payload), 2)]
+    result = zint_to_float(encode(payload))
+    assert result.dtype == np.float32
+    assert result.tolist() == expected
+
+def test_factor_is_applied() -> None:
+    """Test that the scale factor is applied to every sample."""
+    payload = pack(f"<{len(SAMPLES)}h", *SAMPLES)
+    result = zint_to_float(encode(payload), factor=0.5)
+    assert np.allclose(result, np.array(SAMPLES, dtype="f") * 0.5)
+
+def test_writes_into_output_array() -> None:
+    """Test that the result is written into a caller-supplied array."""
+    payload = pack(f"<{len(SAMPLES)}h", *SAMPLES)
+    out = np.zeros(len(SAMPLES), dtype="f")
+    result = zint_to_float(encode(payload), factor=2.0, out=out)
+    assert result is out
+    assert out.tolist() == [2.0 * s for s in SAMPLES]
+
+def test_output_shape_mismatch() -> None:
+    """Test that an output array of the wrong size is rejected."""
+    payload = pack(f"<{len(SAMPLES)}h", *SAMPLES)
+    try:
+        zint_to_float(encode(payload), out=np.zeros(3, dtype="f"))
+        raise AssertionError("Expected a ValueError exception")
+    except ValueError:
+        pass  # This error was expected
+
+def test_odd_trailing_byte() -> None:
+    """Test that a trailing odd byte is ignored, as in the original decoder."""
+    payload = pack("<2h", 7, -7) + b"\x01"
+    assert zint_to_float(encode(payload)).tolist() == [7.0, -7.0]
+
+def test_round_trip_all_formats() -> None:
+    """Test that every registered codec decodes the samples it encodes."""
+    values = np.arange(-500, 500, dtype="f")
+    for name, codec in CODECS.items():
+        result = codec.decode(codec.encode(values), factor=0.25)
+        assert result.tolist() == (values * 0.25).tolist(), name
+
+def test_chunked_decoding(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test decoding with chunks that split samples across boundaries."""
+    # Tiny chunks force many boundaries inside base64 groups and samples
+    monkeypatch.setattr(codecs, "B64_CHUNK_SIZE", 8)
+    monkeypatch.setattr(codecs, "INFLATE_CHUNK_SIZE", 3)
+    values = np.random.default_rng(0).integers(-30000, 30000, 5000)
+    for name in ("zint", "int", "zfloat", "float"):
+        codec = get_codec(name)
+        assert codec.decode(codec.encode(values)).tolist() == values.tolist(), name
+
+def test_string_pieces() -> None:
+    """Test streaming a payload in string pieces of 3 characters."""
+    codec = get_codec("zint")
+    payload = codec.encode(np.array(SAMPLES))
+    pieces = [payload[i : i + 3] for i in range(0, len(payload), 3)]
+    samples = np.concatenate(list(codec.iter_samples(pieces)))
+    assert samples.tolist() == SAMPLES
+
+def test_partial_sample_in_stream() -> None:
+    """Test that a streamed payload ending with a partial sample is rejected."""
+    payload = encode(pack("<2h", 7, -7) + b"\x01")
+    try:
+        list(get_codec("zint").iter_samples([payload]))
+        raise AssertionError("Expected a ValueError exception")
+    except ValueError:
+        pass  # This error was expected
+
+def test_unknown_format() -> None:
+    """Test that an unknown array format is rejected."""
+    try:
+        get_codec("zdouble")
+        raise AssertionError("Expected a ValueError exception")
+    except ValueError:
+        pass  # This error was expected
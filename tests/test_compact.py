@@ -0,0 +1,111 @@
+"""
+This module contains automated tests for the compact record storage of the
+`compact.py` module.
+
+Included tests:
+- `test_round_trip`: Verifies that a zint record is stored as int16 with every
+    installed codec and read back bit for bit, scaling it only on first use.
+- `test_float_fallback`: Verifies that samples that are not multiples of the
+    factor are stored as float32 without losing precision.
+- `test_t8c_export`: Verifies that `export_record` and `load_export` handle the
+    `t8c` format, which is smaller than `.npy`.
+- `test_invalid_files`: Ensures that a `ValueError` is raised for unknown
+    codecs and for files that are not compact records.
+- `test_damaged_files`: Ensures that a `ValueError` is raised for truncated
+    files and for corrupted bodies with every installed codec.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+
+from t8_client.functions.client import SPECTRA, WAVES
+from t8_client.functions.codecs import get_codec
+from t8_client.functions.compact import CODECS, read_compact, write_compact
+from t8_client.functions.export import export_record, load_export, record_metadata
+from t8_client.functions.records import Record, parse_record
+
+# Samples of a zint wave, spanning the whole int16 range
+SAMPLES = np.concatenate(
+    [np.arange(-32768, 32768, 7), np.rint(np.sin(np.arange(5000) / 9) * 30000)]
+)
+
+
+def zint_record(kind: str = WAVES, factor: float = 0.0123) -> Record:
+    """Decodes a zint record holding `SAMPLES`."""
+    document = {"factor": factor, "data": get_codec("zint").encode(SAMPLES)}
+    if kind == WAVES:
+        document["sample_rate"] = 2560
+    else:
+        document.update(min_freq=10, max_freq=1000)
+    return parse_record(kind, "M", "P", "AM1", 42, json.dumps(document).encode())
+
+def test_round_trip(tmp_path: Path) -> None:
+    """Test that records are stored as int16 and read back exactly."""
+    for kind in (WAVES, SPECTRA):
+        record = zint_record(kind)
+        for codec in CODECS:
+            path = str(tmp_path / f"{kind}.{codec}.t8c")
+            write_compact(record, path, codec)
+            compact = read_compact(path)
+            assert compact.raw.dtype == np.dtype("<i2")
+            assert compact.raw.tolist() == SAMPLES.tolist()
+            assert "values" not in vars(compact)
+            assert compact.values.tobytes() == record.values.tobytes()
+            loaded = compact.to_record()
+            assert record_metadata(loaded) == record_metadata(record)
+
+def test_float_fallback(tmp_path: Path) -> None:
+    """Test that non integral samples are stored as float32."""
+    values = np.random.default_rng(0).normal(size=10000).astype("f")
+    for factor in (0.5, 0.0):
+        record = Record(WAVES, "M", "P", "AM1", 42, values, factor, 2560.0)
+        write_compact(record, str(tmp_path / "float.t8c"))
+        compact = read_compact(str(tmp_path / "float.t8c"))
+        assert compact.raw.dtype == np.dtype("<f4")
+        assert compact.values.tobytes() == values.tobytes()
+
+def test_t8c_export(tmp_path: Path) -> None:
+    """Test that records are exported to and loaded from the t8c format."""
+    record = zint_record()
+    path = export_record(record, str(tmp_path), "t8c")
+    assert path.endswith(".t8c")
+    values, metadata = load_export(path)
+    assert values.tobytes() == record.values.tobytes()
+    assert metadata == record_metadata(record)
+    npy = export_record(record, str(tmp_path), "npy")
+    assert Path(path).stat().st_size < Path(npy).stat().st_size
+
+def test_invalid_files(tmp_path: Path) -> None:
+    """Test that unknown codecs and foreign files are rejected."""
+    npy = export_record(zint_record(), str(tmp_path), "npy")
+    calls = (
+        lambda: write_compact(zint_record(), str(tmp_path / "x.t8c"), "brotli"),
+        lambda: read_compact(npy),
+    )
+    for call in calls:
+        try:
+            call()
+            raise AssertionError("Expected a ValueError exception")
+        except ValueError:
+            pass  # This error was expected
+
+def test_damaged_files(tmp_path: Path) -> None:
+    """Test that truncated and corrupted files are rejected."""
+    for codec in CODECS:
+        path = tmp_path / f"{codec}.t8c"
+        write_compact(zint_record(), str(path), codec)
+        content = path.read_bytes()
+        header_end = 8 + int.from_bytes(content[4:8], "little")
+        damaged = (
+            content[:6],  # Inside the header length
+            content[:header_end - 10],  # Inside the header
+            content[:header_end] + b"\xff" * 64,  # Corrupted body
+        )
+        for data in damaged:
+            path.write_bytes(data)
+            try:
+                read_compact(str(path))
+                raise AssertionError("Expected a ValueError exception")
+            except ValueError:
+                pass  # This error was expected
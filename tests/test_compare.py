@@ -0,0 +1,153 @@
+"""
+This module contains automated tests for the spectral comparison of the
+`compare.py` module and the `compare-spectra` subcommand.
+
+Included tests:
+- `test_resample_spectra`: Verifies that spectra with other ranges or line
+    counts are interpolated onto the common grid, and those on it are copied.
+- `test_baseline_alarms`: Verifies the band deltas and alarms of a window of
+    spectra against a fixed baseline.
+- `test_previous_alarms`: Verifies that every spectrum is compared with the
+    mean of the spectra before it.
+- `test_compare_subcommand`: Verifies that the subcommand reads the spectra of
+    an archive and prints the report of every measurement point.
+- `test_invalid_comparison`: Ensures that a `ValueError` is raised for an
+    empty window or conflicting references.
+"""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from t8_client.functions import subcommands
+from t8_client.functions.archive import RecordArchive
+from t8_client.functions.client import SPECTRA
+from t8_client.functions.compare import (
+    common_grid,
+    compare_spectra,
+    comparison_report,
+    resample_spectra,
+)
+from t8_client.functions.records import Record
+
+# Lines of the spectra and frequency of their peak
+LINES = 801
+PEAK = 250.0
+# Amplitude of every other line
+FLOOR = 0.001
+
+
+def spectrum(  # noqa: PLR0913, PLR0917
+    timestamp: int,
+    peak: float = 1.0,
+    min_freq: float = 0.0,
+    max_freq: float = 400.0,
+    lines: int = LINES,
+    point: str = "P",
+) -> Record:
+    """Builds a spectrum with a flat floor and a line at `PEAK`."""
+    values = np.full(lines, FLOOR, dtype="f")
+    values[np.isclose(np.linspace(min_freq, max_freq, lines), PEAK)] += peak
+    return Record(
+        SPECTRA,
+        "M",
+        point,
+        "AM1",
+        timestamp,
+        values,
+        1.0,
+        min_freq=min_freq,
+        max_freq=max_freq,
+    )
+
+def test_resample_spectra() -> None:
+    """Test that spectra are interpolated onto the common grid."""
+    reference = spectrum(0)
+    others = [spectrum(1, min_freq=50, max_freq=450, lines=401), spectrum(2)]
+    grid = common_grid(others, reference)
+    assert (grid[0], grid[-1], len(grid)) == (50, 400, 701)
+
+    resampled = resample_spectra([reference, *others], grid)
+    assert resampled.shape == (3, 701)
+    assert np.array_equal(resampled[0], reference.values[100:])
+    assert np.array_equal(resampled[2], reference.values[100:])
+    # Every other line of the 0.5 Hz grid falls between two 1 Hz lines
+    peak = np.flatnonzero(grid == PEAK)[0]
+    assert np.isclose(resampled[1, peak], 1 + FLOOR)
+    assert np.isclose(resampled[1, peak + 1], 0.5 + FLOOR)
+    assert np.isclose(resampled[1, peak + 2], FLOOR)
+
+def test_baseline_alarms() -> None:
+    """Test the band deltas and alarms against a fixed baseline."""
+    peaks = [1.0, 1.0, 1.5, 4.0, 1.0]
+    window = [spectrum(t, peak) for t, peak in enumerate(peaks)]
+    comparison = compare_spectra(
+        window[::-1], [spectrum(100)], bands=[(0, 100), (200, 300)]
+    )
+
+    assert comparison.timestamps.tolist() == [0, 1, 2, 3, 4]
+    assert np.allclose(comparison.deltas[:, 0], 0)
+    # The band power grows with the square of the peak
+    assert np.allclose(comparison.deltas[2:4, 1], 20 * np.log10([1.5, 4]), atol=0.01)
+    assert comparison.alarms[:, 1].tolist() == [False, False, False, True, False]
+    assert not comparison.alarms[:, 0].any()
+
+    alarmed = compare_spectra(window, alarm_db=100, alarm_level=1.0).alarms
+    assert alarmed.any(axis=1).tolist() == [False, False, True, True, False]
+
+    report = comparison_report(comparison)
+    assert "1 of 5 spectra in alarm" in report
+    assert "200-300 Hz (+12.0 dB)" in report
+
+def test_previous_alarms() -> None:
+    """Test that every spectrum is compared with the ones before it."""
+    peaks = [1.0, 1.0, 1.0, 3.0, 3.0, 3.0]
+    window = [spectrum(t, peak) for t, peak in enumerate(peaks)]
+    comparison = compare_spectra(window, previous=2, bands=[(200, 300)])
+
+    deltas = comparison.deltas[:, 0]
+    assert np.isnan(deltas[0])
+    assert np.allclose(deltas[[1, 2, 5]], 0, atol=1e-6)
+    # 9 times the power of the previous two, then 9 / 5 times their mean
+    assert np.allclose(deltas[3:5], 10 * np.log10([9, 9 / 5]), atol=0.01)
+    assert comparison.alarms[:, 0].tolist() == [False] * 3 + [True] + [False] * 2
+
+def test_compare_subcommand(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that the subcommand compares the spectra of an archive."""
+    path = str(tmp_path / "spectra.bin")
+    with RecordArchive(path, "a") as archive:
+        for t in range(20):
+            archive.append(spectrum(t * 60, 1.0 if t < 15 else 5.0))  # noqa: PLR2004
+            archive.append(spectrum(t * 60, point="Q"))
+
+    subcommands.compare_spectra(
+        select=["M:P:AM1", "M:Q:AM1"],
+        baseline="1970-01-01T00:01:00",
+        baseline_to="1970-01-01T00:03:00",
+        archive=path,
+        limit=2,
+    )
+    output = capsys.readouterr().out
+    assert "M:P:AM1\n20 spectra from 1970-01-01T00:00:00" in output
+    assert "5 of 20 spectra in alarm" in output
+    assert "  1970-01-01T00:19:00:" in output
+    assert "... and 3 more" in output
+    assert "M:Q:AM1\n" in output
+    assert "0 of 20 spectra in alarm" in output
+
+def test_invalid_comparison() -> None:
+    """Test that empty windows and conflicting references are rejected."""
+    calls = (
+        lambda: compare_spectra([]),
+        lambda: compare_spectra([spectrum(0)], [spectrum(1)], previous=2),
+        lambda: compare_spectra([spectrum(0)], previous=0),
+        lambda: compare_spectra([spectrum(0), spectrum(1, 1.0, 500.0, 900.0)]),
+    )
+    for call in calls:
+        try:
+            call()
+            raise AssertionError("Expected a ValueError exception")
+        except ValueError:
+            pass  # This error was expected
@@ -0,0 +1,68 @@
+"""
+This module contains automated tests for the export formats of the `export.py`
+module.
+
+Included tests:
+- `test_binary_round_trip`: Verifies that every binary format reads back the same
+    amplitudes and axis metadata, skipping formats whose optional dependency is
+    not installed.
+- `test_axis_metadata`: Verifies that the stored start and step rebuild the axis of
+    waves and spectra.
+- `test_csv_export`: Verifies the header and amplitudes of a CSV export.
+- `test_unknown_format`: Ensures that a `ValueError` is raised for unknown formats.
+"""
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from t8_client.functions.client import SPECTRA, WAVES
+from t8_client.functions.export import export_record, load_export
+from t8_client.functions.records import Record
+
+# Optional dependency of every binary format
+BINARY_FORMATS = {"npy": None, "npz": None, "parquet": "pyarrow", "hdf5": "h5py"}
+
+def make_wave() -> Record:
+    """Builds a small wave record."""
+    return Record(WAVES, "M", "P", "AM1", 10, np.arange(8, dtype="f"), 0.5, 1000.0)
+
+@pytest.mark.parametrize("fmt", sorted(BINARY_FORMATS))
+def test_binary_round_trip(fmt: str, tmp_path: Path) -> None:
+    """Test that binary formats read back amplitudes and metadata."""
+    module = BINARY_FORMATS[fmt]
+    if module and importlib.util.find_spec(module) is None:
+        pytest.skip(f"{module} is not installed")
+    record = make_wave()
+    values, metadata = load_export(export_record(record, tmp_path, fmt))
+    assert np.array_equal(values, record.values)
+    assert metadata["units"] == "ms"
+    assert metadata["timestamp"] == record.timestamp
+    assert metadata["step"] == pytest.approx(record.axis_step)
+
+def test_axis_metadata() -> None:
+    """Test that start and step rebuild the axis of waves and spectra."""
+    spectrum = Record(
+        SPECTRA, "M", "P", "AM1", 10, np.ones(5, dtype="f"), 1.0,
+        min_freq=10.0, max_freq=50.0,
+    )
+    for record in (make_wave(), spectrum):
+        n = len(record.values)
+        rebuilt = record.axis_start + record.axis_step * np.arange(n)
+        assert np.allclose(rebuilt, record.axis())
+
+def test_csv_export(tmp_path: Path) -> None:
+    """Test the header and amplitudes of a CSV export."""
+    path = export_record(make_wave(), tmp_path, "csv")
+    assert Path(path).read_text().splitlines()[0] == "Time (ms),Amplitude"
+    values, _ = load_export(path)
+    assert values.tolist() == list(range(8))
+
+def test_unknown_format(tmp_path: Path) -> None:
+    """Test that an unknown export format is rejected."""
+    try:
+        export_record(make_wave(), tmp_path, "xlsx")
+        raise AssertionError("Expected a ValueError exception")
+    except ValueError:
+        pass  # This error was expected
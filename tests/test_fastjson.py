@@ -0,0 +1,85 @@
+"""
+This module contains automated tests for the JSON backends of the `fastjson.py`
+module.
+
+Included tests:
+- `test_listing_backends_agree`: Verifies that every installed backend extracts
+    the same timestamps from a listing body.
+- `test_record_backends_agree`: Verifies that every installed backend decodes a
+    wave and a spectrum body to the same record.
+- `test_escaped_payload`: Verifies that a payload written with escaped slashes
+    is decoded correctly, from bytes and from a memoryview.
+- `test_unknown_backend`: Ensures that a `ValueError` is raised for unknown
+    backends.
+"""
+import json
+
+import numpy as np
+import pytest
+
+from t8_client.functions import fastjson
+from t8_client.functions.client import parse_listing
+from t8_client.functions.codecs import get_codec
+from t8_client.functions.records import parse_record
+
+# Listing with items lacking links, a zero timestamp and unknown fields
+LISTING = {
+    "_items": [
+        {"_links": {"self": "http://t8/rest/waves/M/P/AM1/0"}},
+        {"_links": {"self": "http://t8/rest/waves/M/P/AM1/100/"}, "extra": [1]},
+        {"_links": {}},
+        {},
+        {"_links": {"self": "http://t8/rest/waves/M/P/AM1/200"}},
+    ],
+    "_links": {"self": "http://t8/rest/waves/M/P/AM1"},
+}
+
+def test_listing_backends_agree() -> None:
+    """Test that every backend extracts the same listing timestamps."""
+    body = json.dumps(LISTING).encode()
+    for backend in fastjson.BACKENDS:
+        links = fastjson.listing_links(body, backend)
+        assert [link.rstrip("/").rpartition("/")[2] for link in links] == [
+            "0",
+            "100",
+            "200",
+        ], backend
+    assert parse_listing(body) == parse_listing(LISTING) == [100, 200]
+    assert parse_listing(body, since=100) == [200]
+
+def test_record_backends_agree(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that every backend decodes records to the same values."""
+    values = np.arange(-1000, 1000)
+    documents = {
+        "waves": {"sample_rate": 2560, "factor": 0.5, "other": {"a": None}},
+        "spectra": {"min_freq": 0, "max_freq": 1000, "factor": 0.25},
+    }
+    for kind, document in documents.items():
+        body = json.dumps({**document, "data": get_codec("zint").encode(values)})
+        results = []
+        for backend in fastjson.BACKENDS:
+            monkeypatch.setattr(fastjson, "BACKEND", backend)
+            results.append(parse_record(kind, "M", "P", "AM1", 1, body.encode()))
+        for record in results:
+            assert record.values.tolist() == (values * document["factor"]).tolist()
+            assert record.axis_stop == results[0].axis_stop
+
+def test_escaped_payload() -> None:
+    """Test that escaped characters in the payload are unescaped."""
+    values = np.arange(20000) % 700
+    data = get_codec("int").encode(values)
+    assert "/" in data
+    body = json.dumps({"factor": 1, "data": data}).replace("/", "\\/").encode()
+    for backend in fastjson.BACKENDS:
+        for source in (body, memoryview(body)):
+            document = fastjson.record_document(source, backend)
+            decoded = get_codec("int").decode(document["data"])
+            assert decoded.tolist() == values.tolist(), backend
+
+def test_unknown_backend() -> None:
+    """Test that an unknown backend is rejected."""
+    try:
+        fastjson.loads(b"{}", "simdjson")
+        raise AssertionError("Expected a ValueError exception")
+    except ValueError:
+        pass  # This error was expected
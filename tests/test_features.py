@@ -0,0 +1,88 @@
+"""
+This module contains automated tests for the condition indicators of the
+`features.py` module.
+
+Included tests:
+- `test_sine_features`: Verifies the indicators of a sine wave against their
+    analytical values.
+- `test_spectrum_features`: Verifies that spectra get their overall and band
+    RMS, and no waveform indicators.
+- `test_parse_band`: Verifies that bands are parsed and invalid ones rejected.
+- `test_feature_writer`: Verifies that records added one by one are written as
+    one CSV row each, in batches computed without holding the lock.
+"""
+import csv
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from t8_client.functions import features
+from t8_client.functions.client import WAVES
+from t8_client.functions.features import FeatureWriter, extract_features, parse_band
+from t8_client.functions.records import Record
+from t8_client.functions.spectrum import compute_spectra
+
+SAMPLE_RATE = 1000.0
+
+def sine_record(timestamp: int, amplitude: float = 2.0) -> Record:
+    """Builds a wave record holding a 125 Hz sine."""
+    time = np.arange(4096) / SAMPLE_RATE
+    values = amplitude * np.sin(2 * np.pi * 125 * time)
+    return Record(
+        WAVES, "M", "P", "AM1", timestamp, values.astype("f"), 1.0, SAMPLE_RATE
+    )
+
+def test_sine_features() -> None:
+    """Test the indicators of a sine against their analytical values."""
+    [row] = extract_features([sine_record(1)], [(100, 150), (200, 400)])
+
+    assert np.isclose(row["rms"], 2 / np.sqrt(2), rtol=1e-3)
+    assert np.isclose(row["peak"], 2.0, rtol=1e-3)
+    assert np.isclose(row["peak_to_peak"], 4.0, rtol=1e-3)
+    assert np.isclose(row["crest"], np.sqrt(2), rtol=1e-3)
+    assert np.isclose(row["kurtosis"], 1.5, rtol=1e-3)
+    assert np.isclose(row["band_100_150"], row["rms"], rtol=1e-3)
+    assert row["band_200_400"] < 1e-3  # noqa: PLR2004
+
+def test_spectrum_features() -> None:
+    """Test that spectra get their RMS and bands but no waveform indicators."""
+    spectrum = compute_spectra([sine_record(1)], "rect")[0]
+    [row] = extract_features([spectrum], [(100, 150)])
+
+    assert row["kind"] == "spectra"
+    assert np.isclose(row["rms"], 2 / np.sqrt(2), rtol=1e-3)
+    assert np.isclose(row["band_100_150"], row["rms"], rtol=1e-3)
+    assert np.isnan(row["kurtosis"])
+
+def test_parse_band() -> None:
+    """Test that bands are parsed and invalid ones rejected."""
+    assert parse_band("10:1000") == (10.0, 1000.0)
+    for text in ("10", "1000:10", "a:b"):
+        try:
+            parse_band(text)
+            raise AssertionError("Expected a ValueError exception")
+        except ValueError:
+            pass  # This error was expected
+
+def test_feature_writer(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that every added record is written as one CSV row."""
+    path = tmp_path / "features.csv"
+    table = FeatureWriter(str(path), [(100, 150)], batch=2)
+
+    def unlocked(*args: object) -> list[dict]:
+        """Computes the rows, checking that the lock is free."""
+        assert not table.lock.locked()
+        return extract_features(*args)
+
+    monkeypatch.setattr(features, "extract_features", unlocked)
+    with table:
+        for timestamp in (3, 1, 2):
+            table.add(sine_record(timestamp, amplitude=timestamp))
+
+    with open(path, encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert [row["timestamp"] for row in rows] == ["1", "3", "2"]
+    assert np.isclose(float(rows[1]["peak"]), 3.0, rtol=1e-3)
+    assert rows[0]["band_100_150"]
+    assert table.rows == 3  # noqa: PLR2004
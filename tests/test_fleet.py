@@ -0,0 +1,101 @@
+"""
+This module contains automated tests for the fleet polling of the `fleet.py`
+module and the request accounting of the `client.py` module.
+
+Included tests:
+- `test_load_fleet`: Verifies that defaults, passwords from the environment and
+    selections are read from a fleet file.
+- `test_host_without_url`: Ensures that a `ValueError` is raised for a host
+    without a URL.
+- `test_request_stats`: Verifies the request, error and latency counters.
+- `test_rate_limit`: Verifies that a client spaces its requests according to
+    its rate limit.
+- `test_fleet_report`: Verifies that the report has one row per unit and lists
+    its failures.
+"""
+import time
+from pathlib import Path
+
+import pytest
+
+from t8_client.functions.bulk import BulkResult
+from t8_client.functions.client import RequestStats, T8Client
+from t8_client.functions.fleet import HostResult, fleet_report, load_fleet
+
+# Fleet file with two units sharing defaults
+FLEET = """
+[defaults]
+user = "admin"
+password_env = "FLEET_PASSWORD"
+rate = 5.0
+
+[[hosts]]
+name = "turbine-1"
+url = "http://t8-1.test"
+select = ["M:P:AM1", "M:Q:AM1"]
+
+[[hosts]]
+name = "turbine-2"
+url = "http://t8-2.test"
+password = "secret"
+concurrency = 2
+"""
+
+def test_load_fleet(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a fleet file is read with its defaults."""
+    monkeypatch.setenv("FLEET_PASSWORD", "from-env")
+    path = tmp_path / "fleet.toml"
+    path.write_text(FLEET)
+
+    first, second = load_fleet(path)
+    assert (first.name, first.user) == ("turbine-1", "admin")
+    assert first.password == "from-env"
+    assert first.selections == [("M", "P", "AM1"), ("M", "Q", "AM1")]
+    assert (second.password, second.rate, second.concurrency) == ("secret", 5.0, 2)
+
+def test_host_without_url(tmp_path: Path) -> None:
+    """Test that a host without a URL is rejected."""
+    path = tmp_path / "fleet.toml"
+    path.write_text('[[hosts]]\nname = "turbine-1"\n')
+    try:
+        load_fleet(path)
+        raise AssertionError("Expected a ValueError exception")
+    except ValueError:
+        pass  # This error was expected
+
+def test_request_stats() -> None:
+    """Test the request, error and latency counters."""
+    stats = RequestStats()
+    for latency in (0.01, 0.02, 0.03, 0.04):
+        stats.add(latency)
+    stats.add(0.5, error=True)
+    assert (stats.requests, stats.errors) == (5, 1)
+    assert stats.mean == pytest.approx(0.12)
+    assert stats.percentile(100) == 0.5  # noqa: PLR2004
+    assert RequestStats().percentile(95) == 0.0
+
+def test_rate_limit() -> None:
+    """Test that requests are spaced by the rate limit."""
+    client = T8Client("http://t8.test", "user", "password", rate=50)
+    start = time.monotonic()
+    for _ in range(6):
+        client._throttle()
+    # The first request goes out at once, the other five wait 20 ms each
+    assert time.monotonic() - start >= 0.09  # noqa: PLR2004
+
+def test_fleet_report() -> None:
+    """Test that the report has a row per unit and lists failures."""
+    stats = RequestStats()
+    stats.add(0.25)
+    failed = BulkResult("waves", records=1, failures=[("M:P:AM1@10", "timeout")])
+    idle = BulkResult("waves")
+    report = fleet_report(
+        [
+            HostResult("turbine-1", failed, stats),
+            HostResult("turbine-2", idle, RequestStats()),
+        ]
+    )
+    lines = report.splitlines()
+    assert len(lines) == 4  # noqa: PLR2004
+    assert lines[1].split()[:5] == ["turbine-1", "1", "1", "1", "0"]
+    assert lines[3] == "Failed turbine-1 M:P:AM1@10: timeout"
@@ -0,0 +1,67 @@
+"""
+This module contains automated tests for the listing index of the `index.py`
+module.
+
+The tests use an in-memory database and an in-memory client.
+
+Included tests:
+- `test_incremental_sync`: Verifies that only records newer than the last indexed
+    one are requested and added.
+- `test_range_queries`: Verifies the `start`, `end` and `last` filters.
+- `test_points_are_separate`: Verifies that every measurement point and host has
+    its own timestamps.
+"""
+from t8_client.functions.client import SPECTRA, WAVES
+from t8_client.functions.index import ListingIndex
+
+
+class FakeClient:
+    """Client listing a growing set of timestamps from memory."""
+
+    host = "http://t8.test"
+
+    def __init__(self, timestamps: list[int]) -> None:
+        self.timestamps = timestamps
+        self.requests = []
+
+    def list_timestamps(
+        self,
+        _kind: str,
+        _machine: str,
+        _point: str,
+        _pmode: str,
+        _array_fmt: str,
+        since: int | None = None,
+    ) -> list[int]:
+        """Lists the timestamps newer than `since`."""
+        self.requests.append(since)
+        return [t for t in self.timestamps if since is None or t > since]
+
+def test_incremental_sync() -> None:
+    """Test that synchronising only requests and adds new records."""
+    index = ListingIndex(":memory:")
+    client = FakeClient([10, 20, 30])
+    assert index.sync(client, WAVES, "M", "P", "AM1") == 3  # noqa: PLR2004
+    client.timestamps.append(40)
+    assert index.sync(client, WAVES, "M", "P", "AM1") == 1
+    assert client.requests == [None, 30]
+    assert index.query(client.host, WAVES, "M", "P", "AM1") == [10, 20, 30, 40]
+
+def test_range_queries() -> None:
+    """Test the range and count filters of the queries."""
+    index = ListingIndex(":memory:")
+    index.add("h", WAVES, "M", "P", "AM1", [50, 10, 40, 20, 30])
+    assert index.query("h", WAVES, "M", "P", "AM1", start=20, end=40) == [20, 30, 40]
+    assert index.query("h", WAVES, "M", "P", "AM1", last=2) == [40, 50]
+    assert index.query("h", WAVES, "M", "P", "AM1", end=35, last=2) == [20, 30]
+
+def test_points_are_separate() -> None:
+    """Test that points, kinds and hosts do not share timestamps."""
+    index = ListingIndex(":memory:")
+    index.add("h", WAVES, "M", "P", "AM1", [10])
+    index.add("h", SPECTRA, "M", "P", "AM1", [20])
+    index.add("h2", WAVES, "M", "P", "AM1", [30])
+    index.add("h", WAVES, "M", "Q", "AM1", [40])
+    assert index.query("h", WAVES, "M", "P", "AM1") == [10]
+    assert index.last_timestamp("h", SPECTRA, "M", "P", "AM1") == 20  # noqa: PLR2004
+    assert index.last_timestamp("h", SPECTRA, "M", "Q", "AM1") is None
@@ -0,0 +1,134 @@
+"""
+This module contains automated tests for the command-line interface of the
+`main.py` module.
+
+Included tests:
+- `test_help_imports`: Verifies that `--help` does not import NumPy, requests or
+    matplotlib.
+- `test_listing_imports`: Verifies that the subcommands module does not import
+    NumPy or matplotlib until a subcommand needs them.
+- `test_cli_defaults`: Verifies that the defaults of the parser match those of
+    the subcommands and of the underlying modules.
+- `test_invalid_format`: Ensures that an unknown array format is reported as a
+    usage error.
+- `test_invalid_options`: Ensures that invalid bands, sizes and counts are
+    reported as usage errors before the subcommand runs, and that a listing
+    accepts a count of records in `--last`.
+- `test_runtime_error`: Verifies that an error raised while a subcommand runs
+    is printed as an error, not as a usage error.
+"""
+import json
+import subprocess
+import sys
+
+import pytest
+
+from t8_client import main as cli
+from t8_client.functions import subcommands
+from t8_client.functions.bulk import DEFAULT_WORKERS
+from t8_client.functions.codecs import CODECS
+from t8_client.functions.export import DEFAULT_EXPORT_FORMAT
+from t8_client.functions.spectrum import DEFAULT_OVERLAP, DEFAULT_WINDOW, WINDOWS
+from t8_client.functions.watch import DEFAULT_INTERVAL, DEFAULT_MAX_INTERVAL
+
+# Dependencies that are slow to import
+HEAVY_MODULES = ("numpy", "requests", "matplotlib")
+
+def loaded_modules(code: str) -> list[str]:
+    """Runs code in a fresh interpreter and returns the heavy modules it loaded."""
+    check = f"print(json.dumps([m for m in {HEAVY_MODULES} if m in sys.modules]))"
+    result = subprocess.run(
+        [sys.executable, "-c", f"import json, sys\n{code}\n{check}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": ":".join(sys.path)},
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+def test_help_imports() -> None:
+    """Test that printing the help loads no heavy dependency."""
+    code = (
+        "import t8_client.main as cli\n"
+        "sys.argv = ['t8-client', '--help']\n"
+        "try:\n    cli.main()\nexcept SystemExit:\n    pass"
+    )
+    assert loaded_modules(code) == []
+
+def test_listing_imports() -> None:
+    """Test that the subcommands module defers NumPy and matplotlib."""
+    assert loaded_modules("import t8_client.functions.subcommands") == ["requests"]
+
+def test_cli_defaults() -> None:
+    """Test that the defaults of the parser match the rest of the client."""
+    assert cli.FORMAT == subcommands.FORMAT
+    assert cli.FORMAT in CODECS
+    assert cli.OUTPUT_FORMAT == subcommands.OUTPUT_FORMAT == DEFAULT_EXPORT_FORMAT
+    assert cli.WORKERS == subcommands.WORKERS == DEFAULT_WORKERS
+    assert cli.WINDOW == subcommands.WINDOW == DEFAULT_WINDOW
+    assert cli.OVERLAP == subcommands.OVERLAP == DEFAULT_OVERLAP
+    assert cli.WINDOW in WINDOWS
+    assert cli.WATCH_INTERVAL == subcommands.WATCH_INTERVAL == DEFAULT_INTERVAL
+    assert (
+        cli.WATCH_MAX_INTERVAL == subcommands.WATCH_MAX_INTERVAL == DEFAULT_MAX_INTERVAL
+    )
+
+def test_invalid_format(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that an unknown array format exits with a usage error."""
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["t8-client", "get-wave", "-M", "M", "-p", "P", "-m", "AM1",
+         "-t", "2019-04-11T16:25:54", "-f", "bogus"],
+    )
+    try:
+        cli.main()
+        raise AssertionError("Expected a SystemExit exception")
+    except SystemExit as e:
+        assert e.code == 2  # noqa: PLR2004
+
+def test_invalid_options(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that invalid option values exit with a usage error."""
+    monkeypatch.setattr(subcommands, "extract_features", lambda **_: None)
+    monkeypatch.setattr(subcommands, "get_wave", lambda **_: None)
+    invocations = (
+        ["extract-features", "-s", "M:P:AM1", "-b", "100:10"],
+        ["extract-features", "-s", "M:P:AM1", "-w", "0"],
+        ["extract-features", "-s", "M:P", "--last", "6h"],
+        ["get-wave", "-M", "M", "-p", "P", "-m", "AM1", "-t", "2019-04-11T16:25:54",
+         "--max-memory", "64X"],
+    )
+    for arguments in invocations:
+        monkeypatch.setattr(sys, "argv", ["t8-client", *arguments])
+        try:
+            cli.main()
+            raise AssertionError("Expected a SystemExit exception")
+        except SystemExit as e:
+            assert e.code == 2  # noqa: PLR2004
+
+    # A bare number is a count of records for the listings
+    monkeypatch.setattr(subcommands, "list_waves", lambda **_: None)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["t8-client", "list-waves", "-M", "M", "-p", "P", "-m", "AM1", "-n", "3"],
+    )
+    cli.main()
+
+def test_runtime_error(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that errors of a running subcommand are not usage errors."""
+
+    def broken() -> None:
+        raise ValueError("Invalid record body")
+
+    monkeypatch.setattr(subcommands, "cache_stats", broken)
+    monkeypatch.setattr(sys, "argv", ["t8-client", "cache", "stats"])
+    try:
+        cli.main()
+        raise AssertionError("Expected a SystemExit exception")
+    except SystemExit as e:
+        assert e.code == 1
+    error = capsys.readouterr().err
+    assert error == "Error: Invalid record body\n"
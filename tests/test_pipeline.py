@@ -0,0 +1,152 @@
+"""
+This module contains automated tests for the process stage of the
+`pipeline.py` module.
+
+Included tests:
+- `test_stage_returns_records`: Verifies that a body decoded on a worker process
+    comes back as the same record, backed by shared memory that is released
+    with it, and is stored in the cache.
+- `test_stage_exports`: Verifies that a stage with an export destination writes
+    the same file as `export_record` and hands nothing back.
+- `test_submit_runs_ahead`: Verifies that bodies are handed to the stage
+    without waiting for them to be decoded, up to the queue depth.
+- `test_bulk_with_stage`: Verifies that a bulk download decodes through the
+    stage, reports its failures, hands over the records and stores them in a
+    cache that lists its directory once.
+- `test_invalid_stage`: Ensures that a `ValueError` is raised for an empty pool
+    or queue.
+"""
+import json
+import weakref
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from t8_client.functions.bulk import fetch_timestamps
+from t8_client.functions.cache import RecordCache
+from t8_client.functions.client import SPECTRA, WAVES
+from t8_client.functions.codecs import get_codec
+from t8_client.functions.export import export_record
+from t8_client.functions.pipeline import ProcessStage, SharedSamples
+from t8_client.functions.records import parse_record
+
+# Bodies of a wave and a spectrum
+BODIES = {
+    WAVES: json.dumps(
+        {
+            "sample_rate": 2560,
+            "factor": 0.5,
+            "data": get_codec("zint").encode(np.arange(-5000, 5000) % 777),
+        }
+    ).encode(),
+    SPECTRA: json.dumps(
+        {
+            "min_freq": 10,
+            "max_freq": 1000,
+            "factor": 0.25,
+            "data": get_codec("zint").encode(np.arange(800)),
+        }
+    ).encode(),
+}
+
+
+class FakeResponse:
+    """Response holding a canned body."""
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+class FakeClient:
+    """Client answering every record with the same wave."""
+
+    host = "http://t8.test"
+
+    def url(self, *parts: object) -> str:
+        """Builds a URL from its parts."""
+        return "/".join(str(part) for part in parts)
+
+    def get(self, url: str, **_params: object) -> FakeResponse:
+        """Returns the wave, or a broken body for timestamp 0."""
+        if url.endswith("/0"):
+            return FakeResponse(b"<html>Bad gateway</html>")
+        return FakeResponse(BODIES[WAVES])
+
+def test_stage_returns_records(tmp_path: Path) -> None:
+    """Test that records decoded on a worker come back unchanged."""
+    cache = RecordCache(str(tmp_path))
+    with ProcessStage(1) as stage:
+        for kind, body in BODIES.items():
+            expected = parse_record(kind, "M", "P", "AM1", 5, body)
+            record = stage.run(kind, "M", "P", "AM1", 5, body, "zint", cache, kind)
+            assert record.values.tolist() == expected.values.tolist()
+            assert (record.kind, record.timestamp) == (kind, 5)
+            assert (record.axis_start, record.axis_stop) == (
+                expected.axis_start,
+                expected.axis_stop,
+            )
+            assert cache.get(kind).values.tolist() == expected.values.tolist()
+            assert isinstance(record.values.base, SharedSamples)
+            samples = weakref.ref(record.values.base)
+            del record
+            assert samples() is None
+
+def test_stage_exports(tmp_path: Path) -> None:
+    """Test that a stage with a destination writes the record files."""
+    loaded = tmp_path / "loaded"
+    loaded.mkdir()
+    expected = export_record(
+        parse_record(WAVES, "M", "P", "AM1", 5, BODIES[WAVES]), str(loaded), "csv"
+    )
+    with ProcessStage(2, export=(str(tmp_path / "out"), "csv")) as stage:
+        assert stage.run(WAVES, "M", "P", "AM1", 5, BODIES[WAVES]) is None
+    written = tmp_path / "out" / Path(expected).name
+    assert written.read_text() == Path(expected).read_text()
+
+def test_submit_runs_ahead() -> None:
+    """Test that submitting a body does not wait for its decoding."""
+    expected = parse_record(WAVES, "M", "P", "AM1", 5, BODIES[WAVES])
+    with ProcessStage(1, queue_depth=4) as stage:
+        futures = [
+            stage.submit(WAVES, "M", "P", "AM1", t, BODIES[WAVES]) for t in range(4)
+        ]
+        # The worker process is still starting up
+        assert not futures[-1].done()
+        records = [future.result() for future in futures]
+    assert [record.timestamp for record in records] == [0, 1, 2, 3]
+    assert records[3].values.tolist() == expected.values.tolist()
+
+def test_bulk_with_stage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a bulk download decodes its records on the stage."""
+    scans = []
+    entries = RecordCache._entries
+    monkeypatch.setattr(
+        RecordCache, "_entries", lambda self: scans.append(1) or entries(self)
+    )
+    cache = RecordCache(str(tmp_path))
+    received = []
+    with ProcessStage(2, queue_depth=1) as stage:
+        result = fetch_timestamps(
+            FakeClient(),
+            WAVES,
+            [(("M", "P", "AM1"), timestamp) for timestamp in range(4)],
+            workers=4,
+            cache=cache,
+            on_record=received.append,
+            stage=stage,
+        )
+    assert result.records == 3  # noqa: PLR2004
+    assert [what for what, _ in result.failures] == ["M:P:AM1@0"]
+    assert sorted(record.timestamp for record in received) == [1, 2, 3]
+    assert np.array_equal(received[0].values, (np.arange(-5000, 5000) % 777) * 0.5)
+    assert len(list(tmp_path.glob("*.npy"))) == 3  # noqa: PLR2004
+    assert len(scans) == 1
+
+def test_invalid_stage() -> None:
+    """Test that a stage without processes or queue is rejected."""
+    for options in ({"processes": 0}, {"processes": 1, "queue_depth": 0}):
+        try:
+            ProcessStage(**options)
+            raise AssertionError("Expected a ValueError exception")
+        except ValueError:
+            pass  # This error was expected
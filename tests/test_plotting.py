@@ -0,0 +1,84 @@
+"""
+This module contains automated tests for the decimating plots of the
+`plotting.py` module.
+
+The figures are rendered to files, so no display is needed.
+
+Included tests:
+- `test_minmax_envelope`: Verifies that the envelope keeps the extremes of
+    every bucket of every trace.
+- `test_short_range_unchanged`: Verifies that ranges with few samples are
+    returned unchanged.
+- `test_redecimate_on_zoom`: Verifies that zooming in decimates the line again
+    from the full data.
+- `test_render_files`: Verifies that lines and waterfalls are rendered to image
+    files.
+- `test_waterfall_axis_mismatch`: Ensures that a `ValueError` is raised for
+    records with different axes.
+"""
+import numpy as np
+from matplotlib.figure import Figure
+
+from t8_client.functions.client import SPECTRA, WAVES
+from t8_client.functions.plotting import DecimatedLine, minmax_decimate, plot_records
+from t8_client.functions.records import Record
+
+
+def make_wave(n_samples: int, timestamp: int = 1554999954) -> Record:
+    """Builds a wave record of random samples."""
+    values = np.random.default_rng(timestamp).normal(0, 1, n_samples).astype("f")
+    return Record(WAVES, "M", "P", "AM1", timestamp, values, 1.0, 1000.0)
+
+def test_minmax_envelope() -> None:
+    """Test that the envelope keeps the extremes of every trace."""
+    values = np.random.default_rng(0).normal(0, 1, (3, 100_000))
+    x, y = minmax_decimate(values, 0.0, 1.0, 0.0, 100_000.0, 500)
+
+    assert y.shape == (3, 1000)
+    assert len(x) == 1000  # noqa: PLR2004
+    np.testing.assert_array_equal(y.max(axis=1), values.max(axis=1))
+    np.testing.assert_array_equal(y.min(axis=1), values.min(axis=1))
+
+def test_short_range_unchanged() -> None:
+    """Test that ranges with few samples per bucket are not decimated."""
+    values = np.arange(1000.0)
+    x, y = minmax_decimate(values, 0.0, 0.5, 100.0, 150.0, 500)
+
+    np.testing.assert_array_equal(y, values[199:302])
+    np.testing.assert_array_equal(x, 0.5 * np.arange(199, 302))
+
+def test_redecimate_on_zoom() -> None:
+    """Test that zooming in decimates the line from the full data."""
+    axes = Figure().add_subplot()
+    line = DecimatedLine(axes, make_wave(1_000_000))
+    decimated = len(line.line.get_xdata())
+    assert decimated <= 2 * axes.bbox.width
+
+    axes.set_xlim(0, 10)  # The first 10 ms hold 10 samples
+    assert len(line.line.get_xdata()) < decimated
+    np.testing.assert_array_equal(line.line.get_ydata()[:11], line.values[:11])
+
+def test_render_files(tmp_path: object) -> None:
+    """Test that lines and waterfalls are rendered to image files."""
+    plot_records([make_wave(200_000)], "Wave", str(tmp_path / "wave.png"))
+    spectra = [
+        Record(SPECTRA, "M", "P", "AM1", t, np.ones(800, "f"), min_freq=0, max_freq=1e3)
+        for t in range(300)
+    ]
+    plot_records(spectra, "Spectra", str(tmp_path / "waterfall.svg"), waterfall=True)
+
+    assert (tmp_path / "wave.png").stat().st_size > 0
+    assert (tmp_path / "waterfall.svg").stat().st_size > 0
+
+def test_waterfall_axis_mismatch(tmp_path: object) -> None:
+    """Test that a waterfall rejects records of different axes."""
+    try:
+        plot_records(
+            [make_wave(1000), make_wave(2000)],
+            "Mixed",
+            str(tmp_path / "mixed.png"),
+            waterfall=True,
+        )
+        raise AssertionError("Expected a ValueError exception")
+    except ValueError:
+        pass  # This error was expected
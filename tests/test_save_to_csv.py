@@ -0,0 +1,68 @@
+"""
+This module contains automated tests for the CSV writer of the `save_to_csv.py`
+module.
+
+Included tests:
+- `test_rows_across_chunks`: Verifies the rebuilt X column and the Y values of a
+    file spanning several chunks.
+- `test_gzip_output`: Verifies that a compressed file holds the same rows as an
+    uncompressed one.
+- `test_faster_than_csv_writer`: Verifies that the block formatting stays well
+    ahead of the per-row `csv.writer` loop it replaced.
+"""
+import csv
+import gzip
+import time
+from pathlib import Path
+
+import numpy as np
+
+from t8_client.functions.save_to_csv import CHUNK_ROWS, save_to_csv
+
+
+def test_rows_across_chunks(tmp_path: Path) -> None:
+    """Test the X and Y columns of a file spanning several chunks."""
+    path = tmp_path / "data.csv"
+    y_values = np.random.default_rng(0).normal(size=2 * CHUNK_ROWS + 5).astype("f")
+    save_to_csv(path, y_values, 10.0, 0.25, "Time (ms)", "Amplitude")
+
+    assert path.read_text().splitlines()[0] == "Time (ms),Amplitude"
+    data = np.loadtxt(path, delimiter=",", skiprows=1)
+    assert np.allclose(data[:, 0], 10.0 + 0.25 * np.arange(len(y_values)))
+    assert np.array_equal(data[:, 1].astype("f"), y_values)
+
+def test_gzip_output(tmp_path: Path) -> None:
+    """Test that compressed and uncompressed files hold the same rows."""
+    y_values = np.arange(1000, dtype="f") / 7
+    save_to_csv(tmp_path / "data.csv", y_values, 0.0, 0.5, "X", "Y")
+    save_to_csv(tmp_path / "data.csv.gz", y_values, 0.0, 0.5, "X", "Y", compress=True)
+
+    with gzip.open(tmp_path / "data.csv.gz", "rt", encoding="utf-8") as file:
+        assert file.read() == (tmp_path / "data.csv").read_text()
+
+def test_faster_than_csv_writer(tmp_path: Path) -> None:
+    """Test that block formatting is several times faster than csv.writer."""
+    y_values = np.random.default_rng(0).normal(size=CHUNK_ROWS * 3).astype("f")
+    x_values = np.arange(len(y_values)) * 0.25
+
+    def csv_writer() -> None:
+        """Writes the rows as the original client did, one row at a time."""
+        with open(tmp_path / "old.csv", "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["X", "Y"])
+            writer.writerows(zip(x_values, y_values, strict=True))
+
+    def block_writer() -> None:
+        """Writes the rows in formatted blocks."""
+        save_to_csv(tmp_path / "new.csv", y_values, 0.0, 0.25, "X", "Y")
+
+    def best(write: object) -> float:
+        """Returns the best of three timed runs."""
+        times = []
+        for _ in range(3):
+            start = time.perf_counter()
+            write()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    assert best(csv_writer) > 2.5 * best(block_writer)
@@ -0,0 +1,84 @@
+"""
+This module contains automated tests for the spectrum computation of the
+`spectrum.py` module.
+
+Included tests:
+- `test_sine_amplitude`: Verifies that a sine shows a line at its frequency
+    with its amplitude, with and without segment averaging.
+- `test_batch_matches_single`: Verifies that transforming a batch gives the
+    same spectra as transforming each wave on its own.
+- `test_compute_spectra`: Verifies that spectrum records keep the metadata of
+    their waves and cover 0 Hz to the Nyquist frequency.
+- `test_band_power`: Verifies that the power of a band is the sum of the A² / 2
+    of its lines, edges included, scaled by the noise bandwidth.
+- `test_invalid_options`: Ensures that a `ValueError` is raised for unknown
+    windows and out of range segments.
+"""
+import numpy as np
+
+from t8_client.functions.client import SPECTRA, WAVES
+from t8_client.functions.records import Record
+from t8_client.functions.spectrum import (
+    amplitude_spectra,
+    band_power,
+    compute_spectra,
+)
+
+SAMPLE_RATE = 1000.0
+
+def sine(amplitude: float, frequency: float, n_samples: int = 4096) -> np.ndarray:
+    """Builds a sine sampled at `SAMPLE_RATE`."""
+    time = np.arange(n_samples) / SAMPLE_RATE
+    return amplitude * np.sin(2 * np.pi * frequency * time)
+
+def test_sine_amplitude() -> None:
+    """Test that a sine gives a line of its amplitude at its frequency."""
+    for segment in (None, 1000):
+        frequencies, amplitudes = amplitude_spectra(
+            sine(3.0, 125.0), SAMPLE_RATE, segment=segment
+        )
+        peak = np.argmax(amplitudes[0])
+        assert frequencies[peak] == 125.0  # noqa: PLR2004
+        assert np.isclose(amplitudes[0, peak], 3.0, rtol=1e-3)
+
+def test_batch_matches_single() -> None:
+    """Test that a batch transform matches one transform per wave."""
+    waves = np.stack([sine(1.0, 50.0), sine(2.0, 200.0), sine(0.5, 310.0)])
+    _, batch = amplitude_spectra(waves, SAMPLE_RATE, "hamming", 512, 0.75)
+    for wave, expected in zip(waves, batch, strict=True):
+        _, single = amplitude_spectra(wave, SAMPLE_RATE, "hamming", 512, 0.75)
+        np.testing.assert_allclose(single[0], expected, rtol=1e-5, atol=1e-6)
+
+def test_compute_spectra() -> None:
+    """Test that spectrum records keep the metadata of their waves."""
+    waves = [
+        Record(WAVES, "M", "P", "AM1", 10, sine(1.0, 100.0, 1024), 1.0, SAMPLE_RATE),
+        Record(WAVES, "M", "P", "AM1", 20, sine(1.0, 100.0, 2048), 1.0, SAMPLE_RATE),
+        Record(WAVES, "M", "P", "AM1", 30, sine(1.0, 100.0, 1024), 1.0, SAMPLE_RATE),
+    ]
+    spectra = compute_spectra(waves)
+
+    assert [s.timestamp for s in spectra] == [10, 20, 30]
+    assert all(s.kind == SPECTRA for s in spectra)
+    assert [len(s.values) for s in spectra] == [513, 1025, 513]
+    assert spectra[0].min_freq == 0.0
+    assert spectra[0].max_freq == SAMPLE_RATE / 2
+    assert np.isclose(spectra[0].axis_step, SAMPLE_RATE / 1024)
+
+def test_band_power() -> None:
+    """Test that band powers add up the power of their lines."""
+    frequencies = np.arange(5.0)
+    amplitudes = np.array([[1, 2, 3, 4, 5], [2, 0, 0, 0, 2]], dtype="f")
+    power = band_power(frequencies, amplitudes, [(0, 1), (1, 3), (4, 9)])
+    assert power.tolist() == [[2.5, 14.5, 12.5], [2.0, 0.0, 2.0]]
+    halved = band_power(frequencies, amplitudes, [(0, 4)], bandwidth=2.0)
+    assert halved[:, 0].tolist() == [13.75, 2.0]
+
+def test_invalid_options() -> None:
+    """Test that unknown windows and out of range segments are rejected."""
+    for options in ({"window": "bogus"}, {"segment": 1}, {"segment": 10_000}):
+        try:
+            amplitude_spectra(sine(1.0, 100.0), SAMPLE_RATE, **options)
+            raise AssertionError("Expected a ValueError exception")
+        except ValueError:
+            pass  # This error was expected
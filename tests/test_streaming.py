@@ -0,0 +1,189 @@
+"""
+This module contains automated tests for the bounded memory pipeline of the
+`streaming.py` module.
+
+Included tests:
+- `test_parse_size`: Verifies that memory sizes are parsed and that invalid or
+    too small sizes are rejected.
+- `test_body_splitter`: Verifies that a body fed in pieces of any size yields
+    its payload and its fields, whatever their order and escaping.
+- `test_stream_export_matches`: Verifies that streamed CSV and `.npy` files hold
+    the same values and metadata as those written by `export_record`.
+- `test_memory_bound`: Verifies that a 100M-sample record served locally is
+    decoded with a peak memory below the `max_memory` budget.
+"""
+import json
+import threading
+import tracemalloc
+import zlib
+from base64 import b64encode
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+
+from t8_client.functions.client import SPECTRA, WAVES, T8Client
+from t8_client.functions.codecs import get_codec
+from t8_client.functions.export import export_record, load_export
+from t8_client.functions.records import parse_record
+from t8_client.functions.streaming import (
+    BodySplitter,
+    parse_size,
+    stream_export,
+    stream_record,
+)
+
+# Number of samples of the long record and its memory budget
+LONG_SAMPLES = 100_000_000
+MAX_MEMORY = 16 << 20
+# Samples repeated through the long record
+PATTERN = np.arange(-500, 500, dtype="<i2")
+
+
+class BodyHandler(BaseHTTPRequestHandler):
+    """Answers every request with the body of the server."""
+
+    def do_GET(self) -> None:
+        """Sends the body in pieces, as a slow link would."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.server.body)))
+        self.end_headers()
+        view = memoryview(self.server.body)
+        for start in range(0, len(view), 1 << 16):
+            self.wfile.write(view[start : start + (1 << 16)])
+
+    def log_message(self, *_args: object) -> None:
+        """Keeps the test output quiet."""
+
+@contextmanager
+def serve(body: bytes) -> Iterator[T8Client]:
+    """Serves a body on a local port and yields a client of the server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BodyHandler)
+    server.body = body
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with T8Client(f"http://127.0.0.1:{server.server_port}", "u", "p") as client:
+            yield client
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def long_body() -> bytes:
+    """Builds the body of a zint wave repeating `PATTERN` to `LONG_SAMPLES`."""
+    compressor = zlib.compressobj()
+    block = np.tile(PATTERN, 1000).tobytes()
+    repeats = LONG_SAMPLES // (len(PATTERN) * 1000)
+    data = b"".join(compressor.compress(block) for _ in range(repeats))
+    data += compressor.flush()
+    # The factor follows the samples, so it is unknown while they are decoded
+    return b'{"sample_rate": 51200, "data": "%s", "factor": 0.5}' % b64encode(data)
+
+def test_parse_size() -> None:
+    """Test that memory sizes are parsed and checked."""
+    assert parse_size("64M") == 64 << 20
+    assert parse_size("1.5GiB") == 3 << 29
+    assert parse_size(" 2048kb ") == 2 << 20
+    assert parse_size("4194304") == 4 << 20
+    for text in ("64X", "M", "512K"):
+        try:
+            parse_size(text)
+            raise AssertionError("Expected a ValueError exception")
+        except ValueError:
+            pass  # This error was expected
+
+def test_body_splitter() -> None:
+    """Test that the payload and the fields are split out of any pieces."""
+    data = get_codec("int").encode(np.arange(20000) % 700)
+    assert "/" in data
+    documents = (
+        {"sample_rate": 100.0, "data": data, "factor": 2},
+        {"data": data, "nested": {"data": "x"}},
+        {"factor": 1, "data": data},
+    )
+    for document in documents:
+        body = json.dumps(document).replace("/", "\\/").encode()
+        fields = {key: value for key, value in document.items() if key != "data"}
+        for size in (1, 3, 7, 4096, len(body)):
+            splitter = BodySplitter()
+            payload = b"".join(
+                splitter.feed(body[start : start + size])
+                for start in range(0, len(body), size)
+            )
+            assert payload == data.encode()
+            assert splitter.size == len(data)
+            assert splitter.fields() == fields
+
+    splitter = BodySplitter()
+    splitter.feed(b'{"factor": 1, "data": "AAAA')
+    try:
+        splitter.fields()
+        raise AssertionError("Expected a ValueError exception")
+    except ValueError:
+        pass  # This error was expected
+
+def test_stream_export_matches(tmp_path: Path) -> None:
+    """Test that streamed files match the files of a loaded record."""
+    values = np.arange(-3000, 3000) % 977
+    documents = {
+        WAVES: {"sample_rate": 2560, "data": get_codec("zint").encode(values)},
+        SPECTRA: {
+            "min_freq": 10,
+            "max_freq": 1000,
+            "factor": 0.25,
+            "data": get_codec("zint").encode(values),
+        },
+    }
+    for kind, document in documents.items():
+        body = json.dumps(document).encode()
+        record = parse_record(kind, "M", "P", "AM1", 7, body)
+        loaded_dir = tmp_path / kind
+        loaded_dir.mkdir()
+        with serve(body) as client:
+            for fmt in ("csv", "csv.gz", "npy"):
+                expected = export_record(record, str(loaded_dir), fmt)
+                path = stream_export(
+                    client,
+                    kind,
+                    "M",
+                    "P",
+                    "AM1",
+                    7,
+                    str(tmp_path),
+                    fmt,
+                    max_memory=1 << 20,
+                )
+                assert Path(path).name == Path(expected).name
+                if fmt == "csv":
+                    assert Path(path).read_text() == Path(expected).read_text()
+                streamed, metadata = load_export(path)
+                loaded, expected_metadata = load_export(expected)
+                assert streamed.tolist() == loaded.tolist()
+                assert metadata == expected_metadata
+
+def test_memory_bound() -> None:
+    """Test that a 100M-sample record is decoded within the memory budget."""
+    body = long_body()
+    with serve(body) as client:
+        del body
+        tracemalloc.start()
+        try:
+            record, chunks = stream_record(
+                client, WAVES, "M", "P", "AM1", 1, max_memory=MAX_MEMORY
+            )
+            count = 0
+            total = 0.0
+            for values in chunks:
+                count += len(values)
+                total += float(values.sum(dtype="f8"))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    assert count == len(record.values) == LONG_SAMPLES
+    assert record.factor == 0.5  # noqa: PLR2004
+    assert total == float(PATTERN.sum()) * 0.5 * LONG_SAMPLES / len(PATTERN)
+    assert peak < MAX_MEMORY, f"Peak memory {peak} exceeds {MAX_MEMORY}"
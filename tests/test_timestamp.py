@@ -13,8 +13,28 @@ Included tests:
 - `test_empty_string`: Verifies that an empty string raises a `ValueError`.
 - `test_non_string_input`: Ensures that a `TypeError` is raised if the input is not a
     string.
+- `test_batch_round_trip`: Verifies that arrays of dates and timestamps are converted
+    both ways and agree with `utc_to_timestamp`.
+- `test_batch_invalid_date`: Ensures that a `ValueError` is raised when any date of
+    an array is invalid.
+- `test_format_timestamps`: Verifies that short and long lists are formatted alike.
+- `test_relative_times`: Verifies `now`, relative dates and partial ISO dates.
+- `test_durations`: Verifies durations and rejects invalid ones.
+- `test_ranges`: Verifies time ranges given by dates and by a `last` duration.
 """
-from src.t8_client.functions.timestamp import utc_to_timestamp
+import numpy as np
+import pytest
+
+from src.t8_client.functions import timestamp
+from src.t8_client.functions.timestamp import (
+    format_timestamps,
+    parse_duration,
+    parse_range,
+    parse_time,
+    timestamps_to_utc,
+    utc_to_timestamp,
+    utc_to_timestamps,
+)
 
 # Constants for expected values
 EXPECTED_TIMESTAMP_2023_03_15 = 1678883445
@@ -59,3 +79,79 @@ def test_non_string_input() -> None:
         raise AssertionError("Expected a TypeError exception")
     except TypeError:
         pass  # This error was expected
+
+# Fixed current time of the relative dates (2023-03-15T12:30:45)
+NOW = EXPECTED_TIMESTAMP_2023_03_15
+
+def test_batch_round_trip() -> None:
+    """Test the vectorized conversions in both directions."""
+    dates = ["2023-03-15T12:30:45", "2000-01-01T00:00:00", "2019-04-11T16:25:54"]
+    timestamps = utc_to_timestamps(dates)
+    assert timestamps.dtype == np.int64
+    assert timestamps.tolist() == [utc_to_timestamp(date) for date in dates]
+    assert timestamps_to_utc(timestamps).tolist() == dates
+    # Partial dates start at midnight
+    assert utc_to_timestamps(["2000-01-01"]).tolist() == [EXPECTED_TIMESTAMP_2000_01_01]
+
+def test_batch_invalid_date() -> None:
+    """Test that an invalid date in an array is rejected."""
+    try:
+        utc_to_timestamps(["2023-03-15T12:30:45", "2023/03/15 12:30:45"])
+        raise AssertionError("Expected a ValueError exception")
+    except ValueError:
+        pass  # This error was expected
+
+def test_format_timestamps(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the batch and per-item formatting agree."""
+    timestamps = list(range(NOW, NOW + 86400 * 3, 3600))
+    short = format_timestamps(timestamps)
+    monkeypatch.setattr(timestamp, "BATCH_THRESHOLD", 1)
+    assert format_timestamps(timestamps) == short
+    assert short[0] == "2023-03-15T12:30:45"
+
+def test_relative_times() -> None:
+    """Test relative dates and ISO dates of different precision."""
+    assert parse_time("now", NOW) == NOW
+    assert parse_time("now-6h", NOW) == NOW - 6 * 3600
+    assert parse_time("now+1d12h", NOW) == NOW + 36 * 3600
+    assert parse_time("2023-03-15T12:30:45") == NOW
+    assert parse_time("2023-03-15T12:30") == NOW - 45
+    assert parse_time("2000-01-01") == EXPECTED_TIMESTAMP_2000_01_01
+    assert parse_time("2000-01-01T02:00:00+02:00") == EXPECTED_TIMESTAMP_2000_01_01
+    for text in ("yesterday", "now-6", "2023/03/15"):
+        try:
+            parse_time(text, NOW)
+            raise AssertionError("Expected a ValueError exception")
+        except ValueError:
+            pass  # This error was expected
+
+def test_durations() -> None:
+    """Test the parsing of durations."""
+    assert parse_duration("90m") == 5400  # noqa: PLR2004
+    assert parse_duration("1w") == 604800  # noqa: PLR2004
+    assert parse_duration("1.5h") == 5400  # noqa: PLR2004
+    for text in ("", "6", "6x", "h6"):
+        try:
+            parse_duration(text)
+            raise AssertionError("Expected a ValueError exception")
+        except ValueError:
+            pass  # This error was expected
+
+def test_ranges() -> None:
+    """Test time ranges built from dates and durations."""
+    assert parse_range(now=NOW) == (None, None)
+    assert parse_range("2000-01-01", "now", now=NOW) == (
+        EXPECTED_TIMESTAMP_2000_01_01,
+        NOW,
+    )
+    assert parse_range(last="6h", now=NOW) == (NOW - 6 * 3600, None)
+    assert parse_range(end="now-1d", last="1d", now=NOW) == (
+        NOW - 2 * 86400,
+        NOW - 86400,
+    )
+    for start, end, last in (("now", "2000-01-01", None), ("now-1h", None, "6h")):
+        try:
+            parse_range(start, end, last, NOW)
+            raise AssertionError("Expected a ValueError exception")
+        except ValueError:
+            pass  # This error was expected
@@ -0,0 +1,109 @@
+"""
+This module contains automated tests for the per-phase timings from the
+`timings.py` module.
+
+Included tests:
+- `test_hooks_receive_phases`: Verifies that parsing and decoding a record report
+    the `json`, `base64`, `zlib` and `convert` phases with their bytes.
+- `test_no_hooks_after_exit`: Verifies that a `Timings` collector stops receiving
+    phases once its block ends.
+- `test_timed_bytes`: Verifies that the bytes set inside a `timed` block are
+    reported.
+- `test_formats`: Verifies the table and the OpenMetrics text of the totals.
+- `test_run_instrumented`: Verifies that a run writes its JSON lines, metrics and
+    cProfile statistics.
+"""
+import json
+import pstats
+from pathlib import Path
+
+import numpy as np
+
+from t8_client.functions import timings
+from t8_client.functions.codecs import get_codec
+from t8_client.functions.records import parse_record
+from t8_client.functions.timings import Timings, run_instrumented, timed
+
+
+def make_body(samples: int = 1000) -> bytes:
+    """Builds the JSON body of a zint encoded wave."""
+    values = np.arange(samples) - samples // 2
+    return json.dumps(
+        {"sample_rate": 1000.0, "factor": 1.0, "data": get_codec("zint").encode(values)}
+    ).encode()
+
+def test_hooks_receive_phases() -> None:
+    """Test that parsing a record reports every decoding phase."""
+    body = make_body()
+    with Timings() as collector:
+        parse_record("waves", "M", "P", "AM1", 0, body)
+
+    assert list(collector.totals) == ["json", "base64", "zlib", "convert"]
+    assert collector.totals["json"][2] == len(body)
+    # 1000 int16 samples inflated, converted to 1000 float32 values
+    assert collector.totals["zlib"][2] == 2000  # noqa: PLR2004
+    assert collector.totals["convert"][2] == 4000  # noqa: PLR2004
+    assert all(calls == 1 for calls, _, _ in collector.totals.values())
+
+def test_no_hooks_after_exit() -> None:
+    """Test that a collector is unregistered when its block ends."""
+    with Timings() as collector:
+        pass
+    parse_record("waves", "M", "P", "AM1", 0, make_body())
+    assert collector.totals == {}
+    assert timings.HOOKS == []
+
+def test_timed_bytes() -> None:
+    """Test that bytes set while a phase runs are reported."""
+    with Timings() as collector:
+        with timed("network") as phase:
+            phase.n_bytes = 10
+        with timed("network", 5):
+            pass
+    calls, seconds, n_bytes = collector.totals["network"]
+    assert (calls, n_bytes) == (2, 15)
+    assert seconds >= 0
+
+def test_formats() -> None:
+    """Test the table and OpenMetrics text of the totals."""
+    collector = Timings()
+    collector("network", 0.5, 100)
+    collector("network", 0.25, 50)
+
+    table = collector.table().splitlines()
+    assert table[0].split() == ["phase", "calls", "total", "ms", "mean", "ms", "bytes"]
+    assert table[1].split() == ["network", "2", "750.00", "375.000", "150"]
+
+    text = collector.openmetrics()
+    assert 't8_client_phase_calls_total{phase="network"} 2\n' in text
+    assert 't8_client_phase_seconds_total{phase="network"} 0.75\n' in text
+    assert 't8_client_phase_bytes_total{phase="network"} 150\n' in text
+    assert "# UNIT t8_client_phase_seconds seconds\n" in text
+    assert text.endswith("# EOF\n")
+
+def test_run_instrumented(tmp_path: Path) -> None:
+    """Test that a run writes its events, metrics and profile."""
+    body = make_body()
+
+    def work(count: int) -> None:
+        for i in range(count):
+            parse_record("waves", "M", "P", "AM1", i, body)
+
+    events = tmp_path / "events.jsonl"
+    metrics = tmp_path / "metrics.txt"
+    profile = tmp_path / "run.prof"
+    run_instrumented(
+        work,
+        {"count": 3},
+        timings_jsonl=str(events),
+        metrics=str(metrics),
+        profile=str(profile),
+    )
+
+    lines = [json.loads(line) for line in events.read_text().splitlines()]
+    assert len(lines) == 12  # noqa: PLR2004
+    assert {line["phase"] for line in lines} == {"json", "base64", "zlib", "convert"}
+    assert 't8_client_phase_calls_total{phase="json"} 3' in metrics.read_text()
+    stats = pstats.Stats(str(profile))
+    assert any(name == "parse_record" for _, _, name in stats.stats)
+    assert timings.HOOKS == []
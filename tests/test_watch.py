@@ -0,0 +1,157 @@
+"""
+This module contains automated tests for the continuous watch of the
+`watch.py` module.
+
+The tests use an in-memory client whose records appear between polls, so no T8
+unit is needed.
+
+Included tests:
+- `test_only_new_records`: Verifies that only the records created after the
+    watch starts are emitted, each one once.
+- `test_start_emits_existing`: Verifies that existing records since `start`
+    are emitted by the first poll.
+- `test_adaptive_backoff`: Verifies that the interval grows while nothing is
+    new and returns to the base interval when records appear.
+- `test_unreachable_start`: Verifies that a failing first listing is counted
+    as a failure and retried by the next polls.
+- `test_lag`: Verifies that the lag between the record timestamps and their
+    arrival is measured.
+- `test_bounded_stats`: Verifies that only the latest failures and lags are
+    kept, while the counters, the mean and the maximum cover the whole watch.
+"""
+import json
+
+import pytest
+
+from t8_client.functions import watch
+from t8_client.functions.client import WAVES
+from t8_client.functions.codecs import get_codec
+from t8_client.functions.watch import Watcher
+
+POINT = ("M", "P", "AM1")
+
+class FakeResponse:
+    """Response holding a canned JSON document."""
+
+    def __init__(self, document: dict) -> None:
+        self.content = json.dumps(document).encode()
+
+class FakeClient:
+    """Client answering listings and records from memory."""
+
+    host = "http://t8.test"
+
+    def __init__(self, timestamps: list[int]) -> None:
+        self.timestamps = timestamps
+        self.requests = []
+        self.down = False
+
+    def url(self, *parts: object) -> str:
+        """Builds a URL from its parts."""
+        return "/".join(str(part) for part in parts)
+
+    def list_timestamps(
+        self, _kind: str, *_selection: str, since: int | None = None
+    ) -> list[int]:
+        """Lists the timestamps newer than `since`."""
+        if self.down:
+            raise ConnectionError("Connection refused")
+        return [t for t in self.timestamps if since is None or t > since]
+
+    def get(self, url: str, **_params: object) -> FakeResponse:
+        """Returns a record and remembers its timestamp."""
+        self.requests.append(int(url.rpartition("/")[2]))
+        return FakeResponse(
+            {"sample_rate": 100, "factor": 1, "data": get_codec("zint").encode([1, 2])}
+        )
+
+def test_only_new_records() -> None:
+    """Test that the existing records are skipped and new ones emitted once."""
+    client = FakeClient([100, 200])
+    emitted = []
+    watcher = Watcher(
+        client, WAVES, [POINT], on_record=lambda r: emitted.append(r.timestamp)
+    )
+    assert watcher.poll() == 0
+
+    client.timestamps += [300, 400]
+    assert watcher.poll() == 2  # noqa: PLR2004
+    assert watcher.poll() == 0
+    assert sorted(emitted) == [300, 400]
+    assert sorted(client.requests) == [300, 400]
+
+def test_start_emits_existing() -> None:
+    """Test that a start timestamp emits the existing records since then."""
+    emitted = []
+    watcher = Watcher(
+        FakeClient([100, 200, 300]),
+        WAVES,
+        [POINT],
+        start=200,
+        on_record=lambda r: emitted.append(r.timestamp),
+    )
+    watcher.poll()
+    assert sorted(emitted) == [200, 300]
+
+def test_adaptive_backoff() -> None:
+    """Test that the interval backs off while idle and resets on new records."""
+    client = FakeClient([100])
+    watcher = Watcher(client, WAVES, [POINT], interval=1, max_interval=5)
+    intervals = []
+    for _ in range(4):
+        watcher.poll()
+        intervals.append(watcher.interval)
+    client.timestamps.append(200)
+    watcher.poll()
+    intervals.append(watcher.interval)
+
+    assert intervals == [2, 4, 5, 5, 1]
+    assert watcher.stats.empty_polls == 4  # noqa: PLR2004
+
+def test_unreachable_start() -> None:
+    """Test that a failing first listing is retried by the polls."""
+    client = FakeClient([100])
+    client.down = True
+    watcher = Watcher(client, WAVES, [POINT], interval=1, max_interval=5)
+    assert watcher.poll() == 0
+    assert watcher.interval == 2  # noqa: PLR2004
+    assert [what for what, _ in watcher.stats.failures] == ["listing M:P:AM1"] * 2
+
+    client.down = False
+    assert watcher.poll() == 0
+    client.timestamps.append(200)
+    assert watcher.poll() == 1
+    assert client.requests == [200]
+
+def test_lag() -> None:
+    """Test that the lag is measured from the record timestamp."""
+    client = FakeClient([])
+    watcher = Watcher(client, WAVES, [POINT], clock=lambda: 1000.0)
+    client.timestamps += [990, 995]
+    stats = watcher.run(max_polls=1)
+
+    assert stats.records == 2  # noqa: PLR2004
+    assert sorted(stats.lag.latencies) == [5.0, 10.0]
+    assert "lag mean 7.50 s" in stats.summary()
+
+def test_bounded_stats(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a long watch keeps statistics of a fixed size."""
+    monkeypatch.setattr(watch, "MAX_FAILURES", 3)
+    monkeypatch.setattr(watch, "LAG_WINDOW", 4)
+    client = FakeClient([])
+    client.down = True
+    watcher = Watcher(client, WAVES, [POINT], clock=lambda: 1000.0)
+    for _ in range(5):
+        watcher.poll()
+    assert watcher.stats.failed == 6  # noqa: PLR2004
+    assert len(watcher.stats.failures) == 3  # noqa: PLR2004
+
+    client.down = False
+    watcher.poll()
+    client.timestamps += list(range(990, 1000))
+    watcher.poll()
+    stats = watcher.stats
+    assert stats.records == 10  # noqa: PLR2004
+    assert sorted(stats.lag.latencies) == [1.0, 2.0, 3.0, 4.0]
+    assert "6 failed, lag mean 5.50 s" in stats.summary()
+    assert "max 10.00 s" in stats.summary()